@@ -0,0 +1,64 @@
+"""Compares the memory held by a parsed AST as node objects, with its
+constant subtrees interned, and in an `AstArena`.
+
+Tokens are scanned before measuring, so only what parsing adds is counted.
+
+Usage: python -m benchmarks.ast_memory [megabytes]
+"""
+
+import sys
+import tracemalloc
+
+from benchmarks.scanner_throughput import generate
+from src.ast_arena import AstArena
+from src.ast_interner import AstInterner
+from src.pratt_parser import PrattParser
+from src.scanner import Scanner
+
+
+def measure(build) -> tuple[int, object]:
+    """Returns the bytes allocated by `build()` and still held by its result."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    source = generate(int(megabytes * 1024 * 1024))
+
+    def report(*args) -> None:
+        pass
+
+    tokens = Scanner(source, report).scan_tokens()
+
+    def parse():
+        return PrattParser(tokens, report).parse()
+
+    def parse_interned():
+        return PrattParser(tokens, report, AstInterner()).parse()
+
+    def store():
+        arena = AstArena()
+        for statement in parse():
+            arena.add(statement)
+        return arena
+
+    objects, _ = measure(parse)
+    interned, _ = measure(parse_interned)
+    compact, arena = measure(store)
+    count = len(arena)  # type: ignore[arg-type]
+
+    print(f"{count} nodes")
+    print(f"nodes:    {objects / 1024 / 1024:7.2f} MB  {objects / count:6.1f} B/node")
+    print(f"interned: {interned / 1024 / 1024:7.2f} MB  {interned / count:6.1f} B/node")
+    print(f"AstArena: {compact / 1024 / 1024:7.2f} MB  {compact / count:6.1f} B/node")
+    print(
+        f"reduction: {objects / interned:6.2f}x interned, {objects / compact:6.2f}x arena"
+    )
+
+
+if __name__ == "__main__":
+    main()
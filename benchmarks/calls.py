@@ -0,0 +1,28 @@
+"""Times every engine on the call-heavy scripts in `benchmarks/data/calls`:
+`fib(30)` makes 1.6 million non-tail calls and `tail` a million tail calls.
+
+Usage: python -m benchmarks.calls [runs]
+"""
+
+import sys
+from pathlib import Path
+
+from src.plox import Plox
+
+from benchmarks.loops import timed
+
+DATA_DIR = Path(__file__).parent / "data" / "calls"
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'script':12}" + "".join(f"{engine:>10}" for engine in Plox.ENGINES))
+    for script in sorted(DATA_DIR.glob("*.plox")):
+        times = [
+            min(timed(script, engine) for _ in range(runs)) for engine in Plox.ENGINES
+        ]
+        print(f"{script.stem:12}" + "".join(f"{t:9.3f}s" for t in times))
+
+
+if __name__ == "__main__":
+    main()
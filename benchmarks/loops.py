@@ -0,0 +1,39 @@
+"""Times every engine on the loop-heavy scripts in `benchmarks/data`.
+
+Usage: python -m benchmarks.loops [runs]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+from src.plox import Plox
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def timed(script: Path, engine: str) -> float:
+    plox = Plox(engine=engine, optimization_level=1)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        status = plox.run_file(script)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        raise SystemExit(f"{script.name} failed on {engine}")
+    return elapsed
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'script':12}" + "".join(f"{engine:>10}" for engine in Plox.ENGINES))
+    for script in sorted(DATA_DIR.glob("*.plox")):
+        times = [
+            min(timed(script, engine) for _ in range(runs)) for engine in Plox.ENGINES
+        ]
+        print(f"{script.stem:12}" + "".join(f"{t:9.3f}s" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Measures how fast the `Parser` turns scanned tokens into statements.
+
+As a baseline, tokens are also parsed the way they were before token
+types compared by identity: `TokenType` members compare by name and the
+parser matches operators by comparing against each candidate in turn.
+
+Usage: python -m benchmarks.parser_throughput [megabytes]
+"""
+
+import sys
+import time
+import timeit
+from collections.abc import Collection, Iterator
+from contextlib import contextmanager
+
+from benchmarks.scanner_throughput import generate
+from src.parser import Parser
+from src.pratt_parser import PrattParser
+from src.regex_scanner import RegexScanner
+from src.token_type import TokenType
+
+
+class BaselineParser(Parser):
+    """A `Parser` that matches token types with `==`, one at a time."""
+
+    def _match_any(self, types: Collection[TokenType]) -> bool:
+        for type in types:
+            if self._check(type):
+                self._advance()
+                return True
+        return False
+
+    def _check(self, type: TokenType) -> bool:
+        if self._is_at_end():
+            return False
+        return self._peek().type == type
+
+
+def _equal_names(self: TokenType, value: object) -> bool:
+    if not isinstance(value, TokenType):
+        return NotImplemented
+    return self.name == value.name
+
+
+@contextmanager
+def name_compared_token_types() -> Iterator[None]:
+    """Makes `TokenType` members compare by name while the block runs."""
+    TokenType.__eq__ = _equal_names  # type: ignore[method-assign,assignment]
+    try:
+        yield
+    finally:
+        del TokenType.__eq__
+
+
+def measure(
+    parser_class: type[Parser], source: str, repeat: int = 3
+) -> tuple[float, int]:
+    """Returns the best time to parse `source` and its number of tokens."""
+    tokens = list(RegexScanner(source, lambda line, message: None).scan_buffer())
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser_class(tokens, lambda token, message: None).parse()
+        best = min(best, time.perf_counter() - start)
+    return best, len(tokens)
+
+
+def compare() -> float:
+    """Returns the time of one `TokenType` comparison in nanoseconds."""
+    a, b = TokenType.LESS_EQUAL, TokenType.PLUS
+    elapsed = timeit.timeit("a == b", globals={"a": a, "b": b}, number=1_000_000)
+    return elapsed * 1000
+
+
+def report(name: str, elapsed: float, count: int) -> None:
+    print(
+        f"{name}: {count} tokens in {elapsed:.3f}s, "
+        f"{count / elapsed / 1e6:.2f}M tokens/s"
+    )
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    source = generate(int(megabytes * 1024 * 1024))
+
+    with name_compared_token_types():
+        elapsed, count = measure(BaselineParser, source)
+        baseline_compare = compare()
+    report("baseline Parser", elapsed, count)
+    for parser_class in (Parser, PrattParser):
+        elapsed, count = measure(parser_class, source)
+        report(parser_class.__name__, elapsed, count)
+
+    print(f"baseline TokenType ==: {baseline_compare:.0f} ns per comparison")
+    print(f"TokenType ==: {compare():.0f} ns per comparison")
+
+
+if __name__ == "__main__":
+    main()
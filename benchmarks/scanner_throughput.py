@@ -0,0 +1,61 @@
+"""Compares the throughput of `Scanner` and `RegexScanner` on large inputs.
+
+Usage: python -m benchmarks.scanner_throughput [megabytes]
+"""
+
+import sys
+import time
+
+from src.regex_scanner import RegexScanner
+from src.scanner import Scanner
+
+SNIPPET = """\
+// generated benchmark input
+var total_{n} = 0;
+{
+  var name = "item {n}";
+  total_{n} = total_{n} + {n}.5 * (3 - 1) / 2;
+  if (total_{n} >= 10 and name != "skip") print name; else print nil;
+}
+"""
+
+
+def generate(size: int) -> str:
+    """Generates a Lox script of roughly `size` characters."""
+    parts: list[str] = []
+    length = 0
+    n = 0
+    while length < size:
+        part = SNIPPET.replace("{n}", str(n))
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return "".join(parts)
+
+
+def measure(scanner_class: type, source: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    scanner = scanner_class(source, lambda line, message: None)
+    # RegexScanner is measured the way Plox uses it, filling a TokenBuffer
+    scan = getattr(scanner, "scan_buffer", scanner.scan_tokens)
+    tokens = scan()
+    return time.perf_counter() - start, len(tokens)
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    source = generate(int(megabytes * 1024 * 1024))
+    size = len(source) / (1024 * 1024)
+
+    baseline, count = measure(Scanner, source)
+    fast, fast_count = measure(RegexScanner, source)
+    assert count == fast_count
+
+    print(f"input: {size:.1f} MB, {count} tokens")
+    print(f"Scanner:      {baseline:7.3f}s  {size / baseline:6.2f} MB/s")
+    print(f"RegexScanner: {fast:7.3f}s  {size / fast:6.2f} MB/s")
+    print(f"speedup:      {baseline / fast:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
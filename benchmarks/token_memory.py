@@ -0,0 +1,45 @@
+"""Compares the memory held by a list of `Token`s and by a `TokenBuffer`.
+
+Usage: python -m benchmarks.token_memory [megabytes]
+"""
+
+import sys
+import tracemalloc
+
+from benchmarks.scanner_throughput import generate
+from src.regex_scanner import RegexScanner
+from src.scanner import Scanner
+
+
+def measure(scan) -> tuple[int, int]:
+    """Returns the bytes allocated by `scan()` and the number of tokens."""
+    tracemalloc.start()
+    tokens = scan()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(tokens)
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    source = generate(int(megabytes * 1024 * 1024))
+
+    def report(line: int, message: str) -> None:
+        pass
+
+    objects, count = measure(lambda: Scanner(source, report).scan_tokens())
+    compact, compact_count = measure(lambda: RegexScanner(source, report).scan_buffer())
+    assert count == compact_count
+
+    print(f"{count} tokens")
+    print(
+        f"list[Token]: {objects / 1024 / 1024:7.2f} MB  {objects / count:6.1f} B/token"
+    )
+    print(
+        f"TokenBuffer: {compact / 1024 / 1024:7.2f} MB  {compact / count:6.1f} B/token"
+    )
+    print(f"reduction:   {objects / compact:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
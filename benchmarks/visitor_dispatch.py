@@ -0,0 +1,97 @@
+"""Measures the cost of visiting AST nodes through `accept` and through a
+`DispatchVisitor` table, and times the visitors that use the table.
+
+Usage: python -m benchmarks.visitor_dispatch [megabytes]
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+from benchmarks.scanner_throughput import generate
+from src.ast_printer import AstPrinter
+from src.dispatch import DispatchVisitor, node_classes, visit_method_name
+from src.expr import Expr
+from src.interpreter import Interpreter
+from src.pratt_parser import PrattParser
+from src.regex_scanner import RegexScanner
+from src.resolver import Resolver
+from src.stmt import Stmt
+
+
+class NullVisitor(DispatchVisitor):
+    """Visits every node without doing anything, to isolate dispatch."""
+
+
+for node_class in node_classes():
+    setattr(NullVisitor, visit_method_name(node_class), lambda self, node: None)
+
+
+def all_nodes(statements: list[Stmt]) -> list[Expr | Stmt]:
+    nodes: list[Expr | Stmt] = []
+    pending: list[object] = list(statements)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+        elif isinstance(node, (Expr, Stmt)):
+            nodes.append(node)
+            pending.extend(getattr(node, name) for name in node.__slots__)
+    return nodes
+
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    source = generate(int(megabytes * 1024 * 1024))
+    tokens = RegexScanner(source, lambda line, message: None).scan_buffer()
+    statements = PrattParser(tokens, lambda token, message: None).parse()
+    Resolver().resolve(statements)
+    nodes = all_nodes(statements)
+    print(f"{len(nodes)} nodes")
+
+    visitor = NullVisitor()
+    visit_methods = visitor._visit_methods
+
+    def through_accept():
+        for node in nodes:
+            node.accept(visitor)  # type: ignore[arg-type]
+
+    def through_visit():
+        for node in nodes:
+            visitor.visit(node)
+
+    def through_table():
+        for node in nodes:
+            visit_methods[type(node)](node)
+
+    for name, run in (
+        ("accept()", through_accept),
+        ("visit()", through_visit),
+        ("table", through_table),
+    ):
+        elapsed = min(timed(run) for _ in range(5))
+        print(f"{name:10} {elapsed * 1e9 / len(nodes):6.1f} ns/node")
+
+    expressions = [node for node in nodes if isinstance(node, Expr)]
+    printer = AstPrinter()
+    printing = min(
+        timed(lambda: [printer.print(expr) for expr in expressions]) for _ in range(3)
+    )
+    print(f"AstPrinter:  {printing:.3f}s for every subexpression")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        running = min(
+            timed(lambda: Interpreter().interpret(statements, print)) for _ in range(3)
+        )
+    print(f"Interpreter: {running:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import sys
+from array import array
+from collections.abc import Callable, Sequence
+
+from src.ast_cache import Tag
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+
+type Node = Expr | Stmt
+# a node's tag, its token or literal value, and its children in order
+type Fields = tuple[Tag, object, Sequence[Node | None]]
+
+
+class _NodeFields(Expr.Visitor[Fields], Stmt.Visitor[Fields]):
+    """Splits a node into what `AstArena` stores for it."""
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> Fields:
+        return Tag.EXPRESSION_STMT, None, (stmt.expression,)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> Fields:
+        return Tag.PRINT_STMT, None, (stmt.expression,)
+
+    def visit_var_stmt(self, stmt: VarStmt) -> Fields:
+        return Tag.VAR_STMT, stmt.name, (stmt.initializer,)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> Fields:
+        return Tag.BLOCK_STMT, None, stmt.statements
+
+    def visit_if_stmt(self, stmt: IfStmt) -> Fields:
+        return Tag.IF_STMT, None, (stmt.condition, stmt.then_branch, stmt.else_branch)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> Fields:
+        return Tag.WHILE_STMT, None, (stmt.condition, stmt.body)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> Fields:
+        return Tag.FUNCTION_STMT, (stmt.name, stmt.params), stmt.body
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> Fields:
+        return Tag.CLASS_STMT, stmt.name, (stmt.superclass, *stmt.methods)
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> Fields:
+        return Tag.RETURN_STMT, stmt.keyword, (stmt.value,)
+
+    def visit_assign_expr(self, expr: AssignExpr) -> Fields:
+        return Tag.ASSIGN_EXPR, expr.name, (expr.value,)
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> Fields:
+        return Tag.BINARY_EXPR, expr.operator, (expr.left, expr.right)
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> Fields:
+        return Tag.GROUPING_EXPR, None, (expr.expression,)
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> Fields:
+        return Tag.LITERAL_EXPR, expr.value, ()
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> Fields:
+        return Tag.LOGICAL_EXPR, expr.operator, (expr.left, expr.right)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> Fields:
+        return Tag.UNARY_EXPR, expr.operator, (expr.right,)
+
+    def visit_variable_expr(self, expr: VariableExpr) -> Fields:
+        return Tag.VARIABLE_EXPR, expr.name, ()
+
+    def visit_call_expr(self, expr: CallExpr) -> Fields:
+        return Tag.CALL_EXPR, expr.paren, (expr.callee, *expr.arguments)
+
+    def visit_get_expr(self, expr: GetExpr) -> Fields:
+        return Tag.GET_EXPR, expr.name, (expr.object,)
+
+    def visit_set_expr(self, expr: SetExpr) -> Fields:
+        return Tag.SET_EXPR, expr.name, (expr.object, expr.value)
+
+    def visit_this_expr(self, expr: ThisExpr) -> Fields:
+        return Tag.THIS_EXPR, expr.keyword, ()
+
+    def visit_super_expr(self, expr: SuperExpr) -> Fields:
+        return Tag.SUPER_EXPR, (expr.keyword, expr.method), ()
+
+
+class AstArena:
+    """Stores syntax trees as parallel arrays instead of node objects.
+
+    A node is a tag byte, the offset of its children in a shared array of
+    child indices, and a reference to its token or literal value: about
+    13 bytes plus four per child, where a node object costs several times
+    that. Nodes are stored children first, so a node's children always
+    have lower indices than the node itself.
+
+    `node` rebuilds the node objects of a stored tree, so anything written
+    against the visitor protocol works on the result. Trees are stored and
+    rebuilt with explicit stacks and may be of any depth. Like the AST
+    cache, an arena keeps the parsed syntax only, not what the `Resolver`
+    or the `Interpreter` attach to nodes.
+    """
+
+    __slots__ = ("_kinds", "_firsts", "_children", "_payloads")
+
+    # child index of a missing `else` branch, initializer, return value or
+    # superclass
+    MISSING = -1
+
+    def __init__(self) -> None:
+        self._kinds = array("B")
+        # offset in `_children` of each node's first child
+        self._firsts = array("I")
+        self._children = array("i")
+        # tokens and literal values, shared with the tree that was stored
+        self._payloads: list[object] = []
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def add(self, node: Node) -> int:
+        """Stores a tree and returns the index of its root."""
+        fields = _NodeFields()
+        # indices of stored nodes whose parent is not stored yet
+        stored: list[int] = []
+        # nodes to store, each followed by the fields of its parent
+        pending: list[Node | None | tuple[Tag, object, int]] = [node]
+        while pending:
+            entry = pending.pop()
+            if entry is None:
+                stored.append(AstArena.MISSING)
+            elif isinstance(entry, tuple):
+                tag, payload, count = entry
+                self._firsts.append(len(self._children))
+                if count:
+                    self._children.extend(stored[-count:])
+                    del stored[-count:]
+                self._kinds.append(tag)
+                self._payloads.append(payload)
+                stored.append(len(self._kinds) - 1)
+            else:
+                tag, payload, children = entry.accept(fields)
+                pending.append((tag, payload, len(children)))
+                pending.extend(reversed(children))
+        return stored.pop()
+
+    def kind(self, index: int) -> Tag:
+        """The tag of a stored node."""
+        return Tag(self._kinds[index])
+
+    def node(self, index: int) -> Node:
+        """Builds the node objects of the tree stored at an index."""
+        # nodes built so far whose parent is not built yet
+        built: list[Node | None] = []
+        pending = [(index, False)]
+        while pending:
+            index, ready = pending.pop()
+            if index == AstArena.MISSING:
+                built.append(None)
+                continue
+            start = self._firsts[index]
+            end = (
+                self._firsts[index + 1]
+                if index + 1 < len(self._firsts)
+                else len(self._children)
+            )
+            if not ready:
+                pending.append((index, True))
+                pending.extend(
+                    (child, False) for child in reversed(self._children[start:end])
+                )
+                continue
+            count = end - start
+            children = built[len(built) - count :]
+            del built[len(built) - count :]
+            build = AstArena.BUILDERS[self._kinds[index]]
+            built.append(build(self._payloads[index], children))
+        return built.pop()  # type: ignore[return-value]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arena, excluding the tokens and values it
+        shares with the stored trees."""
+        return sum(
+            sys.getsizeof(values)
+            for values in (self._kinds, self._firsts, self._children, self._payloads)
+        )
+
+    BUILDERS: dict[int, Callable[[object, list], Node]] = {
+        Tag.EXPRESSION_STMT: lambda _, children: ExpressionStmt(*children),
+        Tag.PRINT_STMT: lambda _, children: PrintStmt(*children),
+        Tag.VAR_STMT: lambda name, children: VarStmt(name, *children),
+        Tag.BLOCK_STMT: lambda _, children: BlockStmt(children),
+        Tag.IF_STMT: lambda _, children: IfStmt(*children),
+        Tag.WHILE_STMT: lambda _, children: WhileStmt(*children),
+        Tag.FUNCTION_STMT: lambda signature, children: FunctionStmt(
+            *signature, children
+        ),
+        Tag.CLASS_STMT: lambda name, children: ClassStmt(
+            name, children[0], children[1:]
+        ),
+        Tag.RETURN_STMT: lambda keyword, children: ReturnStmt(keyword, *children),
+        Tag.ASSIGN_EXPR: lambda name, children: AssignExpr(name, *children),
+        Tag.BINARY_EXPR: lambda operator, children: BinaryExpr(
+            children[0], operator, children[1]
+        ),
+        Tag.GROUPING_EXPR: lambda _, children: GroupingExpr(*children),
+        Tag.LITERAL_EXPR: lambda value, children: LiteralExpr(value),
+        Tag.LOGICAL_EXPR: lambda operator, children: LogicalExpr(
+            children[0], operator, children[1]
+        ),
+        Tag.UNARY_EXPR: lambda operator, children: UnaryExpr(operator, *children),
+        Tag.VARIABLE_EXPR: lambda name, children: VariableExpr(name),
+        Tag.CALL_EXPR: lambda paren, children: CallExpr(
+            children[0], paren, children[1:]
+        ),
+        Tag.GET_EXPR: lambda name, children: GetExpr(children[0], name),
+        Tag.SET_EXPR: lambda name, children: SetExpr(children[0], name, children[1]),
+        Tag.THIS_EXPR: lambda keyword, children: ThisExpr(keyword),
+        Tag.SUPER_EXPR: lambda tokens, children: SuperExpr(*tokens),
+    }
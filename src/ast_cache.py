@@ -0,0 +1,574 @@
+import hashlib
+import os
+import struct
+from enum import IntEnum
+from pathlib import Path
+
+from src import __version__
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token import Token
+from src.token_buffer import Source
+from src.token_type import TokenType
+
+MAGIC = b"PLXA"
+
+# bumped whenever the encoding below changes
+FORMAT_VERSION = 4
+
+
+class Tag(IntEnum):
+    """Leading byte of an encoded node; NONE stands for a missing node."""
+
+    NONE = 0
+    EXPRESSION_STMT = 1
+    PRINT_STMT = 2
+    VAR_STMT = 3
+    BLOCK_STMT = 4
+    IF_STMT = 5
+    ASSIGN_EXPR = 6
+    BINARY_EXPR = 7
+    GROUPING_EXPR = 8
+    LITERAL_EXPR = 9
+    LOGICAL_EXPR = 10
+    UNARY_EXPR = 11
+    VARIABLE_EXPR = 12
+    WHILE_STMT = 13
+    FUNCTION_STMT = 14
+    RETURN_STMT = 15
+    CALL_EXPR = 16
+    CLASS_STMT = 17
+    GET_EXPR = 18
+    SET_EXPR = 19
+    THIS_EXPR = 20
+    SUPER_EXPR = 21
+
+
+class ValueTag(IntEnum):
+    """Leading byte of an encoded literal value."""
+
+    NIL = 0
+    FALSE = 1
+    TRUE = 2
+    NUMBER = 3
+    STRING = 4
+
+
+DOUBLE = struct.Struct("<d")
+
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+
+class AstWriter(Expr.Visitor[None], Stmt.Visitor[None]):
+    """Encodes parsed statements in a compact binary format.
+
+    The encoding is a header, a table of every distinct string (lexemes
+    and string literals), then the nodes in prefix order: a tag byte per
+    node followed by its fields. Integers are unsigned LEB128 varints,
+    numbers are little-endian doubles and strings are indexes into the
+    table.
+    """
+
+    def __init__(self) -> None:
+        self._body = bytearray()
+        self._strings: dict[str, int] = {}
+
+    def write(self, statements: list[Stmt]) -> bytes:
+        self._uint(len(statements))
+        for statement in statements:
+            statement.accept(self)
+
+        header = bytearray(MAGIC)
+        header.append(FORMAT_VERSION)
+        self._body, body = header, self._body
+        self._uint(len(self._strings))
+        for string in self._strings:
+            encoded = string.encode("utf8")
+            self._uint(len(encoded))
+            self._body += encoded
+        return bytes(self._body + body)
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        self._body.append(Tag.EXPRESSION_STMT)
+        stmt.expression.accept(self)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        self._body.append(Tag.PRINT_STMT)
+        stmt.expression.accept(self)
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        self._body.append(Tag.VAR_STMT)
+        self._token(stmt.name)
+        self._optional(stmt.initializer)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        self._body.append(Tag.BLOCK_STMT)
+        self._uint(len(stmt.statements))
+        for statement in stmt.statements:
+            statement.accept(self)
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        self._body.append(Tag.IF_STMT)
+        stmt.condition.accept(self)
+        stmt.then_branch.accept(self)
+        self._optional(stmt.else_branch)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        self._body.append(Tag.WHILE_STMT)
+        stmt.condition.accept(self)
+        stmt.body.accept(self)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        self._body.append(Tag.FUNCTION_STMT)
+        self._token(stmt.name)
+        self._uint(len(stmt.params))
+        for param in stmt.params:
+            self._token(param)
+        self._uint(len(stmt.body))
+        for statement in stmt.body:
+            statement.accept(self)
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        self._body.append(Tag.CLASS_STMT)
+        self._token(stmt.name)
+        self._optional(stmt.superclass)
+        self._uint(len(stmt.methods))
+        for method in stmt.methods:
+            method.accept(self)
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        self._body.append(Tag.RETURN_STMT)
+        self._token(stmt.keyword)
+        self._optional(stmt.value)
+
+    def visit_assign_expr(self, expr: AssignExpr) -> None:
+        self._body.append(Tag.ASSIGN_EXPR)
+        self._token(expr.name)
+        expr.value.accept(self)
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> None:
+        self._body.append(Tag.BINARY_EXPR)
+        expr.left.accept(self)
+        self._token(expr.operator)
+        expr.right.accept(self)
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> None:
+        self._body.append(Tag.GROUPING_EXPR)
+        expr.expression.accept(self)
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> None:
+        self._body.append(Tag.LITERAL_EXPR)
+        self._value(expr.value)
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> None:
+        self._body.append(Tag.LOGICAL_EXPR)
+        expr.left.accept(self)
+        self._token(expr.operator)
+        expr.right.accept(self)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> None:
+        self._body.append(Tag.UNARY_EXPR)
+        self._token(expr.operator)
+        expr.right.accept(self)
+
+    def visit_variable_expr(self, expr: VariableExpr) -> None:
+        self._body.append(Tag.VARIABLE_EXPR)
+        self._token(expr.name)
+
+    def visit_call_expr(self, expr: CallExpr) -> None:
+        self._body.append(Tag.CALL_EXPR)
+        expr.callee.accept(self)
+        self._token(expr.paren)
+        self._uint(len(expr.arguments))
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    def visit_get_expr(self, expr: GetExpr) -> None:
+        self._body.append(Tag.GET_EXPR)
+        expr.object.accept(self)
+        self._token(expr.name)
+
+    def visit_set_expr(self, expr: SetExpr) -> None:
+        self._body.append(Tag.SET_EXPR)
+        expr.object.accept(self)
+        self._token(expr.name)
+        expr.value.accept(self)
+
+    def visit_this_expr(self, expr: ThisExpr) -> None:
+        self._body.append(Tag.THIS_EXPR)
+        self._token(expr.keyword)
+
+    def visit_super_expr(self, expr: SuperExpr) -> None:
+        self._body.append(Tag.SUPER_EXPR)
+        self._token(expr.keyword)
+        self._token(expr.method)
+
+    def _optional(self, node: Expr | Stmt | None) -> None:
+        if node is None:
+            self._body.append(Tag.NONE)
+        else:
+            node.accept(self)
+
+    def _token(self, token: Token) -> None:
+        self._body.append(token.type.value)
+        self._string(token.lexeme)
+        self._value(token.literal)
+        self._uint(token.line)
+
+    def _value(self, value: object) -> None:
+        if value is None:
+            self._body.append(ValueTag.NIL)
+        elif value is False:
+            self._body.append(ValueTag.FALSE)
+        elif value is True:
+            self._body.append(ValueTag.TRUE)
+        elif isinstance(value, float):
+            self._body.append(ValueTag.NUMBER)
+            self._body += DOUBLE.pack(value)
+        elif isinstance(value, str):
+            self._body.append(ValueTag.STRING)
+            self._string(value)
+        else:
+            raise TypeError(f"cannot encode literal {value!r}")
+
+    def _string(self, string: str) -> None:
+        index = self._strings.get(string)
+        if index is None:
+            index = self._strings[string] = len(self._strings)
+        self._uint(index)
+
+    def _uint(self, value: int) -> None:
+        while value >= 0x80:
+            self._body.append(value & 0x7F | 0x80)
+            value >>= 7
+        self._body.append(value)
+
+
+class AstReader:
+    """Decodes statements encoded by `AstWriter`.
+
+    Raises ValueError if the data is not in the current format.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._position = 0
+        self._strings: list[str] = []
+
+    def read(self) -> list[Stmt]:
+        if self._data[: len(MAGIC)] != MAGIC:
+            raise ValueError("not an AST cache entry")
+        self._position = len(MAGIC)
+        if self._byte() != FORMAT_VERSION:
+            raise ValueError("unsupported AST cache format")
+
+        for _ in range(self._uint()):
+            length = self._uint()
+            end = self._position + length
+            if end > len(self._data):
+                raise ValueError("truncated AST cache entry")
+            self._strings.append(self._data[self._position : end].decode("utf8"))
+            self._position = end
+
+        statements = [self._stmt() for _ in range(self._uint())]
+        if self._position != len(self._data):
+            raise ValueError("trailing data in AST cache entry")
+        return statements
+
+    def _stmt(self) -> Stmt:
+        statement = self._optional_stmt()
+        if statement is None:
+            raise ValueError("missing statement")
+        return statement
+
+    def _optional_stmt(self) -> Stmt | None:
+        match self._byte():
+            case Tag.NONE:
+                return None
+            case Tag.EXPRESSION_STMT:
+                return ExpressionStmt(self._expr())
+            case Tag.PRINT_STMT:
+                return PrintStmt(self._expr())
+            case Tag.VAR_STMT:
+                name = self._token()
+                return VarStmt(name, self._optional_expr())
+            case Tag.BLOCK_STMT:
+                return BlockStmt([self._stmt() for _ in range(self._uint())])
+            case Tag.IF_STMT:
+                condition = self._expr()
+                then_branch = self._stmt()
+                return IfStmt(condition, then_branch, self._optional_stmt())
+            case Tag.WHILE_STMT:
+                condition = self._expr()
+                return WhileStmt(condition, self._stmt())
+            case Tag.FUNCTION_STMT:
+                name = self._token()
+                params = [self._token() for _ in range(self._uint())]
+                body = [self._stmt() for _ in range(self._uint())]
+                return FunctionStmt(name, params, body)
+            case Tag.CLASS_STMT:
+                name = self._token()
+                superclass = self._optional_expr()
+                if superclass is not None and not isinstance(superclass, VariableExpr):
+                    raise ValueError("superclass is not a variable")
+                methods = [self._function() for _ in range(self._uint())]
+                return ClassStmt(name, superclass, methods)
+            case Tag.RETURN_STMT:
+                keyword = self._token()
+                return ReturnStmt(keyword, self._optional_expr())
+        raise ValueError("unknown statement tag")
+
+    def _expr(self) -> Expr:
+        expression = self._optional_expr()
+        if expression is None:
+            raise ValueError("missing expression")
+        return expression
+
+    def _optional_expr(self) -> Expr | None:
+        match self._byte():
+            case Tag.NONE:
+                return None
+            case Tag.ASSIGN_EXPR:
+                name = self._token()
+                return AssignExpr(name, self._expr())
+            case Tag.BINARY_EXPR:
+                left = self._expr()
+                operator = self._token()
+                return BinaryExpr(left, operator, self._expr())
+            case Tag.GROUPING_EXPR:
+                return GroupingExpr(self._expr())
+            case Tag.LITERAL_EXPR:
+                return LiteralExpr(self._value())
+            case Tag.LOGICAL_EXPR:
+                left = self._expr()
+                operator = self._token()
+                return LogicalExpr(left, operator, self._expr())
+            case Tag.UNARY_EXPR:
+                operator = self._token()
+                return UnaryExpr(operator, self._expr())
+            case Tag.VARIABLE_EXPR:
+                return VariableExpr(self._token())
+            case Tag.CALL_EXPR:
+                callee = self._expr()
+                paren = self._token()
+                arguments = [self._expr() for _ in range(self._uint())]
+                return CallExpr(callee, paren, arguments)
+            case Tag.GET_EXPR:
+                object_ = self._expr()
+                return GetExpr(object_, self._token())
+            case Tag.SET_EXPR:
+                object_ = self._expr()
+                name = self._token()
+                return SetExpr(object_, name, self._expr())
+            case Tag.THIS_EXPR:
+                return ThisExpr(self._token())
+            case Tag.SUPER_EXPR:
+                keyword = self._token()
+                return SuperExpr(keyword, self._token())
+        raise ValueError("unknown expression tag")
+
+    def _function(self) -> FunctionStmt:
+        method = self._stmt()
+        if not isinstance(method, FunctionStmt):
+            raise ValueError("method is not a function")
+        return method
+
+    def _token(self) -> Token:
+        token_type = TOKEN_TYPES.get(self._byte())
+        if token_type is None:
+            raise ValueError("unknown token type")
+        lexeme = self._string()
+        literal = self._value()
+        return Token(token_type, lexeme, literal, self._uint())  # type: ignore[arg-type]
+
+    def _value(self) -> object:
+        match self._byte():
+            case ValueTag.NIL:
+                return None
+            case ValueTag.FALSE:
+                return False
+            case ValueTag.TRUE:
+                return True
+            case ValueTag.NUMBER:
+                if self._position + DOUBLE.size > len(self._data):
+                    raise ValueError("truncated AST cache entry")
+                (value,) = DOUBLE.unpack_from(self._data, self._position)
+                self._position += DOUBLE.size
+                return value
+            case ValueTag.STRING:
+                return self._string()
+        raise ValueError("unknown value tag")
+
+    def _string(self) -> str:
+        try:
+            return self._strings[self._uint()]
+        except IndexError:
+            raise ValueError("string index out of range") from None
+
+    def _byte(self) -> int:
+        try:
+            value = self._data[self._position]
+        except IndexError:
+            raise ValueError("truncated AST cache entry") from None
+        self._position += 1
+        return value
+
+    def _uint(self) -> int:
+        value = 0
+        shift = 0
+        while True:
+            byte = self._byte()
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+
+class DiskCache:
+    """A directory of cache entries, each keyed by a hash of a program's
+    source code together with the interpreter version and whatever else
+    the entry depends on.
+
+    When the entries grow past `max_bytes` the least recently used are
+    removed. Caches are best-effort: unreadable entries count as misses
+    and failures to write are ignored.
+
+    Attributes:
+        directory: Where entries are stored.
+        max_bytes: Size the entries are trimmed to after each store.
+        hits: Number of loads served from the cache.
+        misses: Number of loads that found no usable entry.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    # file name suffix of this kind of entry; kinds sharing a directory
+    # are trimmed separately
+    SUFFIX = ""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def default_directory() -> Path:
+        """$PLOX_CACHE_DIR, or plox/ under $XDG_CACHE_HOME or ~/.cache."""
+        directory = os.environ.get("PLOX_CACHE_DIR")
+        if directory:
+            return Path(directory)
+        cache_home = os.environ.get("XDG_CACHE_HOME")
+        if cache_home:
+            return Path(cache_home) / "plox"
+        return Path.home() / ".cache" / "plox"
+
+    def _count(self, found: bool) -> None:
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _entry_path(self, source: Source, variant: str) -> Path:
+        """The entry for the source, where `variant` covers everything but
+        the source and interpreter version that the entry depends on."""
+        data = source.encode("utf8") if isinstance(source, str) else source
+        digest = hashlib.sha256(f"plox {__version__}/{variant}\0".encode())
+        digest.update(data)
+        return self.directory / f"{digest.hexdigest()}{self.SUFFIX}"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Stores an entry, then trims the directory."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # written aside and renamed, so readers never see a partial entry
+            partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            partial.write_bytes(data)
+            partial.replace(path)
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class AstCache(DiskCache):
+    """A directory of parsed programs, so unchanged scripts skip the frontend.
+
+    Entries are keyed by the source code and the format version, and hold
+    the statements as parsed, before the optimizer and resolver annotate
+    them.
+    """
+
+    SUFFIX = ".ast"
+
+    def load(self, source: Source) -> list[Stmt] | None:
+        """The cached statements for the source, or None on a miss."""
+        path = self._path(source)
+        try:
+            statements = AstReader(path.read_bytes()).read()
+            # the modification time orders entries for eviction
+            path.touch()
+        except OSError:
+            statements = None
+        except RecursionError:
+            # nested too deeply to decode here; parse it instead
+            statements = None
+        except ValueError:
+            # corrupt, or written in another format; drop it
+            path.unlink(missing_ok=True)
+            statements = None
+
+        self._count(statements is not None)
+        return statements
+
+    def store(self, source: Source, statements: list[Stmt]) -> None:
+        """Caches the parsed statements of the source."""
+        try:
+            data = AstWriter().write(statements)
+        except RecursionError:
+            # the encoding is recursive; very deep trees are not cached
+            return
+        self._write(self._path(source), data)
+
+    def _path(self, source: Source) -> Path:
+        return self._entry_path(source, str(FORMAT_VERSION))
@@ -0,0 +1,221 @@
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    UnaryExpr,
+)
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token_type import TokenType
+
+
+class AstInterner(Stmt.Visitor[None]):
+    """Shares structurally identical constant subtrees between expressions.
+
+    Literals are kept in a constant pool, so every occurrence of a value
+    is the same `LiteralExpr` holding the same `float` or `str`. Grouping,
+    unary and binary expressions over shared operands are shared too, but
+    only when their operand types prove they cannot fail: such a subtree
+    has no variables for the `Resolver` to bind, gets the same annotations
+    wherever it appears, and never reports the line of its operator, so
+    sharing one copy is indistinguishable from keeping them all. Anything
+    else keeps its own node, with only its operands shared.
+
+    The operands of the nodes that are kept are replaced in place.
+
+    Attributes:
+        shared: Number of nodes replaced by an identical one seen before.
+    """
+
+    ARITHMETIC_OPERATORS = frozenset({TokenType.MINUS, TokenType.STAR})
+    COMPARISON_OPERATORS = frozenset(
+        {
+            TokenType.GREATER,
+            TokenType.GREATER_EQUAL,
+            TokenType.LESS,
+            TokenType.LESS_EQUAL,
+        }
+    )
+    EQUALITY_OPERATORS = frozenset({TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL})
+
+    def __init__(self) -> None:
+        # the node shared for each key; keys refer to operands by id, which
+        # stays valid because every shared node is kept alive here
+        self._pool: dict[tuple, Expr] = {}
+        # the type of the value of each shared node, by id
+        self._types: dict[int, type] = {}
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    def intern(self, expr: Expr) -> Expr:
+        """Returns the expression with its constant subtrees shared."""
+        # operands already interned, in order
+        values: list[Expr] = []
+        pending: list[tuple[Expr, bool]] = [(expr, False)]
+        while pending:
+            expr, ready = pending.pop()
+            if not ready:
+                pending.append((expr, True))
+                pending.extend((operand, False) for operand in _operands(expr)[::-1])
+                continue
+
+            if isinstance(expr, (BinaryExpr, LogicalExpr)):
+                expr.right = values.pop()
+                expr.left = values.pop()
+            elif isinstance(expr, UnaryExpr):
+                expr.right = values.pop()
+            elif isinstance(expr, GroupingExpr):
+                expr.expression = values.pop()
+            elif isinstance(expr, AssignExpr):
+                expr.value = values.pop()
+            elif isinstance(expr, CallExpr):
+                count = len(expr.arguments)
+                expr.arguments = values[len(values) - count :]
+                del values[len(values) - count :]
+                expr.callee = values.pop()
+            elif isinstance(expr, GetExpr):
+                expr.object = values.pop()
+            elif isinstance(expr, SetExpr):
+                expr.value = values.pop()
+                expr.object = values.pop()
+            values.append(self._shared(expr))
+        return values.pop()
+
+    def intern_statements(self, statements: list[Stmt]) -> None:
+        """Interns the expressions of already parsed statements in place."""
+        for statement in statements:
+            statement.accept(self)
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        stmt.expression = self.intern(stmt.expression)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        stmt.expression = self.intern(stmt.expression)
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        if stmt.initializer is not None:
+            stmt.initializer = self.intern(stmt.initializer)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        self.intern_statements(stmt.statements)
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        stmt.condition = self.intern(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        stmt.condition = self.intern(stmt.condition)
+        stmt.body.accept(self)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        self.intern_statements(stmt.body)
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        for method in stmt.methods:
+            method.accept(self)
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        if stmt.value is not None:
+            stmt.value = self.intern(stmt.value)
+
+    def _shared(self, expr: Expr) -> Expr:
+        """The shared node identical to `expr`, if it can be shared."""
+        key, value_type = self._key(expr)
+        if value_type is None:
+            return expr
+        shared = self._pool.get(key)
+        if shared is not None:
+            if shared is not expr:
+                self.shared += 1
+            return shared
+        self._pool[key] = expr
+        self._types[id(expr)] = value_type
+        return expr
+
+    def _key(self, expr: Expr) -> tuple[tuple, type | None]:
+        """The pool key of a node and the type of its value, or None for
+        the type if the node must not be shared."""
+        types = self._types
+        if isinstance(expr, LiteralExpr):
+            value = expr.value
+            # 0.0 == -0.0 and 1.0 == True, so the type and the exact float
+            # are part of the key
+            exact = value.hex() if isinstance(value, float) else value
+            return (LiteralExpr, type(value), exact), type(value)
+        if isinstance(expr, GroupingExpr):
+            operand = expr.expression
+            return (GroupingExpr, id(operand)), types.get(id(operand))
+        if isinstance(expr, UnaryExpr):
+            operator = expr.operator.type
+            operand_type = types.get(id(expr.right))
+            key = (UnaryExpr, operator, id(expr.right))
+            if operator is TokenType.BANG and operand_type is not None:
+                return key, bool
+            if operator is TokenType.MINUS and operand_type is float:
+                return key, float
+            return key, None
+        if isinstance(expr, BinaryExpr):
+            operator = expr.operator.type
+            left = types.get(id(expr.left))
+            right = types.get(id(expr.right))
+            key = (BinaryExpr, operator, id(expr.left), id(expr.right))
+            return key, self._binary_type(operator, left, right)
+        return (), None
+
+    def _binary_type(
+        self, operator: TokenType, left: type | None, right: type | None
+    ) -> type | None:
+        """The type of a binary operation that cannot fail on operands of
+        these types, or None."""
+        if left is None or right is None:
+            return None
+        if operator in AstInterner.EQUALITY_OPERATORS:
+            return bool
+        if left is not right:
+            return None
+        if operator is TokenType.PLUS and left in (float, str):
+            return left
+        # `/` can divide by zero, so it is never shared
+        if operator in AstInterner.ARITHMETIC_OPERATORS and left is float:
+            return float
+        if operator in AstInterner.COMPARISON_OPERATORS and left is float:
+            return bool
+        return None
+
+
+def _operands(expr: Expr) -> tuple[Expr, ...]:
+    if isinstance(expr, (BinaryExpr, LogicalExpr)):
+        return expr.left, expr.right
+    if isinstance(expr, UnaryExpr):
+        return (expr.right,)
+    if isinstance(expr, GroupingExpr):
+        return (expr.expression,)
+    if isinstance(expr, AssignExpr):
+        return (expr.value,)
+    if isinstance(expr, CallExpr):
+        return (expr.callee, *expr.arguments)
+    if isinstance(expr, GetExpr):
+        return (expr.object,)
+    if isinstance(expr, SetExpr):
+        return expr.object, expr.value
+    return ()
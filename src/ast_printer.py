@@ -1,30 +1,86 @@
-from src.expr import Expr, BinaryExpr, GroupingExpr, LiteralExpr, UnaryExpr
+from src.dispatch import DispatchVisitor
+from src.expr import (
+    AssignExpr,
+    Expr,
+    BinaryExpr,
+    CallExpr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
 
+type Parts = list[str | Expr]
 
-class AstPrinter(Expr.Visitor[str]):
-    """Prints the AST in a parenthesized format."""
+
+class AstPrinter(DispatchVisitor, Expr.Visitor[Parts]):
+    """Prints the AST in a parenthesized format.
+
+    Visiting a node returns the text around its operands with the operands
+    themselves left in place; `print` expands them with an explicit stack,
+    so the depth of the tree is not limited by Python's recursion limit.
+    Nodes are visited through the `DispatchVisitor` table.
+    """
 
     def print(self, expr: Expr) -> str:
-        return expr.accept(self)
+        output: list[str] = []
+        pending: Parts = [expr]
+        visit_methods = self._visit_methods
+        while pending:
+            part = pending.pop()
+            if isinstance(part, str):
+                output.append(part)
+            else:
+                pending.extend(reversed(visit_methods[type(part)](part)))
+        return "".join(output)
+
+    def visit_assign_expr(self, expr: AssignExpr) -> Parts:
+        return self._parenthesize(f"= {expr.name.lexeme}", expr.value)
 
-    def visit_binary_expr(self, expr: BinaryExpr) -> str:
+    def visit_binary_expr(self, expr: BinaryExpr) -> Parts:
         return self._parenthesize(expr.operator.lexeme, expr.left, expr.right)
 
-    def visit_grouping_expr(self, expr: GroupingExpr) -> str:
+    def visit_grouping_expr(self, expr: GroupingExpr) -> Parts:
         return self._parenthesize("group", expr.expression)
 
-    def visit_literal_expr(self, expr: LiteralExpr) -> str:
+    def visit_literal_expr(self, expr: LiteralExpr) -> Parts:
         if expr.value is None:
-            return "nil"
-        return str(expr.value)
+            return ["nil"]
+        return [str(expr.value)]
 
-    def visit_unary_expr(self, expr: UnaryExpr) -> str:
+    def visit_logical_expr(self, expr: LogicalExpr) -> Parts:
+        return self._parenthesize(expr.operator.lexeme, expr.left, expr.right)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> Parts:
         return self._parenthesize(expr.operator.lexeme, expr.right)
 
-    def _parenthesize(self, name: str, *exprs: Expr) -> str:
-        res = "(" + name
+    def visit_variable_expr(self, expr: VariableExpr) -> Parts:
+        return [expr.name.lexeme]
+
+    def visit_call_expr(self, expr: CallExpr) -> Parts:
+        return self._parenthesize("call", expr.callee, *expr.arguments)
+
+    def visit_get_expr(self, expr: GetExpr) -> Parts:
+        return self._parenthesize(f". {expr.name.lexeme}", expr.object)
+
+    def visit_set_expr(self, expr: SetExpr) -> Parts:
+        return self._parenthesize(f"= .{expr.name.lexeme}", expr.object, expr.value)
+
+    def visit_this_expr(self, expr: ThisExpr) -> Parts:
+        return ["this"]
+
+    def visit_super_expr(self, expr: SuperExpr) -> Parts:
+        return [f"super.{expr.method.lexeme}"]
+
+    def _parenthesize(self, name: str, *exprs: Expr) -> Parts:
+        parts: Parts = ["(" + name]
         for expr in exprs:
-            res += " "
-            res += expr.accept(self)
-        res += ")"
-        return res
+            parts.append(" ")
+            parts.append(expr)
+        parts.append(")")
+        return parts
@@ -0,0 +1,174 @@
+from array import array
+from enum import IntEnum, auto
+
+from src.inline_cache import InlineCache
+from src.token import Token
+
+
+class OpCode(IntEnum):
+    """Instructions understood by the stack VM.
+
+    Every instruction is one word in the code array, followed by the number
+    of operand words given in `OPERAND_COUNTS`.
+    """
+
+    CONSTANT = auto()
+    NIL = auto()
+    TRUE = auto()
+    FALSE = auto()
+    POP = auto()
+    POPN = auto()
+    GET_LOCAL = auto()
+    SET_LOCAL = auto()
+    DEFINE_GLOBAL = auto()
+    GET_GLOBAL = auto()
+    SET_GLOBAL = auto()
+    EQUAL = auto()
+    NOT_EQUAL = auto()
+    GREATER = auto()
+    GREATER_EQUAL = auto()
+    LESS = auto()
+    LESS_EQUAL = auto()
+    ADD = auto()
+    SUBTRACT = auto()
+    MULTIPLY = auto()
+    DIVIDE = auto()
+    NOT = auto()
+    NEGATE = auto()
+    PRINT = auto()
+    JUMP = auto()
+    JUMP_IF_FALSE = auto()
+    JUMP_IF_TRUE = auto()
+    CALL = auto()
+    TAIL_CALL = auto()
+    CLOSURE = auto()
+    GET_UPVALUE = auto()
+    SET_UPVALUE = auto()
+    CLOSE_UPVALUE = auto()
+    CLASS = auto()
+    INHERIT = auto()
+    METHOD = auto()
+    GET_PROPERTY = auto()
+    SET_PROPERTY = auto()
+    INVOKE = auto()
+    GET_SUPER = auto()
+    RETURN = auto()
+
+
+OPERAND_COUNTS = {
+    OpCode.CONSTANT: 1,
+    OpCode.POPN: 1,
+    OpCode.GET_LOCAL: 1,
+    OpCode.SET_LOCAL: 1,
+    OpCode.DEFINE_GLOBAL: 1,
+    OpCode.GET_GLOBAL: 1,
+    OpCode.SET_GLOBAL: 1,
+    OpCode.JUMP: 1,
+    OpCode.JUMP_IF_FALSE: 1,
+    OpCode.JUMP_IF_TRUE: 1,
+    OpCode.CALL: 1,
+    OpCode.TAIL_CALL: 1,
+    OpCode.CLOSURE: 1,
+    OpCode.GET_UPVALUE: 1,
+    OpCode.SET_UPVALUE: 1,
+    OpCode.CLASS: 1,
+    OpCode.METHOD: 1,
+    OpCode.GET_PROPERTY: 1,
+    OpCode.SET_PROPERTY: 1,
+    OpCode.INVOKE: 2,
+    OpCode.GET_SUPER: 1,
+}
+
+
+class Chunk:
+    """A compiled sequence of bytecode.
+
+    Attributes:
+        code: Opcodes and their operands, one word each.
+        lines: The source line of every word in `code`.
+        constants: The constant pool referenced by operands.
+        properties: The name and inline cache of each property access,
+            referenced by the operand of its instruction.
+    """
+
+    def __init__(self) -> None:
+        self.code = array("i")
+        self.lines = array("i")
+        self.constants: list[object] = []
+        self.properties: list[tuple[Token, InlineCache]] = []
+        self._constant_indices: dict[tuple[type, object], int] = {}
+
+    def write(self, word: int, line: int) -> int:
+        """Appends a word to the chunk and returns its offset."""
+        self.code.append(word)
+        self.lines.append(line)
+        return len(self.code) - 1
+
+    def add_constant(self, value: object) -> int:
+        """Adds a value to the constant pool, reusing an equal entry."""
+        key = (type(value), value)
+        index = self._constant_indices.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_indices[key] = index
+        return index
+
+    def add_property(self, name: Token) -> int:
+        """Adds a property access site with a cache of its own."""
+        self.properties.append((name, InlineCache()))
+        return len(self.properties) - 1
+
+    def disassemble(self) -> list[str]:
+        """Returns a human-readable listing of the chunk."""
+        listing: list[str] = []
+        offset = 0
+        while offset < len(self.code):
+            op = OpCode(self.code[offset])
+            count = OPERAND_COUNTS.get(op, 0)
+            operands = list(self.code[offset + 1 : offset + 1 + count])
+            text = f"{offset:04d} {self.lines[offset]:4d} {op.name}"
+            if op in (
+                OpCode.CONSTANT,
+                OpCode.DEFINE_GLOBAL,
+                OpCode.GET_GLOBAL,
+                OpCode.SET_GLOBAL,
+                OpCode.CLOSURE,
+                OpCode.CLASS,
+                OpCode.METHOD,
+                OpCode.GET_SUPER,
+            ):
+                text += f" {operands[0]} ({self.constants[operands[0]]!r})"
+            elif op in (OpCode.GET_PROPERTY, OpCode.SET_PROPERTY, OpCode.INVOKE):
+                name = self.properties[operands[0]][0].lexeme
+                text += f" {' '.join(map(str, operands))} ({name!r})"
+            elif operands:
+                text += f" {operands[0]}"
+            listing.append(text)
+            offset += 1 + count
+        return listing
+
+
+class Function:
+    """A compiled function declaration; `CLOSURE` turns it into a value.
+
+    Attributes:
+        name: The name the function was declared with.
+        arity: Number of parameters.
+        chunk: The compiled body. Slot 0 of its frame holds the function
+            being called, or `this` in a method, and the parameters follow.
+        upvalues: For each variable the body captures, whether it is a
+            local of the enclosing function (True) or one of its upvalues
+            (False), and that local's slot or that upvalue's index.
+    """
+
+    __slots__ = ("name", "arity", "chunk", "upvalues")
+
+    def __init__(self, name: str, arity: int) -> None:
+        self.name = name
+        self.arity = arity
+        self.chunk = Chunk()
+        self.upvalues: list[tuple[bool, int]] = []
+
+    def __repr__(self) -> str:
+        return f"<fn {self.name}>"
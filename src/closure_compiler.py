@@ -0,0 +1,619 @@
+import operator
+from collections.abc import Callable
+
+from src.environment import Environment
+from src.exceptions import PloxRuntimeError
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.inline_cache import InlineCache
+from src.lox_callable import NATIVES, LoxCallable, NativeFunction, check_call
+from src.lox_class import (
+    BoundMethod,
+    LoxClass,
+    LoxInstance,
+    find_method,
+    get_property,
+    lookup_property,
+    set_property,
+)
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token import Token
+from src.token_type import TokenType
+from src.values import is_equal, is_truthy, stringify
+
+type ExprFn = Callable[[Environment], object]
+type StmtFn = Callable[[Environment], bool | None]
+
+NUMBER = (int, float)
+
+
+class CompiledFunction(LoxCallable):
+    """A function declared in Lox code, as run by the `ClosureCompiler`.
+
+    Attributes:
+        body: The compiled statements of the body.
+        closure: The environment the declaration ran in.
+        initializer: Whether the function is a class's `init` method, which
+            returns `this`.
+    """
+
+    __slots__ = ("body", "closure", "initializer")
+
+    def __init__(
+        self,
+        name: str,
+        arity: int,
+        body: tuple[StmtFn, ...],
+        closure: Environment,
+        initializer: bool = False,
+    ) -> None:
+        super().__init__(name, arity)
+        self.body = body
+        self.closure = closure
+        self.initializer = initializer
+
+
+class ClosureCompiler(Expr.Visitor[ExprFn], Stmt.Visitor[StmtFn]):
+    """Compiles the AST once into nested Python closures and runs them.
+
+    Every node becomes a callable specialized for its operator, so running
+    the program needs neither `accept()` dispatch nor a `match` on the
+    operator type. Implements the same `interpret` interface as
+    `Interpreter`; globals persist between calls.
+
+    As in the `Interpreter`, a statement closure returns True when a
+    `return` statement ran, and a tail call is left for `_call` to make
+    once the returning call has finished.
+
+    Variables are accessed through the frame slots the `Resolver` bound
+    them to, in frames laid out as the `Interpreter` lays them out: a
+    method's frame holds `this` in slot 0 before its arguments. Each
+    property access closes over an `InlineCache` of its own.
+    """
+
+    NUMERIC_OPS: dict[int, Callable[[float, float], object]] = {
+        TokenType.GREATER: operator.gt,
+        TokenType.GREATER_EQUAL: operator.ge,
+        TokenType.LESS: operator.lt,
+        TokenType.LESS_EQUAL: operator.le,
+        TokenType.MINUS: operator.sub,
+        TokenType.SLASH: operator.truediv,
+        TokenType.STAR: operator.mul,
+    }
+
+    def __init__(self) -> None:
+        self._globals = Environment()
+        for name, native in NATIVES.items():
+            self._globals.define(name, native)
+        # the value of the `return` statement that ran, or the function,
+        # arguments and parenthesis of the tail call it made instead
+        self._returned: object = None
+        self._tail_call: tuple[CompiledFunction, list[object], Token] | None = None
+
+    def interpret(
+        self, statements: list[Stmt], error_reporter: Callable[[PloxRuntimeError], None]
+    ) -> None:
+        program = self.compile(statements)
+        environment = self._globals
+        try:
+            for statement in program:
+                statement(environment)
+        except PloxRuntimeError as error:
+            error_reporter(error)
+
+    def compile(self, statements: list[Stmt]) -> list[StmtFn]:
+        """Compiles each statement into a closure taking the environment."""
+        return [statement.accept(self) for statement in statements]
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> StmtFn:
+        expression = stmt.expression.accept(self)
+
+        def expression_stmt(environment: Environment) -> None:
+            expression(environment)
+
+        return expression_stmt
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> StmtFn:
+        expression = stmt.expression.accept(self)
+
+        def print_stmt(environment: Environment) -> None:
+            print(stringify(expression(environment)))
+
+        return print_stmt
+
+    def visit_var_stmt(self, stmt: VarStmt) -> StmtFn:
+        name = stmt.name.lexeme
+        slot = stmt.slot
+        if stmt.initializer is None:
+
+            def declare(environment: Environment) -> None:
+                environment.define(name, None)
+
+            def declare_local(environment: Environment) -> None:
+                environment.define_at(slot, None)
+
+            return declare if slot is None else declare_local
+
+        initializer = stmt.initializer.accept(self)
+
+        def define(environment: Environment) -> None:
+            environment.define(name, initializer(environment))
+
+        def define_local(environment: Environment) -> None:
+            environment.define_at(slot, initializer(environment))
+
+        return define if slot is None else define_local
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> StmtFn:
+        statements = tuple(self.compile(stmt.statements))
+
+        if stmt.elided:
+
+            def elided_block(environment: Environment) -> bool:
+                for statement in statements:
+                    if statement(environment):
+                        return True
+                return False
+
+            return elided_block
+
+        def block(environment: Environment) -> bool:
+            inner = Environment(environment)
+            for statement in statements:
+                if statement(inner):
+                    return True
+            return False
+
+        return block
+
+    def visit_if_stmt(self, stmt: IfStmt) -> StmtFn:
+        condition = stmt.condition.accept(self)
+        then_branch = stmt.then_branch.accept(self)
+        if stmt.else_branch is None:
+
+            def if_stmt(environment: Environment) -> bool | None:
+                if is_truthy(condition(environment)):
+                    return then_branch(environment)
+                return False
+
+            return if_stmt
+
+        else_branch = stmt.else_branch.accept(self)
+
+        def if_else_stmt(environment: Environment) -> bool | None:
+            if is_truthy(condition(environment)):
+                return then_branch(environment)
+            return else_branch(environment)
+
+        return if_else_stmt
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> StmtFn:
+        condition = stmt.condition.accept(self)
+        body = stmt.body.accept(self)
+
+        def while_stmt(environment: Environment) -> bool:
+            while is_truthy(condition(environment)):
+                if body(environment):
+                    return True
+            return False
+
+        return while_stmt
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> StmtFn:
+        name = stmt.name.lexeme
+        arity = len(stmt.params)
+        body = tuple(self.compile(stmt.body))
+        define = self._definer(name, stmt.slot)
+
+        def function_stmt(environment: Environment) -> None:
+            define(environment, CompiledFunction(name, arity, body, environment))
+
+        return function_stmt
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> StmtFn:
+        name = stmt.name.lexeme
+        methods = [
+            (
+                method.name.lexeme,
+                len(method.params),
+                tuple(self.compile(method.body)),
+            )
+            for method in stmt.methods
+        ]
+        if stmt.superclass is None:
+            superclass = None
+            superclass_name = stmt.name
+        else:
+            superclass = stmt.superclass.accept(self)
+            superclass_name = stmt.superclass.name
+        define = self._definer(name, stmt.slot)
+
+        def class_stmt(environment: Environment) -> None:
+            klass = LoxClass(name)
+            closure = environment
+            if superclass is not None:
+                value = superclass(environment)
+                klass.inherit(value, superclass_name)
+                # the methods' `super`
+                closure = Environment(environment, [value])
+            for method_name, arity, body in methods:
+                klass.add_method(
+                    method_name,
+                    CompiledFunction(
+                        method_name, arity, body, closure, method_name == "init"
+                    ),
+                )
+            define(environment, klass)
+
+        return class_stmt
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> StmtFn:
+        value = stmt.value
+        if value is None:
+
+            def return_nil(environment: Environment) -> bool:
+                return True
+
+            return return_nil
+
+        if type(value) is CallExpr:
+            callee = value.callee.accept(self)
+            arguments = tuple(argument.accept(self) for argument in value.arguments)
+            paren = value.paren
+
+            def return_call(environment: Environment) -> bool:
+                function = callee(environment)
+                values = [argument(environment) for argument in arguments]
+                if type(function) is CompiledFunction:
+                    self._tail_call = (function, values, paren)
+                else:
+                    self._returned = self._call(function, values, paren)
+                return True
+
+            return return_call
+
+        result = value.accept(self)
+
+        def return_value(environment: Environment) -> bool:
+            self._returned = result(environment)
+            return True
+
+        return return_value
+
+    def visit_assign_expr(self, expr: AssignExpr) -> ExprFn:
+        name = expr.name
+        value = expr.value.accept(self)
+        location = expr.location
+        if location is None:
+            globals = self._globals
+
+            def assign_global(environment: Environment) -> object:
+                result = value(environment)
+                globals.assign(name, result)
+                return result
+
+            return assign_global
+
+        depth, slot = location
+
+        def assign(environment: Environment) -> object:
+            result = value(environment)
+            environment.assign_at(depth, slot, result)
+            return result
+
+        return assign
+
+    def visit_call_expr(self, expr: CallExpr) -> ExprFn:
+        if type(expr.callee) is GetExpr:
+            return self._invoke(expr.callee, expr)
+        callee = expr.callee.accept(self)
+        arguments = tuple(argument.accept(self) for argument in expr.arguments)
+        paren = expr.paren
+        call = self._call
+
+        def call_expr(environment: Environment) -> object:
+            return call(
+                callee(environment),
+                [argument(environment) for argument in arguments],
+                paren,
+            )
+
+        return call_expr
+
+    def _invoke(self, get: GetExpr, expr: CallExpr) -> ExprFn:
+        """Compiles a call of a property; a method is run with the instance
+        as `this` without creating a `BoundMethod`."""
+        instance = get.object.accept(self)
+        name = get.name
+        cache = InlineCache()
+        arguments = tuple(argument.accept(self) for argument in expr.arguments)
+        paren = expr.paren
+
+        def invoke(environment: Environment) -> object:
+            receiver = instance(environment)
+            target = lookup_property(receiver, name, cache)
+            assert type(receiver) is LoxInstance
+            if type(target) is int:
+                callee = receiver.fields[target]
+                values = [argument(environment) for argument in arguments]
+                return self._call(callee, values, paren)
+
+            values = [argument(environment) for argument in arguments]
+            assert type(target) is CompiledFunction
+            check_call(target, values, paren)
+            return self._run(target, values, paren, receiver)
+
+        return invoke
+
+    def visit_get_expr(self, expr: GetExpr) -> ExprFn:
+        instance = expr.object.accept(self)
+        name = expr.name
+        cache = InlineCache()
+
+        def get_expr(environment: Environment) -> object:
+            return get_property(instance(environment), name, cache)
+
+        return get_expr
+
+    def visit_set_expr(self, expr: SetExpr) -> ExprFn:
+        instance = expr.object.accept(self)
+        value = expr.value.accept(self)
+        name = expr.name
+        cache = InlineCache()
+
+        def set_expr(environment: Environment) -> object:
+            receiver = instance(environment)
+            return set_property(receiver, name, value(environment), cache)
+
+        return set_expr
+
+    def visit_this_expr(self, expr: ThisExpr) -> ExprFn:
+        location = expr.location
+        assert location is not None
+        depth, slot = location
+
+        def this_expr(environment: Environment) -> object:
+            return environment.get_at(depth, slot)
+
+        return this_expr
+
+    def visit_super_expr(self, expr: SuperExpr) -> ExprFn:
+        location = expr.location
+        assert location is not None
+        depth, slot = location
+        method = expr.method
+
+        def super_expr(environment: Environment) -> object:
+            superclass = environment.get_at(depth, slot)
+            assert type(superclass) is LoxClass
+            # `this` is in the frame of the method, inside the frame of `super`
+            instance = environment.get_at(depth - 1, 0)
+            assert type(instance) is LoxInstance
+            return BoundMethod(instance, find_method(superclass, method))
+
+        return super_expr
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> ExprFn:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        token = expr.operator
+
+        static_path = expr.static_path
+        if static_path is not None:
+
+            def unchecked(environment: Environment) -> object:
+                return static_path(left(environment), right(environment))
+
+            return unchecked
+
+        match token.type:
+            case TokenType.PLUS:
+                return self._add(token, left, right)
+            case TokenType.EQUAL_EQUAL:
+
+                def equal(environment: Environment) -> object:
+                    return is_equal(left(environment), right(environment))
+
+                return equal
+            case TokenType.BANG_EQUAL:
+
+                def not_equal(environment: Environment) -> object:
+                    return not is_equal(left(environment), right(environment))
+
+                return not_equal
+
+        return self._numeric(token, left, right)
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> ExprFn:
+        return expr.expression.accept(self)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> ExprFn:
+        right = expr.right.accept(self)
+        token = expr.operator
+
+        if token.type is TokenType.BANG:
+
+            def bang(environment: Environment) -> object:
+                return not is_truthy(right(environment))
+
+            return bang
+
+        static_path = expr.static_path
+        if static_path is not None:
+
+            def unchecked_negate(environment: Environment) -> object:
+                return static_path(right(environment))
+
+            return unchecked_negate
+
+        def negate(environment: Environment) -> object:
+            operand = right(environment)
+            if isinstance(operand, NUMBER):
+                return -float(operand)
+            raise PloxRuntimeError(token, "Operand must be a number.")
+
+        return negate
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> ExprFn:
+        value = expr.value
+
+        def literal(environment: Environment) -> object:
+            return value
+
+        return literal
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> ExprFn:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+
+        if expr.operator.type is TokenType.OR:
+
+            def logical_or(environment: Environment) -> object:
+                value = left(environment)
+                if is_truthy(value):
+                    return value
+                return right(environment)
+
+            return logical_or
+
+        def logical_and(environment: Environment) -> object:
+            value = left(environment)
+            if not is_truthy(value):
+                return value
+            return right(environment)
+
+        return logical_and
+
+    def visit_variable_expr(self, expr: VariableExpr) -> ExprFn:
+        location = expr.location
+        if location is None:
+            name = expr.name
+            globals = self._globals
+
+            def global_variable(environment: Environment) -> object:
+                return globals.get(name)
+
+            return global_variable
+
+        depth, slot = location
+
+        def variable(environment: Environment) -> object:
+            return environment.get_at(depth, slot)
+
+        return variable
+
+    def _definer(
+        self, name: str, slot: int | None
+    ) -> Callable[[Environment, object], None]:
+        """Defines a declared global by name, or a local in its slot."""
+        if slot is None:
+
+            def define_global(environment: Environment, value: object) -> None:
+                environment.define(name, value)
+
+            return define_global
+
+        def define_local(environment: Environment, value: object) -> None:
+            environment.define_at(slot, value)
+
+        return define_local
+
+    def _call(self, callee: object, arguments: list[object], paren: Token) -> object:
+        """Calls a value with its evaluated arguments."""
+        function = check_call(callee, arguments, paren)
+        if isinstance(function, NativeFunction):
+            return function.function(*arguments)
+        if type(function) is BoundMethod:
+            method = function.method
+            assert type(method) is CompiledFunction
+            return self._run(method, arguments, paren, function.receiver)
+        if type(function) is LoxClass:
+            instance = LoxInstance(function)
+            initializer = function.initializer
+            if initializer is not None:
+                assert type(initializer) is CompiledFunction
+                self._run(initializer, arguments, paren, instance)
+            return instance
+        assert isinstance(function, CompiledFunction)
+        return self._run(function, arguments, paren, None)
+
+    def _run(
+        self,
+        function: CompiledFunction,
+        arguments: list[object],
+        paren: Token,
+        receiver: LoxInstance | None,
+    ) -> object:
+        """Runs a call of a function, or of a method on `receiver`, and the
+        tail calls it makes in a loop here instead of from inside the
+        returning function."""
+        try:
+            while True:
+                if receiver is not None:
+                    arguments = [receiver, *arguments]
+                frame = Environment(function.closure, arguments)
+                for statement in function.body:
+                    if statement(frame):
+                        break
+
+                tail_call = self._tail_call
+                if tail_call is None:
+                    value = self._returned
+                    self._returned = None
+                    return receiver if function.initializer else value
+                self._tail_call = None
+                function, arguments, paren = tail_call
+                receiver = None
+                check_call(function, arguments, paren)
+        except RecursionError:
+            raise PloxRuntimeError(paren, "Stack overflow.") from None
+
+    def _add(self, token: Token, left: ExprFn, right: ExprFn) -> ExprFn:
+        def add(environment: Environment) -> object:
+            a = left(environment)
+            b = right(environment)
+            if isinstance(a, NUMBER) and isinstance(b, NUMBER):
+                return float(a) + float(b)
+            if isinstance(a, str) and isinstance(b, str):
+                return a + b
+            raise PloxRuntimeError(
+                token, "Operands must be two numbers or two strings."
+            )
+
+        return add
+
+    def _numeric(self, token: Token, left: ExprFn, right: ExprFn) -> ExprFn:
+        op = ClosureCompiler.NUMERIC_OPS[token.type]
+
+        def numeric(environment: Environment) -> object:
+            a = left(environment)
+            b = right(environment)
+            if isinstance(a, NUMBER) and isinstance(b, NUMBER):
+                return op(float(a), float(b))
+            raise PloxRuntimeError(token, "Operands must be numbers.")
+
+        return numeric
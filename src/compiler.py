@@ -0,0 +1,407 @@
+from src.chunk import Chunk, Function, OpCode
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.postorder import operands
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token import Token
+from src.token_type import TokenType
+
+
+class Compiler(Expr.Visitor[None], Stmt.Visitor[None]):
+    """Compiles a list of statements into a `Chunk` for the stack VM.
+
+    Variables declared inside blocks are resolved at compile time to stack
+    slots; everything else is a global looked up by name at runtime.
+
+    Each function declaration is compiled by a nested `Compiler` into its
+    own chunk. Slots are relative to the frame of the running call, and a
+    variable of an enclosing function is reached through an upvalue, which
+    is closed over when the variable's block or call ends. A `return` of a
+    call compiles to `TAIL_CALL`, which reuses the returning call's frame.
+
+    A method is compiled like a function whose slot 0 is `this`; the
+    methods of a class with a superclass capture `super` from a scope
+    around them. Calls of a property compile to `INVOKE`, which calls a
+    method without creating a bound method for it.
+
+    Expressions are compiled with an explicit stack rather than
+    recursively, so they can be nested as deeply as memory allows: an
+    expression's visit emits only its own code, after the code of its
+    operands.
+    """
+
+    BINARY_OPS = {
+        TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+        TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+        TokenType.GREATER: OpCode.GREATER,
+        TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+        TokenType.LESS: OpCode.LESS,
+        TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+        TokenType.MINUS: OpCode.SUBTRACT,
+        TokenType.PLUS: OpCode.ADD,
+        TokenType.SLASH: OpCode.DIVIDE,
+        TokenType.STAR: OpCode.MULTIPLY,
+    }
+
+    def __init__(self, enclosing: Compiler | None = None) -> None:
+        self._chunk = Chunk()
+        self._locals: list[tuple[str, int]] = []
+        self._scope_depth = 0
+        self._line = 1
+        self._enclosing = enclosing
+        self._upvalues: list[tuple[bool, int]] = []
+        # slots of the locals that some nested function captures
+        self._captured: set[int] = set()
+        # whether this compiles an `init` method, which returns `this`
+        self._initializer = False
+        # expressions still to be compiled and, flagged True, the ones whose
+        # own code follows their operands', with the offsets of the jumps to
+        # patch once the code in between is emitted
+        self._pending: list[tuple[Expr, bool] | int] = []
+
+    def compile(self, statements: list[Stmt]) -> Chunk:
+        """Compiles the statements and returns the finished chunk."""
+        for statement in statements:
+            statement.accept(self)
+        self._emit(OpCode.RETURN)
+        return self._chunk
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        self._expression(stmt.expression)
+        self._emit(OpCode.POP)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        self._expression(stmt.expression)
+        self._emit(OpCode.PRINT)
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        self._line = stmt.name.line
+        if stmt.initializer is not None:
+            self._expression(stmt.initializer)
+        else:
+            self._emit(OpCode.NIL)
+
+        if self._scope_depth > 0:
+            # the value stays on the stack and becomes the local's slot
+            self._locals.append((stmt.name.lexeme, self._scope_depth))
+            return
+
+        self._emit(OpCode.DEFINE_GLOBAL, self._chunk.add_constant(stmt.name.lexeme))
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        self._scope_depth += 1
+        for statement in stmt.statements:
+            statement.accept(self)
+        self._end_scope()
+
+    def _end_scope(self) -> None:
+        """Pop the locals of the innermost scope, closing captured ones."""
+        self._scope_depth -= 1
+        count = 0
+        while self._locals and self._locals[-1][1] > self._scope_depth:
+            self._locals.pop()
+            slot = len(self._locals)
+            if slot in self._captured:
+                self._captured.discard(slot)
+                self._emit_pops(count)
+                self._emit(OpCode.CLOSE_UPVALUE)
+                count = 0
+            else:
+                count += 1
+        self._emit_pops(count)
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        self._expression(stmt.condition)
+        then_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        self._emit(OpCode.POP)
+        stmt.then_branch.accept(self)
+
+        else_jump = self._emit_jump(OpCode.JUMP)
+        self._patch_jump(then_jump)
+        self._emit(OpCode.POP)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+        self._patch_jump(else_jump)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        # jump targets are absolute, so looping back is a plain JUMP
+        loop_start = len(self._chunk.code)
+        self._expression(stmt.condition)
+        exit_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        self._emit(OpCode.POP)
+        stmt.body.accept(self)
+        self._emit(OpCode.JUMP, loop_start)
+
+        self._patch_jump(exit_jump)
+        self._emit(OpCode.POP)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        self._line = stmt.name.line
+        if self._scope_depth > 0:
+            # declared before the body so the function can call itself
+            self._locals.append((stmt.name.lexeme, self._scope_depth))
+
+        # slot 0 holds the function being called
+        self._function(stmt, "")
+        if self._scope_depth == 0:
+            name = self._chunk.add_constant(stmt.name.lexeme)
+            self._emit(OpCode.DEFINE_GLOBAL, name)
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        self._line = stmt.name.line
+        name = self._chunk.add_constant(stmt.name.lexeme)
+        if self._scope_depth > 0:
+            self._locals.append((stmt.name.lexeme, self._scope_depth))
+        self._emit(OpCode.CLASS, name)
+        if self._scope_depth == 0:
+            self._emit(OpCode.DEFINE_GLOBAL, name)
+
+        superclass = stmt.superclass
+        if superclass is not None:
+            self._expression(superclass)
+            # the superclass stays on the stack as the methods' `super`
+            self._scope_depth += 1
+            self._locals.append(("super", self._scope_depth))
+            self._get_variable(stmt.name)
+            self._line = superclass.name.line
+            self._emit(OpCode.INHERIT)
+
+        # the class stays on the stack while its methods are added
+        self._get_variable(stmt.name)
+        for method in stmt.methods:
+            self._function(method, "this")
+            self._emit(OpCode.METHOD, self._chunk.add_constant(method.name.lexeme))
+        self._emit(OpCode.POP)
+        if superclass is not None:
+            self._end_scope()
+
+    def _function(self, stmt: FunctionStmt, receiver: str) -> None:
+        """Compile a function into a `Function` of its own, and emit the
+        `CLOSURE` that creates it. Slot 0 of its frame is named `receiver`."""
+        function = Function(stmt.name.lexeme, len(stmt.params))
+        compiler = Compiler(self)
+        compiler._chunk = function.chunk
+        compiler._line = self._line
+        compiler._scope_depth = 1
+        compiler._initializer = receiver == "this" and stmt.name.lexeme == "init"
+        compiler._locals.append((receiver, 1))
+        for param in stmt.params:
+            compiler._locals.append((param.lexeme, 1))
+        for statement in stmt.body:
+            statement.accept(compiler)
+        compiler._emit_return()
+        function.upvalues = compiler._upvalues
+
+        self._line = stmt.name.line
+        self._emit(OpCode.CLOSURE, self._chunk.add_constant(function))
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        value = stmt.value
+        if value is None:
+            self._line = stmt.keyword.line
+            self._emit_return()
+            return
+        if isinstance(value, CallExpr) and not isinstance(value.callee, GetExpr):
+            self._expression(value.callee)
+            for argument in value.arguments:
+                self._expression(argument)
+            self._line = value.paren.line
+            self._emit(OpCode.TAIL_CALL, len(value.arguments))
+        else:
+            self._expression(value)
+        self._emit(OpCode.RETURN)
+
+    def visit_call_expr(self, expr: CallExpr) -> None:
+        self._line = expr.paren.line
+        callee = expr.callee
+        if isinstance(callee, GetExpr):
+            # the receiver took the callee's place, as the method's `this`
+            property = self._chunk.add_property(callee.name)
+            self._emit(OpCode.INVOKE, property, len(expr.arguments))
+        else:
+            self._emit(OpCode.CALL, len(expr.arguments))
+
+    def visit_get_expr(self, expr: GetExpr) -> None:
+        self._line = expr.name.line
+        self._emit(OpCode.GET_PROPERTY, self._chunk.add_property(expr.name))
+
+    def visit_set_expr(self, expr: SetExpr) -> None:
+        self._line = expr.name.line
+        self._emit(OpCode.SET_PROPERTY, self._chunk.add_property(expr.name))
+
+    def visit_this_expr(self, expr: ThisExpr) -> None:
+        self._get_variable(expr.keyword)
+
+    def visit_super_expr(self, expr: SuperExpr) -> None:
+        line = expr.keyword.line
+        self._get_variable(Token(TokenType.THIS, "this", None, line))
+        self._get_variable(expr.keyword)
+        self._line = expr.method.line
+        self._emit(OpCode.GET_SUPER, self._chunk.add_constant(expr.method.lexeme))
+
+    def visit_assign_expr(self, expr: AssignExpr) -> None:
+        self._line = expr.name.line
+        slot = self._resolve_local(expr.name)
+        if slot is not None:
+            self._emit(OpCode.SET_LOCAL, slot)
+        elif (index := self._resolve_upvalue(expr.name)) is not None:
+            self._emit(OpCode.SET_UPVALUE, index)
+        else:
+            name = self._chunk.add_constant(expr.name.lexeme)
+            self._emit(OpCode.SET_GLOBAL, name)
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> None:
+        self._line = expr.operator.line
+        self._emit(Compiler.BINARY_OPS[expr.operator.type])
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> None:
+        pass
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> None:
+        self._line = expr.operator.line
+        if expr.operator.type is TokenType.BANG:
+            self._emit(OpCode.NOT)
+        else:
+            self._emit(OpCode.NEGATE)
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> None:
+        if expr.value is None:
+            self._emit(OpCode.NIL)
+        elif expr.value is True:
+            self._emit(OpCode.TRUE)
+        elif expr.value is False:
+            self._emit(OpCode.FALSE)
+        else:
+            self._emit(OpCode.CONSTANT, self._chunk.add_constant(expr.value))
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> None:
+        # only the left operand has been compiled; the right one follows
+        # the jump that skips it
+        self._line = expr.operator.line
+        if expr.operator.type is TokenType.OR:
+            end_jump = self._emit_jump(OpCode.JUMP_IF_TRUE)
+        else:  # AND
+            end_jump = self._emit_jump(OpCode.JUMP_IF_FALSE)
+        self._emit(OpCode.POP)
+        self._pending.append(end_jump)
+        self._pending.append((expr.right, False))
+
+    def visit_variable_expr(self, expr: VariableExpr) -> None:
+        self._get_variable(expr.name)
+
+    def _get_variable(self, name: Token) -> None:
+        self._line = name.line
+        slot = self._resolve_local(name)
+        if slot is not None:
+            self._emit(OpCode.GET_LOCAL, slot)
+        elif (index := self._resolve_upvalue(name)) is not None:
+            self._emit(OpCode.GET_UPVALUE, index)
+        else:
+            self._emit(OpCode.GET_GLOBAL, self._chunk.add_constant(name.lexeme))
+
+    def _resolve_local(self, name: Token) -> int | None:
+        """Find the stack slot of the innermost local with the given name."""
+        for slot in range(len(self._locals) - 1, -1, -1):
+            if self._locals[slot][0] == name.lexeme:
+                return slot
+        return None
+
+    def _resolve_upvalue(self, name: Token) -> int | None:
+        """Find the upvalue index of a variable local to an enclosing function."""
+        if self._enclosing is None:
+            return None
+
+        slot = self._enclosing._resolve_local(name)
+        if slot is not None:
+            self._enclosing._captured.add(slot)
+            return self._add_upvalue(True, slot)
+
+        index = self._enclosing._resolve_upvalue(name)
+        if index is not None:
+            return self._add_upvalue(False, index)
+        return None
+
+    def _add_upvalue(self, is_local: bool, index: int) -> int:
+        upvalue = (is_local, index)
+        if upvalue not in self._upvalues:
+            self._upvalues.append(upvalue)
+        return self._upvalues.index(upvalue)
+
+    def _expression(self, expr: Expr) -> None:
+        """Compile an expression, its operands first."""
+        pending = self._pending
+        pending.append((expr, False))
+        while pending:
+            entry = pending.pop()
+            if type(entry) is int:
+                self._patch_jump(entry)
+                continue
+            expr, ready = entry
+            if ready:
+                expr.accept(self)
+                continue
+            pending.append((expr, True))
+            pending.extend(
+                (operand, False) for operand in reversed(self._operands(expr))
+            )
+
+    def _operands(self, expr: Expr) -> tuple[Expr, ...]:
+        """The operands compiled before an expression's own code."""
+        if isinstance(expr, LogicalExpr):
+            return (expr.left,)
+        if isinstance(expr, CallExpr) and isinstance(expr.callee, GetExpr):
+            # the receiver takes the callee's place, as the method's `this`
+            return (expr.callee.object, *expr.arguments)
+        return operands(expr)
+
+    def _emit_return(self) -> None:
+        """Emit the return at the end of a function or of a bare `return`."""
+        if self._initializer:
+            self._emit(OpCode.GET_LOCAL, 0)
+        else:
+            self._emit(OpCode.NIL)
+        self._emit(OpCode.RETURN)
+
+    def _emit_pops(self, count: int) -> None:
+        if count == 1:
+            self._emit(OpCode.POP)
+        elif count > 1:
+            self._emit(OpCode.POPN, count)
+
+    def _emit(self, op: OpCode, *operands: int) -> None:
+        self._chunk.write(op, self._line)
+        for operand in operands:
+            self._chunk.write(operand, self._line)
+
+    def _emit_jump(self, op: OpCode) -> int:
+        """Emit a jump with a placeholder target and return the operand offset."""
+        self._chunk.write(op, self._line)
+        return self._chunk.write(-1, self._line)
+
+    def _patch_jump(self, offset: int) -> None:
+        """Point the jump operand at `offset` to the next instruction."""
+        self._chunk.code[offset] = len(self._chunk.code)
@@ -0,0 +1,49 @@
+import re
+from collections.abc import Callable
+from typing import Any
+
+from src.expr import Expr
+from src.stmt import Stmt
+
+
+def node_classes() -> list[type[Expr] | type[Stmt]]:
+    """Every concrete expression and statement class."""
+    classes: list[type] = []
+    pending: list[type] = [Expr, Stmt]
+    while pending:
+        subclasses = pending.pop().__subclasses__()
+        classes.extend(subclasses)
+        pending.extend(subclasses)
+    return classes
+
+
+def visit_method_name(node_class: type) -> str:
+    """The name of the visit method for a node class, the one its `accept`
+    calls: `BinaryExpr` is visited by `visit_binary_expr`."""
+    return "visit_" + re.sub(r"(?<!^)(?=[A-Z])", "_", node_class.__name__).lower()
+
+
+class DispatchVisitor:
+    """A visitor that finds its visit methods in a dispatch table.
+
+    `node.accept(visitor)` is a Python call whose only work is calling the
+    right visit method. A dispatch visitor maps every node class to its
+    bound visit method once, when it is created, so `visit(node)` is a
+    dictionary lookup and a single call; hot loops can index
+    `_visit_methods` directly to skip `visit` as well.
+
+    Subclasses still derive from `Expr.Visitor`/`Stmt.Visitor`, which check
+    that they define every visit method, and nodes can still be visited
+    through `accept`.
+    """
+
+    def __init__(self) -> None:
+        self._visit_methods: dict[type, Callable[[Any], Any]] = {}
+        for node_class in node_classes():
+            method = getattr(self, visit_method_name(node_class), None)
+            if method is not None:
+                self._visit_methods[node_class] = method
+
+    def visit(self, node: Expr | Stmt) -> Any:
+        """Calls the visit method for the node's class."""
+        return self._visit_methods[type(node)](node)
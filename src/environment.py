@@ -3,13 +3,39 @@ from src.exceptions import PloxRuntimeError
 
 
 class Environment:
-    def __init__(self, enclosing: Environment | None = None) -> None:
+    """A frame of variables.
+
+    Globals are looked up by name. Variables the `Resolver` bound to a
+    (depth, slot) pair are stored in a list and accessed by index.
+    """
+
+    __slots__ = ("_values", "_slots", "_enclosing")
+
+    def __init__(
+        self, enclosing: Environment | None = None, slots: list[object] | None = None
+    ) -> None:
         self._values: dict[str, object] = {}
+        self._slots: list[object] = slots if slots is not None else []
+        self._enclosing = enclosing
+
+    def reset(self, enclosing: Environment | None, slots: list[object]) -> None:
+        """Reuses the frame as if it were new, enclosed by `enclosing` and
+        taking over `slots` as its slots."""
+        self._values.clear()
+        self._slots = slots
         self._enclosing = enclosing
 
     def define(self, name: str, value: object) -> None:
         self._values[name] = value
 
+    def define_at(self, slot: int, value: object) -> None:
+        """Defines the variable in the given slot of this frame."""
+        slots = self._slots
+        if slot == len(slots):
+            slots.append(value)
+        else:
+            slots[slot] = value
+
     def assign(self, name: Token, value: object) -> None:
         if name.lexeme in self._values:
             self._values[name.lexeme] = value
@@ -21,6 +47,13 @@ class Environment:
 
         raise PloxRuntimeError(name, f"Undefined variable '{name.lexeme}'.")
 
+    def assign_at(self, distance: int, slot: int, value: object) -> None:
+        """Assigns the variable in a slot of the frame `distance` levels up."""
+        environment = self
+        for _ in range(distance):
+            environment = environment._enclosing  # type: ignore[assignment]
+        environment._slots[slot] = value
+
     def get(self, name: Token) -> object:
         if name.lexeme in self._values:
             return self._values[name.lexeme]
@@ -29,3 +62,10 @@ class Environment:
             return self._enclosing.get(name)
 
         raise PloxRuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+
+    def get_at(self, distance: int, slot: int) -> object:
+        """Returns the variable in a slot of the frame `distance` levels up."""
+        environment = self
+        for _ in range(distance):
+            environment = environment._enclosing  # type: ignore[assignment]
+        return environment._slots[slot]
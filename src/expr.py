@@ -2,13 +2,23 @@ from abc import ABC, abstractmethod
 from typing import TypeVar, Generic
 
 from src.token import Token
+from collections.abc import Callable
+
+from src.inline_cache import InlineCache
+from src.quickening import BinarySpecialization, FastPath
 
 
 T = TypeVar("T")
 
 
 class Expr(ABC):
-    """Base class for all expression types."""
+    """Base class for all expression types.
+
+    Nodes declare their fields in `__slots__`, so they carry no per-instance
+    `__dict__`; `AstArena` stores large trees more compactly still.
+    """
+
+    __slots__ = ()
 
     class Visitor(ABC, Generic[T]):
         """Visitor interface for expression nodes."""
@@ -34,39 +44,70 @@ class Expr(ABC):
         @abstractmethod
         def visit_variable_expr(self, expr: VariableExpr) -> T: ...
 
+        @abstractmethod
+        def visit_call_expr(self, expr: CallExpr) -> T: ...
+
+        @abstractmethod
+        def visit_get_expr(self, expr: GetExpr) -> T: ...
+
+        @abstractmethod
+        def visit_set_expr(self, expr: SetExpr) -> T: ...
+
+        @abstractmethod
+        def visit_this_expr(self, expr: ThisExpr) -> T: ...
+
+        @abstractmethod
+        def visit_super_expr(self, expr: SuperExpr) -> T: ...
+
     @abstractmethod
     def accept(self, visitor: Visitor[T]) -> T: ...
 
 
 class AssignExpr(Expr):
+    __slots__ = ("name", "value", "location")
+
     def __init__(self, name: Token, value: Expr) -> None:
         self.name = name
         self.value = value
+        # (depth, slot) set by the Resolver; None for globals
+        self.location: tuple[int, int] | None = None
 
     def accept(self, visitor: Expr.Visitor[T]) -> T:
         return visitor.visit_assign_expr(self)
 
 
 class BinaryExpr(Expr):
+    __slots__ = ("left", "operator", "right", "specialization", "static_path")
+
     def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
         self.left = left
         self.operator = operator
         self.right = right
+        # quickening state installed by the Interpreter on first evaluation
+        self.specialization: BinarySpecialization | None = None
+        # unchecked operation installed by TypeInference for proven operands
+        self.static_path: FastPath | None = None
 
     def accept(self, visitor: Expr.Visitor[T]) -> T:
         return visitor.visit_binary_expr(self)
 
 
 class UnaryExpr(Expr):
+    __slots__ = ("operator", "right", "static_path")
+
     def __init__(self, operator: Token, right: Expr) -> None:
         self.operator = operator
         self.right = right
+        # unchecked operation installed by TypeInference for a proven operand
+        self.static_path: Callable[[object], object] | None = None
 
     def accept(self, visitor: Expr.Visitor[T]) -> T:
         return visitor.visit_unary_expr(self)
 
 
 class GroupingExpr(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
@@ -75,6 +116,8 @@ class GroupingExpr(Expr):
 
 
 class LiteralExpr(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: object) -> None:
         self.value = value
 
@@ -83,6 +126,8 @@ class LiteralExpr(Expr):
 
 
 class LogicalExpr(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
         self.left = left
         self.operator = operator
@@ -93,8 +138,79 @@ class LogicalExpr(Expr):
 
 
 class VariableExpr(Expr):
+    __slots__ = ("name", "location")
+
     def __init__(self, name: Token) -> None:
         self.name = name
+        # (depth, slot) set by the Resolver; None for globals
+        self.location: tuple[int, int] | None = None
 
     def accept(self, visitor: Expr.Visitor[T]) -> T:
         return visitor.visit_variable_expr(self)
+
+
+class CallExpr(Expr):
+    __slots__ = ("callee", "paren", "arguments")
+
+    def __init__(self, callee: Expr, paren: Token, arguments: list[Expr]) -> None:
+        self.callee = callee
+        # the closing parenthesis, whose line runtime errors report
+        self.paren = paren
+        self.arguments = arguments
+
+    def accept(self, visitor: Expr.Visitor[T]) -> T:
+        return visitor.visit_call_expr(self)
+
+
+class GetExpr(Expr):
+    __slots__ = ("object", "name", "cache")
+
+    def __init__(self, object: Expr, name: Token) -> None:
+        self.object = object
+        self.name = name
+        # shapes seen by the Interpreter and where each has the property
+        self.cache: InlineCache | None = None
+
+    def accept(self, visitor: Expr.Visitor[T]) -> T:
+        return visitor.visit_get_expr(self)
+
+
+class SetExpr(Expr):
+    __slots__ = ("object", "name", "value", "cache")
+
+    def __init__(self, object: Expr, name: Token, value: Expr) -> None:
+        self.object = object
+        self.name = name
+        self.value = value
+        # shapes seen by the Interpreter and the slot or shape transition
+        # that stores the field in each
+        self.cache: InlineCache | None = None
+
+    def accept(self, visitor: Expr.Visitor[T]) -> T:
+        return visitor.visit_set_expr(self)
+
+
+class ThisExpr(Expr):
+    __slots__ = ("keyword", "location")
+
+    def __init__(self, keyword: Token) -> None:
+        self.keyword = keyword
+        # (depth, slot) set by the Resolver
+        self.location: tuple[int, int] | None = None
+
+    def accept(self, visitor: Expr.Visitor[T]) -> T:
+        return visitor.visit_this_expr(self)
+
+
+class SuperExpr(Expr):
+    __slots__ = ("keyword", "method", "location")
+
+    def __init__(self, keyword: Token, method: Token) -> None:
+        self.keyword = keyword
+        self.method = method
+        # (depth, slot) of the superclass set by the Resolver; `this` is
+        # in slot 0 one frame closer
+        self.location: tuple[int, int] | None = None
+
+    def accept(self, visitor: Expr.Visitor[T]) -> T:
+        return visitor.visit_super_expr(self)
@@ -0,0 +1,86 @@
+# returned by `InlineCache.find` for a shape it holds no entry for
+MISSING = object()
+
+
+class InlineCache:
+    """The shapes one property access has seen, and what it found in each.
+
+    A get caches the field's slot or the method it found; a set caches the
+    field's slot, or the shape an instance moves to when it gains the
+    field. A site that has seen one shape is monomorphic, up to
+    `MAX_SHAPES` polymorphic. A site that misses with every entry in use
+    is megamorphic: it keeps its entries but adds no more, and the
+    other shapes take the uncached path.
+
+    Attributes:
+        shapes: The shapes seen, in the order they were first seen.
+        targets: What the access found for each shape.
+        hits: Accesses answered by an entry.
+        misses: Accesses that took the uncached path.
+        megamorphic: Whether a shape was turned away for lack of room.
+    """
+
+    __slots__ = ("shapes", "targets", "hits", "misses", "megamorphic")
+
+    MAX_SHAPES = 4
+
+    def __init__(self) -> None:
+        self.shapes: list[object] = []
+        self.targets: list[object] = []
+        self.hits = 0
+        self.misses = 0
+        self.megamorphic = False
+
+    @property
+    def state(self) -> str:
+        """'uninitialized', 'monomorphic', 'polymorphic' or 'megamorphic'."""
+        if self.megamorphic:
+            return "megamorphic"
+        if not self.shapes:
+            return "uninitialized"
+        return "monomorphic" if len(self.shapes) == 1 else "polymorphic"
+
+    def find(self, shape: object) -> object:
+        """The target cached for the shape, or `MISSING`."""
+        shapes = self.shapes
+        for index in range(len(shapes)):
+            if shapes[index] is shape:
+                self.hits += 1
+                return self.targets[index]
+        self.misses += 1
+        return MISSING
+
+    def add(self, shape: object, target: object) -> None:
+        """Cache the target for a shape `find` just missed on."""
+        if len(self.shapes) < InlineCache.MAX_SHAPES:
+            self.shapes.append(shape)
+            self.targets.append(target)
+        else:
+            self.megamorphic = True
+
+
+class InlineCacheStats:
+    """Totals over the inline caches of an interpreter."""
+
+    def __init__(self, caches: list[InlineCache]) -> None:
+        self.sites = len(caches)
+        self.monomorphic = sum(1 for c in caches if c.state == "monomorphic")
+        self.polymorphic = sum(1 for c in caches if c.state == "polymorphic")
+        self.megamorphic = sum(1 for c in caches if c.megamorphic)
+        self.hits = sum(c.hits for c in caches)
+        self.misses = sum(c.misses for c in caches)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of property accesses answered by a cache entry."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def __repr__(self) -> str:
+        return (
+            f"InlineCacheStats(sites={self.sites}, monomorphic={self.monomorphic}, "
+            f"polymorphic={self.polymorphic}, megamorphic={self.megamorphic}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
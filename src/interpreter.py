@@ -1,9 +1,14 @@
 from src.expr import (
     AssignExpr,
     BinaryExpr,
+    CallExpr,
+    GetExpr,
     GroupingExpr,
     LiteralExpr,
     LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
     UnaryExpr,
     Expr,
     VariableExpr,
@@ -12,74 +17,483 @@ from src.token_type import TokenType
 from src.token import Token
 from src.exceptions import PloxRuntimeError
 from collections.abc import Callable
-from src.stmt import BlockStmt, Stmt, ExpressionStmt, PrintStmt, VarStmt, IfStmt
+from src.stmt import (
+    BlockStmt,
+    Stmt,
+    ExpressionStmt,
+    PrintStmt,
+    VarStmt,
+    IfStmt,
+    WhileStmt,
+    FunctionStmt,
+    ReturnStmt,
+    ClassStmt,
+)
 from src.environment import Environment
-
-
-class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
-    def __init__(self) -> None:
-        self._environment = Environment()
+from src.memoization import MISSING, MemoCache, MemoStats
+from src.lox_callable import NATIVES, LoxFunction, NativeFunction, check_call
+from src.lox_class import (
+    BoundMethod,
+    LoxClass,
+    LoxInstance,
+    find_method,
+    get_property,
+    lookup_property,
+    set_property,
+)
+from src.inline_cache import InlineCache, InlineCacheStats
+from src.values import is_equal, is_truthy, stringify
+from src.quickening import BinarySpecialization, SpecializationStats
+from src.dispatch import DispatchVisitor
+from src.output import BufferedSink, OutputSink
+
+
+class Interpreter(DispatchVisitor, Expr.Visitor[object], Stmt.Visitor[bool | None]):
+    """Evaluates resolved statements by walking the AST.
+
+    Nodes are visited through the `DispatchVisitor` table rather than
+    `accept`, saving a Python call per node.
+
+    Expressions are evaluated recursively up to `MAX_RECURSION_DEPTH`
+    levels of nesting; deeper subexpressions are evaluated with an explicit
+    stack of pending operators, so nesting is limited only by memory.
+
+    Executing a statement returns True when a `return` statement ran, and
+    the statements around it stop and pass that on up to the call; the
+    returned value waits in `_returned`, so returning raises nothing.
+
+    Calls of functions the `PurityAnalysis` marked `memoized` go through a
+    `MemoCache` per function. Redefining or assigning the global name of a
+    memoized function stops memoizing it and every memoized function that
+    calls it, directly or indirectly, and clears their caches, since their
+    results may have come from calling it.
+
+    Every property access keeps an `InlineCache` on its node, created the
+    first time it runs, so accesses that keep seeing the same few instance
+    shapes find fields and methods without looking them up. A method
+    called straight off an instance or `super` runs without a
+    `BoundMethod` being created for it.
+
+    Attributes:
+        output: Where `print` statements write. By default a `BufferedSink`
+            on stdout; it is flushed before a runtime error is reported and
+            when `interpret` returns, unless it is called with `flush`
+            False.
+        environments_allocated: Number of block environments created.
+        environments_elided: Number of blocks run without a new environment.
+        frames_allocated: Number of call frames created.
+        frames_reused: Number of calls that ran in a pooled frame.
+    """
+
+    MAX_RECURSION_DEPTH = 64
+
+    def __init__(self, output: OutputSink | None = None) -> None:
+        super().__init__()
+        self.output = output if output is not None else BufferedSink()
+        self._globals = Environment()
+        self._environment = self._globals
+        for name, native in NATIVES.items():
+            self._globals.define(name, native)
+        self.environments_allocated = 0
+        self.environments_elided = 0
+        self.frames_allocated = 0
+        self.frames_reused = 0
+        # frames of finished calls that nothing else refers to
+        self._frames: list[Environment] = []
+        # the value of the `return` statement that ran, or the function,
+        # arguments and parenthesis of the tail call it made instead
+        self._returned: object = None
+        self._tail_call: tuple[LoxFunction, list[object], Token] | None = None
+        self._memos: dict[FunctionStmt, MemoCache] = {}
+        # memoized functions by the global names bound to them
+        self._memoized_names: dict[str, FunctionStmt] = {}
+        self._specializations: list[BinarySpecialization] = []
+        self._inline_caches: list[InlineCache] = []
+        # nesting depth of the expressions being evaluated recursively
+        self._depth = 0
 
     def interpret(
-        self, statements: list[Stmt], error_reporter: Callable[[PloxRuntimeError], None]
+        self,
+        statements: list[Stmt],
+        error_reporter: Callable[[PloxRuntimeError], None],
+        flush: bool = True,
     ) -> None:
+        # a runtime error leaves the depth of the expression it stopped in
+        self._depth = 0
         try:
             for statement in statements:
                 self._execute(statement)
         except PloxRuntimeError as error:
+            # what was printed before the error comes out before its report
+            self.output.flush()
             error_reporter(error)
+        finally:
+            if flush:
+                self.output.flush()
 
     def visit_var_stmt(self, stmt: VarStmt) -> None:
         value: object | None = None
         if stmt.initializer is not None:
             value = self._evaluate(stmt.initializer)
 
-        self._environment.define(stmt.name.lexeme, value)
+        if stmt.slot is None:
+            self._invalidate_memos(stmt.name.lexeme)
+            self._environment.define(stmt.name.lexeme, value)
+        else:
+            self._environment.define_at(stmt.slot, value)
 
     def visit_variable_expr(self, expr: VariableExpr) -> object:
-        return self._environment.get(expr.name)
+        location = expr.location
+        if location is None:
+            return self._globals.get(expr.name)
+        return self._environment.get_at(location[0], location[1])
 
     def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
         self._evaluate(stmt.expression)
 
     def visit_print_stmt(self, stmt: PrintStmt) -> None:
         value = self._evaluate(stmt.expression)
-        print(self._stringify(value))
+        self.output.write_line(self._stringify(value))
 
-    def visit_if_stmt(self, stmt: IfStmt) -> None:
+    def visit_if_stmt(self, stmt: IfStmt) -> bool | None:
         if self._is_truthy(self._evaluate(stmt.condition)):
-            self._execute(stmt.then_branch)
+            return self._execute(stmt.then_branch)
         elif stmt.else_branch is not None:
-            self._execute(stmt.else_branch)
+            return self._execute(stmt.else_branch)
+        return False
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> bool:
+        # a body that declares nothing is an elided block, so iterations
+        # run in the current environment instead of allocating their own
+        condition = stmt.condition
+        body = stmt.body
+        while self._is_truthy(self._evaluate(condition)):
+            if self._execute(body):
+                return True
+        return False
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        function = LoxFunction(stmt, self._environment)
+        if stmt.slot is None:
+            self._invalidate_memos(stmt.name.lexeme)
+            if stmt.memoized:
+                self._memoized_names[stmt.name.lexeme] = stmt
+            self._environment.define(stmt.name.lexeme, function)
+        else:
+            self._environment.define_at(stmt.slot, function)
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        klass = LoxClass(stmt.name.lexeme)
+        closure = self._environment
+        if stmt.superclass is not None:
+            superclass = self._evaluate(stmt.superclass)
+            klass.inherit(superclass, stmt.superclass.name)
+            # the methods' `super`
+            closure = Environment(closure, [superclass])
+        for method in stmt.methods:
+            name = method.name.lexeme
+            klass.add_method(name, LoxFunction(method, closure, name == "init"))
+
+        if stmt.slot is None:
+            self._invalidate_memos(stmt.name.lexeme)
+            self._environment.define(stmt.name.lexeme, klass)
+        else:
+            self._environment.define_at(stmt.slot, klass)
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> bool:
+        value = stmt.value
+        if type(value) is CallExpr and type(value.callee) is not GetExpr:
+            callee = self._evaluate(value.callee)
+            arguments = [self._evaluate(argument) for argument in value.arguments]
+            if type(callee) is LoxFunction and not callee.declaration.memoized:
+                # left for `_call` to make once this call's frame is gone
+                self._tail_call = (callee, arguments, value.paren)
+                return True
+            self._returned = self._call(callee, arguments, value.paren)
+        elif value is not None:
+            self._returned = self._evaluate(value)
+        return True
+
+    def visit_call_expr(self, expr: CallExpr) -> object:
+        callee_expr = expr.callee
+        if type(callee_expr) is GetExpr:
+            return self._invoke(callee_expr, expr)
+        if type(callee_expr) is SuperExpr:
+            return self._invoke_super(callee_expr, expr)
+        callee = self._evaluate(callee_expr)
+        arguments = [self._evaluate(argument) for argument in expr.arguments]
+        return self._call(callee, arguments, expr.paren)
+
+    def _invoke(self, get: GetExpr, call: CallExpr) -> object:
+        """Evaluate a call of a property, `object.name(arguments)`.
+
+        A method is called with the instance as `this` directly; a field
+        holding a function is called like any other value.
+        """
+        instance = self._evaluate(get.object)
+        target = lookup_property(instance, get.name, self._inline_cache(get))
+        assert type(instance) is LoxInstance
+        if type(target) is int:
+            callee = instance.fields[target]
+            arguments = [self._evaluate(argument) for argument in call.arguments]
+            return self._call(callee, arguments, call.paren)
+
+        arguments = [self._evaluate(argument) for argument in call.arguments]
+        assert type(target) is LoxFunction
+        check_call(target, arguments, call.paren)
+        return self._call_function(target, [instance, *arguments], call.paren)
+
+    def _invoke_super(self, expr: SuperExpr, call: CallExpr) -> object:
+        """Evaluate a call of a superclass method, `super.name(arguments)`."""
+        instance, method = self._super_method(expr)
+        arguments = [self._evaluate(argument) for argument in call.arguments]
+        check_call(method, arguments, call.paren)
+        return self._call_function(method, [instance, *arguments], call.paren)
+
+    def _call(self, callee: object, arguments: list[object], paren: Token) -> object:
+        """Call a value with its evaluated arguments.
+
+        A memoized function runs only for arguments its `MemoCache` holds
+        no result for.
+        """
+        function = check_call(callee, arguments, paren)
+        if isinstance(function, NativeFunction):
+            return function.function(*arguments)
+        if type(function) is BoundMethod:
+            method = function.method
+            assert type(method) is LoxFunction
+            return self._call_function(method, [function.receiver, *arguments], paren)
+        if type(function) is LoxClass:
+            return self._instantiate(function, arguments, paren)
+        assert isinstance(function, LoxFunction)
+        if not function.declaration.memoized:
+            return self._call_function(function, arguments, paren)
+
+        memo = self._memos.get(function.declaration)
+        if memo is None:
+            memo = MemoCache(function.name)
+            self._memos[function.declaration] = memo
+        key = MemoCache.key(arguments)
+        result = memo.get(key)
+        if result is MISSING:
+            result = self._call_function(function, arguments, paren)
+            memo.store(key, result)
+        return result
+
+    def _instantiate(
+        self, klass: LoxClass, arguments: list[object], paren: Token
+    ) -> LoxInstance:
+        """Create an instance of a class and run its initializer."""
+        instance = LoxInstance(klass)
+        initializer = klass.initializer
+        if initializer is not None:
+            assert type(initializer) is LoxFunction
+            self._call_function(initializer, [instance, *arguments], paren)
+        return instance
+
+    def _call_function(
+        self, function: LoxFunction, arguments: list[object], paren: Token
+    ) -> object:
+        """Run a call of a Lox function and the tail calls it makes.
+
+        The arguments become the first slots of the callee's frame; a
+        method's arguments start with the instance it is called on. Frames
+        of functions marked `pooled` go back to a pool when the call ends
+        and are reset for later calls instead of allocating new ones.
+
+        A tail call (`return f(...);` where `f` is a Lox function) does not
+        call `f` from inside the returning function: it ends that call and
+        this loop runs `f` in its place, so chains of tail calls run in
+        constant Python stack depth. Other recursion is limited by Python's
+        recursion limit and reported as a stack overflow. Tail calls of
+        memoized functions are made through `_call` instead.
+        """
+        previous = self._environment
+        depth = self._depth
+        # the callee's expressions start over at depth 0
+        self._depth = 0
+        frames = self._frames
+        visit_methods = self._visit_methods
+        try:
+            while True:
+                declaration = function.declaration
+                if declaration.pooled and frames:
+                    frame = frames.pop()
+                    frame.reset(function.closure, arguments)
+                    self.frames_reused += 1
+                else:
+                    frame = Environment(function.closure, arguments)
+                    self.frames_allocated += 1
+
+                self._environment = frame
+                for statement in declaration.body:
+                    if visit_methods[type(statement)](statement):
+                        break
+                if declaration.pooled:
+                    frames.append(frame)
+
+                tail_call = self._tail_call
+                if tail_call is None:
+                    value = self._returned
+                    self._returned = None
+                    return arguments[0] if function.initializer else value
+                self._tail_call = None
+                function, arguments, paren = tail_call
+                check_call(function, arguments, paren)
+        except RecursionError:
+            raise PloxRuntimeError(paren, "Stack overflow.") from None
+        finally:
+            self._environment = previous
+            self._depth = depth
 
     def visit_assign_expr(self, expr: AssignExpr) -> object:
-        value = self._evaluate(expr.value)
-        self._environment.assign(expr.name, value)
+        return self._assign(expr, self._evaluate(expr.value))
+
+    def _assign(self, expr: AssignExpr, value: object) -> object:
+        """Assign the evaluated value of an assignment expression."""
+        location = expr.location
+        if location is None:
+            self._invalidate_memos(expr.name.lexeme)
+            self._globals.assign(expr.name, value)
+        else:
+            self._environment.assign_at(location[0], location[1], value)
         return value
 
+    def visit_get_expr(self, expr: GetExpr) -> object:
+        instance = self._evaluate(expr.object)
+        return get_property(instance, expr.name, self._inline_cache(expr))
+
+    def visit_set_expr(self, expr: SetExpr) -> object:
+        instance = self._evaluate(expr.object)
+        value = self._evaluate(expr.value)
+        return set_property(instance, expr.name, value, self._inline_cache(expr))
+
+    def visit_this_expr(self, expr: ThisExpr) -> object:
+        location = expr.location
+        assert location is not None
+        return self._environment.get_at(location[0], location[1])
+
+    def visit_super_expr(self, expr: SuperExpr) -> object:
+        instance, method = self._super_method(expr)
+        return BoundMethod(instance, method)
+
+    def _super_method(self, expr: SuperExpr) -> tuple[LoxInstance, LoxFunction]:
+        """The instance `super` is used on and the method it refers to."""
+        location = expr.location
+        assert location is not None
+        depth, slot = location
+        superclass = self._environment.get_at(depth, slot)
+        assert type(superclass) is LoxClass
+        # `this` is in the frame of the method, inside the frame of `super`
+        instance = self._environment.get_at(depth - 1, 0)
+        assert type(instance) is LoxInstance
+        method = find_method(superclass, expr.method)
+        assert type(method) is LoxFunction
+        return instance, method
+
+    def _inline_cache(self, expr: GetExpr | SetExpr) -> InlineCache:
+        """The inline cache of a property access, created on first use."""
+        cache = expr.cache
+        if cache is None:
+            cache = InlineCache()
+            expr.cache = cache
+            self._inline_caches.append(cache)
+        return cache
+
     def visit_binary_expr(self, expr: BinaryExpr) -> object:
-        """Evaluate a binary expression."""
-        left = self._evaluate(expr.left)
-        right = self._evaluate(expr.right)
+        """Evaluate a binary expression.
 
-        match expr.operator.type:
+        Operators whose operand types `TypeInference` proved run unchecked.
+        Otherwise the node's specialized fast path is used when the operand
+        types match the ones it was quickened for, and the checked path when
+        they do not.
+        """
+        static_path = expr.static_path
+        if static_path is not None:
+            return static_path(self._evaluate(expr.left), self._evaluate(expr.right))
+
+        left = self._evaluate(expr.left)
+        return self._binary(expr, left, self._evaluate(expr.right))
+
+    def _binary(self, expr: BinaryExpr, left: object, right: object) -> object:
+        """Apply a binary expression to its evaluated operands."""
+        static_path = expr.static_path
+        if static_path is not None:
+            return static_path(left, right)
+
+        specialization = expr.specialization
+        if specialization is not None and specialization.fast_path is not None:
+            if (
+                type(left) is specialization.left_type
+                and type(right) is specialization.right_type
+            ):
+                specialization.hits += 1
+                return specialization.fast_path(left, right)
+            specialization.deoptimize()
+
+        result = self._binary_operation(expr.operator, left, right)
+
+        if specialization is None:
+            specialization = BinarySpecialization()
+            expr.specialization = specialization
+            self._specializations.append(specialization)
+        specialization.record(expr.operator.type, left, right)
+        return result
+
+    def memo_stats(self) -> MemoStats:
+        """Totals over the memo caches of the functions called so far."""
+        return MemoStats(list(self._memos.values()))
+
+    def _invalidate_memos(self, name: str) -> None:
+        """Stop memoizing the function `name` is about to stop naming, and
+        the memoized functions that depend on it, and clear their caches."""
+        if name not in self._memoized_names:
+            return
+        stale = {name}
+        dependents = stale
+        while dependents:
+            dependents = {
+                caller
+                for caller, declaration in self._memoized_names.items()
+                if caller not in stale and not declaration.callees.isdisjoint(stale)
+            }
+            stale |= dependents
+
+        for stale_name in stale:
+            declaration = self._memoized_names.pop(stale_name)
+            declaration.memoized = False
+            memo = self._memos.get(declaration)
+            if memo is not None:
+                memo.clear()
+
+    def inline_cache_stats(self) -> InlineCacheStats:
+        """Totals over the inline caches of the property accesses run so far."""
+        return InlineCacheStats(self._inline_caches)
+
+    def specialization_stats(self) -> SpecializationStats:
+        """Returns hit/miss totals of the quickened binary expressions."""
+        return SpecializationStats(self._specializations)
+
+    def _binary_operation(self, operator: Token, left: object, right: object) -> object:
+        """Apply a binary operator, checking the operand types."""
+        match operator.type:
             case TokenType.GREATER:
-                self._check_number_operands(expr.operator, left, right)
+                self._check_number_operands(operator, left, right)
                 assert isinstance(left, float)
                 assert isinstance(right, float)
                 return float(left) > float(right)
             case TokenType.GREATER_EQUAL:
-                self._check_number_operands(expr.operator, left, right)
+                self._check_number_operands(operator, left, right)
                 assert isinstance(left, float)
                 assert isinstance(right, float)
                 return float(left) >= float(right)
             case TokenType.LESS:
-                self._check_number_operands(expr.operator, left, right)
+                self._check_number_operands(operator, left, right)
                 assert isinstance(left, float)
                 assert isinstance(right, float)
                 return float(left) < float(right)
             case TokenType.LESS_EQUAL:
-                self._check_number_operands(expr.operator, left, right)
+                self._check_number_operands(operator, left, right)
                 assert isinstance(left, float)
                 assert isinstance(right, float)
                 return float(left) <= float(right)
@@ -88,7 +502,7 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
             case TokenType.EQUAL_EQUAL:
                 return self._is_equal(left, right)
             case TokenType.MINUS:
-                self._check_number_operands(expr.operator, left, right)
+                self._check_number_operands(operator, left, right)
                 assert isinstance(left, float)
                 assert isinstance(right, float)
                 return float(left) - float(right)
@@ -99,15 +513,15 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
                     return str(left) + str(right)
                 else:
                     raise PloxRuntimeError(
-                        expr.operator, "Operands must be two numbers or two strings."
+                        operator, "Operands must be two numbers or two strings."
                     )
             case TokenType.SLASH:
-                self._check_number_operands(expr.operator, left, right)
+                self._check_number_operands(operator, left, right)
                 assert isinstance(left, float)
                 assert isinstance(right, float)
                 return float(left) / float(right)
             case TokenType.STAR:
-                self._check_number_operands(expr.operator, left, right)
+                self._check_number_operands(operator, left, right)
                 assert isinstance(left, float)
                 assert isinstance(right, float)
                 return float(left) * float(right)
@@ -120,7 +534,17 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
 
     def visit_unary_expr(self, expr: UnaryExpr) -> object:
         """Evaluate a unary expression."""
-        right = self._evaluate(expr.right)
+        static_path = expr.static_path
+        if static_path is not None:
+            return static_path(self._evaluate(expr.right))
+
+        return self._unary(expr, self._evaluate(expr.right))
+
+    def _unary(self, expr: UnaryExpr, right: object) -> object:
+        """Apply a unary expression to its evaluated operand."""
+        static_path = expr.static_path
+        if static_path is not None:
+            return static_path(right)
 
         match expr.operator.type:
             case TokenType.BANG:
@@ -139,64 +563,105 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
     def visit_logical_expr(self, expr: LogicalExpr) -> object:
         """Evaluate a logical expression with short-circuiting."""
         left = self._evaluate(expr.left)
-
-        if expr.operator.type == TokenType.OR:
-            if self._is_truthy(left):
-                return left
-        else:  # AND
-            if not self._is_truthy(left):
-                return left
-
+        if self._short_circuits(expr, left):
+            return left
         return self._evaluate(expr.right)
 
+    def _short_circuits(self, expr: LogicalExpr, left: object) -> bool:
+        """Whether a logical expression's value is its left operand."""
+        if expr.operator.type is TokenType.OR:
+            return self._is_truthy(left)
+        return not self._is_truthy(left)  # AND
+
     def _stringify(self, obj: object) -> str:
         """Convert a Lox value to its string representation."""
-        if obj is None:
-            return "nil"
-
-        if isinstance(obj, float):
-            text = str(obj)
-            if text.endswith(".0"):
-                text = text[0 : len(text) - 2]
-            return text
-
-        return str(obj)
-
-    def _execute(self, statement: Stmt) -> None:
-        statement.accept(self)
+        return stringify(obj)
+
+    def _execute(self, statement: Stmt) -> bool | None:
+        """Execute a statement; True means a `return` statement ran."""
+        return self._visit_methods[type(statement)](statement)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> bool:
+        if stmt.elided:
+            self.environments_elided += 1
+            for statement in stmt.statements:
+                if self._execute(statement):
+                    return True
+            return False
 
-    def visit_block_stmt(self, stmt: BlockStmt) -> None:
-        self._execute_block(stmt.statements, Environment(self._environment))
+        self.environments_allocated += 1
+        return self._execute_block(stmt.statements, Environment(self._environment))
 
-    def _execute_block(self, statements: list[Stmt], environment: Environment) -> None:
+    def _execute_block(self, statements: list[Stmt], environment: Environment) -> bool:
         previous = self._environment
         try:
             self._environment = environment
             for statement in statements:
-                self._execute(statement)
+                if self._execute(statement):
+                    return True
+            return False
 
         finally:
             self._environment = previous
 
     def _evaluate(self, expr: Expr) -> object:
-        """Evaluate an expression using the visitor pattern."""
-        return expr.accept(self)
+        """Evaluate an expression through the dispatch table."""
+        if self._depth >= Interpreter.MAX_RECURSION_DEPTH:
+            return self._evaluate_iteratively(expr)
+        self._depth += 1
+        value = self._visit_methods[type(expr)](expr)
+        self._depth -= 1
+        return value
+
+    def _evaluate_iteratively(self, expr: Expr) -> object:
+        """Evaluate an expression without recursing into its operands.
+
+        `pending` holds expressions still to be evaluated and, under them,
+        the operators waiting for their operands (flagged True); evaluated
+        operands are pushed on `values` in order.
+        """
+        values: list[object] = []
+        pending: list[tuple[Expr, bool]] = [(expr, False)]
+        while pending:
+            expr, ready = pending.pop()
+            if ready:
+                if isinstance(expr, BinaryExpr):
+                    right = values.pop()
+                    values.append(self._binary(expr, values.pop(), right))
+                elif isinstance(expr, UnaryExpr):
+                    values.append(self._unary(expr, values.pop()))
+                elif isinstance(expr, AssignExpr):
+                    values.append(self._assign(expr, values.pop()))
+                elif isinstance(expr, LogicalExpr):
+                    if not self._short_circuits(expr, values[-1]):
+                        values.pop()
+                        pending.append((expr.right, False))
+            elif isinstance(expr, BinaryExpr):
+                pending.append((expr, True))
+                pending.append((expr.right, False))
+                pending.append((expr.left, False))
+            elif isinstance(expr, GroupingExpr):
+                pending.append((expr.expression, False))
+            elif isinstance(expr, UnaryExpr):
+                pending.append((expr, True))
+                pending.append((expr.right, False))
+            elif isinstance(expr, AssignExpr):
+                pending.append((expr, True))
+                pending.append((expr.value, False))
+            elif isinstance(expr, LogicalExpr):
+                pending.append((expr, True))
+                pending.append((expr.left, False))
+            else:
+                values.append(self._visit_methods[type(expr)](expr))
+        return values.pop()
 
     def _is_truthy(self, object: object) -> bool:
         """Determine if a value is truthy in Lox."""
-        if object is None:
-            return False
-        if isinstance(object, bool):
-            return bool(object)
-        return True
+        return is_truthy(object)
 
     def _is_equal(self, object_a: object, object_b: object) -> bool:
         """Test if two values are equal in Lox."""
-        if object_a is None and object_b is None:
-            return True
-        if object_a is None:
-            return False
-        return object_a == object_b
+        return is_equal(object_a, object_b)
 
     def _check_number_operand(self, operator: Token, operand: object) -> None:
         """Check that an operand is a number for unary operations."""
@@ -0,0 +1,82 @@
+"""Callable Lox values shared by the execution engines."""
+
+import time
+from collections.abc import Callable, Sequence
+
+from src.environment import Environment
+from src.exceptions import PloxRuntimeError
+from src.stmt import FunctionStmt
+from src.token import Token
+
+
+class LoxCallable:
+    """A value that Lox code can call.
+
+    Each engine runs function bodies its own way and has its own function
+    class; they all share the arity check and how functions print.
+
+    Attributes:
+        name: The name the function was declared with.
+        arity: Number of arguments the function takes.
+    """
+
+    __slots__ = ("name", "arity")
+
+    def __init__(self, name: str, arity: int) -> None:
+        self.name = name
+        self.arity = arity
+
+    def __str__(self) -> str:
+        return f"<fn {self.name}>"
+
+
+class NativeFunction(LoxCallable):
+    """A function implemented in Python and called with the arguments."""
+
+    __slots__ = ("function",)
+
+    def __init__(self, name: str, arity: int, function: Callable[..., object]) -> None:
+        super().__init__(name, arity)
+        self.function = function
+
+    def __str__(self) -> str:
+        return "<native fn>"
+
+
+class LoxFunction(LoxCallable):
+    """A function declared in Lox code, as run by the `Interpreter`.
+
+    Attributes:
+        declaration: The statement that declared the function.
+        closure: The environment the declaration ran in.
+        initializer: Whether the function is a class's `init` method, which
+            returns `this`.
+    """
+
+    __slots__ = ("declaration", "closure", "initializer")
+
+    def __init__(
+        self, declaration: FunctionStmt, closure: Environment, initializer: bool = False
+    ) -> None:
+        super().__init__(declaration.name.lexeme, len(declaration.params))
+        self.declaration = declaration
+        self.closure = closure
+        self.initializer = initializer
+
+
+# globals every engine defines before running a program
+NATIVES = {"clock": NativeFunction("clock", 0, time.time)}
+
+
+def check_call(
+    callee: object, arguments: Sequence[object], paren: Token
+) -> LoxCallable:
+    """Returns the callee if it can be called with the arguments, or raises
+    the runtime error reported at the call's closing parenthesis."""
+    if not isinstance(callee, LoxCallable):
+        raise PloxRuntimeError(paren, "Can only call functions and classes.")
+    if len(arguments) != callee.arity:
+        raise PloxRuntimeError(
+            paren, f"Expected {callee.arity} arguments but got {len(arguments)}."
+        )
+    return callee
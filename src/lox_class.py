@@ -0,0 +1,182 @@
+"""Classes and instances shared by the execution engines.
+
+An instance keeps its fields in a list, in the order they were first
+assigned. Which field is in which slot is described by the instance's
+`Shape` (a hidden class): instances of a class that gained the same
+fields in the same order share one shape, so a property access that has
+seen a shape can cache where the property is and skip the lookup the
+next time, see `InlineCache`.
+"""
+
+from src.exceptions import PloxRuntimeError
+from src.inline_cache import MISSING, InlineCache
+from src.lox_callable import LoxCallable
+from src.token import Token
+
+
+class Shape:
+    """The layout of the fields of instances of a class.
+
+    Shapes form a tree per class: the root has no fields, and assigning a
+    new field moves an instance to the child that adds it. A class's
+    instances therefore never share a shape with another class's, so a
+    shape also determines the methods an instance has.
+
+    Attributes:
+        klass: The class of the instances with this shape.
+        fields: The slot of each field.
+        transitions: The child shape for each field that has been added.
+    """
+
+    __slots__ = ("klass", "fields", "transitions")
+
+    def __init__(self, klass: LoxClass, fields: dict[str, int]) -> None:
+        self.klass = klass
+        self.fields = fields
+        self.transitions: dict[str, Shape] = {}
+
+    def with_field(self, name: str) -> Shape:
+        """The shape of an instance of this shape once it gains `name`."""
+        shape = self.transitions.get(name)
+        if shape is None:
+            shape = Shape(self.klass, {**self.fields, name: len(self.fields)})
+            self.transitions[name] = shape
+        return shape
+
+
+class LoxClass(LoxCallable):
+    """A class; calling it creates an instance and runs `init` on it.
+
+    The methods are those of the engine that declared the class. Inherited
+    methods are copied down when the class inherits, so finding a method
+    never walks up the superclass chain.
+
+    Attributes:
+        superclass: The class this class inherits from, if any.
+        methods: The methods of the class by name, inherited ones included.
+        shape: The shape of new instances, with no fields.
+    """
+
+    __slots__ = ("superclass", "methods", "shape")
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name, 0)
+        self.superclass: LoxClass | None = None
+        self.methods: dict[str, LoxCallable] = {}
+        self.shape = Shape(self, {})
+
+    def inherit(self, superclass: object, name: Token) -> None:
+        """Inherit the methods of the superclass the name refers to."""
+        if not isinstance(superclass, LoxClass):
+            raise PloxRuntimeError(name, "Superclass must be a class.")
+        self.superclass = superclass
+        self.methods.update(superclass.methods)
+        self.arity = superclass.arity
+
+    def add_method(self, name: str, method: LoxCallable) -> None:
+        self.methods[name] = method
+        if name == "init":
+            self.arity = method.arity
+
+    @property
+    def initializer(self) -> LoxCallable | None:
+        return self.methods.get("init")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class LoxInstance:
+    """An instance of a class.
+
+    Attributes:
+        shape: Where each field is in `fields`.
+        fields: The values of the fields.
+    """
+
+    __slots__ = ("shape", "fields")
+
+    def __init__(self, klass: LoxClass) -> None:
+        self.shape = klass.shape
+        self.fields: list[object] = []
+
+    def __str__(self) -> str:
+        return f"{self.shape.klass.name} instance"
+
+
+class BoundMethod(LoxCallable):
+    """A method looked up on an instance, called with it as `this`."""
+
+    __slots__ = ("receiver", "method")
+
+    def __init__(self, receiver: LoxInstance, method: LoxCallable) -> None:
+        super().__init__(method.name, method.arity)
+        self.receiver = receiver
+        self.method = method
+
+
+def find_property(shape: Shape, name: Token) -> object:
+    """The slot of the field, or else the method, that `name` refers to on
+    instances of the shape."""
+    slot = shape.fields.get(name.lexeme)
+    if slot is not None:
+        return slot
+    method = shape.klass.methods.get(name.lexeme)
+    if method is not None:
+        return method
+    raise PloxRuntimeError(name, f"Undefined property '{name.lexeme}'.")
+
+
+def find_method(klass: LoxClass, name: Token) -> LoxCallable:
+    """The method `super.name` refers to, given the superclass."""
+    method = klass.methods.get(name.lexeme)
+    if method is None:
+        raise PloxRuntimeError(name, f"Undefined property '{name.lexeme}'.")
+    return method
+
+
+def lookup_property(instance: object, name: Token, cache: InlineCache) -> object:
+    """The slot or method `find_property` finds, through the cache."""
+    if type(instance) is not LoxInstance:
+        raise PloxRuntimeError(name, "Only instances have properties.")
+    shape = instance.shape
+    target = cache.find(shape)
+    if target is MISSING:
+        target = find_property(shape, name)
+        cache.add(shape, target)
+    return target
+
+
+def get_property(instance: object, name: Token, cache: InlineCache) -> object:
+    """The value of a property; a method comes bound to the instance."""
+    target = lookup_property(instance, name, cache)
+    assert type(instance) is LoxInstance
+    if type(target) is int:
+        return instance.fields[target]
+    assert isinstance(target, LoxCallable)
+    return BoundMethod(instance, target)
+
+
+def set_property(
+    instance: object, name: Token, value: object, cache: InlineCache
+) -> object:
+    """Assign a field, adding it if the instance does not have it yet.
+
+    The cache holds the field's slot for shapes that have the field, and
+    the shape with the field added for those that do not.
+    """
+    if type(instance) is not LoxInstance:
+        raise PloxRuntimeError(name, "Only instances have fields.")
+    shape = instance.shape
+    target = cache.find(shape)
+    if target is MISSING:
+        slot = shape.fields.get(name.lexeme)
+        target = shape.with_field(name.lexeme) if slot is None else slot
+        cache.add(shape, target)
+    if type(target) is int:
+        instance.fields[target] = value
+    else:
+        assert isinstance(target, Shape)
+        instance.shape = target
+        instance.fields.append(value)
+    return value
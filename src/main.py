@@ -1,21 +1,71 @@
 import sys
 from pathlib import Path
 
+from src.ast_cache import AstCache
 from src.plox import Plox
 from src.constants import EX_USAGE
 
+USAGE = (
+    "Usage: plox [--engine=tree|vm|closure|python] [-O0|-O1] [--explain-types] "
+    "[--stream[=strict]] [--no-cache] [--intern] [--memoize] [--stats] [script]"
+)
+
 
 def main() -> int:
     """Entry point for the Plox interpreter."""
-    if len(sys.argv) > 2:
-        print("Usage: plox [script]", file=sys.stderr)
+    engine = "tree"
+    optimization_level = 0
+    explain_types = False
+    streaming = False
+    strict = False
+    use_cache = True
+    intern = False
+    memoize = False
+    stats = False
+    scripts: list[str] = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--engine="):
+            engine = arg.removeprefix("--engine=")
+        elif arg in ("-O0", "-O1"):
+            optimization_level = int(arg.removeprefix("-O"))
+        elif arg == "--explain-types":
+            explain_types = True
+        elif arg in ("--stream", "--stream=strict"):
+            streaming = True
+            strict = arg == "--stream=strict"
+        elif arg == "--no-cache":
+            use_cache = False
+        elif arg == "--intern":
+            intern = True
+        elif arg == "--memoize":
+            memoize = True
+        elif arg == "--stats":
+            stats = True
+        elif arg.startswith("-"):
+            print(USAGE, file=sys.stderr)
+            return EX_USAGE
+        else:
+            scripts.append(arg)
+
+    if len(scripts) > 1 or engine not in Plox.ENGINES:
+        print(USAGE, file=sys.stderr)
         return EX_USAGE
-    elif len(sys.argv) == 2:
-        plox = Plox()
-        path = Path(sys.argv[1])
+
+    plox = Plox(
+        engine=engine,
+        optimization_level=optimization_level,
+        explain_types=explain_types,
+        streaming=streaming,
+        strict=strict,
+        cache=AstCache(AstCache.default_directory()) if use_cache else None,
+        intern=intern,
+        memoize=memoize,
+        stats=stats,
+    )
+    if scripts:
+        path = Path(scripts[0])
         return plox.run_file(path)
     else:
-        plox = Plox()
         return plox.run_prompt()
 
 
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+
+# returned by `MemoCache.get` for arguments it holds no result for
+MISSING = object()
+
+
+class MemoCache:
+    """Results of calls to one pure function, keyed by argument values.
+
+    Holds at most `MAX_SIZE` results; storing another one evicts the
+    least recently used.
+
+    Attributes:
+        name: Name of the function.
+        results: Results by argument key, least recently used first.
+        hits: Calls answered from the cache.
+        misses: Calls that ran the function.
+        evictions: Results dropped to make room for newer ones.
+    """
+
+    __slots__ = ("name", "results", "hits", "misses", "evictions")
+
+    MAX_SIZE = 4096
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.results: OrderedDict[tuple[object, ...], object] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(arguments: list[object]) -> tuple[object, ...]:
+        """The cache key of a call's arguments.
+
+        Includes the argument types, since Python treats `true` and `1`
+        as equal keys and Lox does not, and numbers by their exact value,
+        since Python treats `0` and `-0` as equal and Lox prints them
+        differently.
+        """
+        exact = (
+            argument.hex() if type(argument) is float else argument
+            for argument in arguments
+        )
+        return (*exact, *map(type, arguments))
+
+    def get(self, key: tuple[object, ...]) -> object:
+        """The cached result for the key, or `MISSING`."""
+        result = self.results.get(key, MISSING)
+        if result is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+        return result
+
+    def store(self, key: tuple[object, ...], result: object) -> None:
+        self.results[key] = result
+        if len(self.results) > MemoCache.MAX_SIZE:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every result, for when a function it depends on changes."""
+        self.results.clear()
+
+
+class MemoStats:
+    """Totals over the memo caches of an interpreter.
+
+    Attributes:
+        caches: The cache of every memoized function that was called.
+    """
+
+    def __init__(self, caches: list[MemoCache]) -> None:
+        self.caches = caches
+        self.entries = sum(len(c.results) for c in caches)
+        self.hits = sum(c.hits for c in caches)
+        self.misses = sum(c.misses for c in caches)
+        self.evictions = sum(c.evictions for c in caches)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of memoized calls answered from a cache."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def __repr__(self) -> str:
+        return (
+            f"MemoStats(functions={len(self.caches)}, entries={self.entries}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
@@ -0,0 +1,321 @@
+from collections import Counter
+
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.interpreter import Interpreter
+from src.postorder import PostorderVisitor
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token_type import TokenType
+from src.values import is_truthy
+
+
+class Optimizer(PostorderVisitor[Expr], Expr.Visitor[Expr], Stmt.Visitor[Stmt | None]):
+    """Folds constant expressions and prunes constant branches.
+
+    Runs between the `Parser` and the `Resolver`:
+
+    - `Binary`/`Unary`/`Grouping`/`Logical` expressions whose operands are
+      literals are replaced by their value. An expression that would fail
+      at runtime (for example `"a" - 1`) is left alone, so the error is
+      still raised at runtime on the right line.
+    - Variables declared exactly once with a constant initializer and never
+      assigned are replaced by that constant after their declaration.
+      Without `whole_program`, a later program (such as the next REPL
+      line) may redeclare a global before a function body runs, so
+      globals are not replaced in function bodies.
+    - `if` statements with a constant condition are replaced by the branch
+      that would run, and `while` loops whose condition is constantly false
+      are removed.
+
+    Expressions are optimized operands first, as a `PostorderVisitor`:
+    visiting an expression stores its optimized operands into it.
+    """
+
+    def __init__(self, whole_program: bool = True) -> None:
+        self.whole_program = whole_program
+        self._evaluator = Interpreter()
+        self._declarations: Counter[str] = Counter()
+        self._assignments: Counter[str] = Counter()
+        self._scopes: list[dict[str, LiteralExpr]] = [{}]
+        self._function_depth = 0
+
+    def optimize(self, statements: list[Stmt]) -> list[Stmt]:
+        """Returns the optimized statements. Nodes are rewritten in place."""
+        _BindingCounter(self._declarations, self._assignments).count(statements)
+        return self._optimize_all(statements)
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> Stmt | None:
+        stmt.expression = self._walk_expression(stmt.expression)
+        return stmt
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> Stmt | None:
+        stmt.expression = self._walk_expression(stmt.expression)
+        return stmt
+
+    def visit_var_stmt(self, stmt: VarStmt) -> Stmt | None:
+        if stmt.initializer is not None:
+            stmt.initializer = self._walk_expression(stmt.initializer)
+
+        name = stmt.name.lexeme
+        if (
+            isinstance(stmt.initializer, LiteralExpr)
+            and self._declarations[name] == 1
+            and self._assignments[name] == 0
+        ):
+            self._scopes[-1][name] = stmt.initializer
+        return stmt
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> Stmt | None:
+        self._scopes.append({})
+        stmt.statements = self._optimize_all(stmt.statements)
+        self._scopes.pop()
+        return stmt
+
+    def visit_if_stmt(self, stmt: IfStmt) -> Stmt | None:
+        stmt.condition = self._walk_expression(stmt.condition)
+        if isinstance(stmt.condition, LiteralExpr):
+            if is_truthy(stmt.condition.value):
+                return stmt.then_branch.accept(self)
+            if stmt.else_branch is not None:
+                return stmt.else_branch.accept(self)
+            return None
+
+        stmt.then_branch = stmt.then_branch.accept(self) or BlockStmt([])
+        if stmt.else_branch is not None:
+            stmt.else_branch = stmt.else_branch.accept(self)
+        return stmt
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> Stmt | None:
+        stmt.condition = self._walk_expression(stmt.condition)
+        if isinstance(stmt.condition, LiteralExpr) and not is_truthy(
+            stmt.condition.value
+        ):
+            return None
+
+        stmt.body = stmt.body.accept(self) or BlockStmt([])
+        return stmt
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> Stmt | None:
+        self._scopes.append({})
+        self._function_depth += 1
+        stmt.body = self._optimize_all(stmt.body)
+        self._function_depth -= 1
+        self._scopes.pop()
+        return stmt
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> Stmt | None:
+        # the superclass stays a variable, so that it can be checked
+        for method in stmt.methods:
+            method.accept(self)
+        return stmt
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> Stmt | None:
+        if stmt.value is not None:
+            stmt.value = self._walk_expression(stmt.value)
+        return stmt
+
+    def visit_assign_expr(self, expr: AssignExpr) -> Expr:
+        (expr.value,) = self._operand_results(1)
+        return expr
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> Expr:
+        expr.left, expr.right = self._operand_results(2)
+        if isinstance(expr.left, LiteralExpr) and isinstance(expr.right, LiteralExpr):
+            return self._fold(expr)
+        return expr
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> Expr:
+        (expr.expression,) = self._operand_results(1)
+        if isinstance(expr.expression, LiteralExpr):
+            return expr.expression
+        return expr
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> Expr:
+        (expr.right,) = self._operand_results(1)
+        if isinstance(expr.right, LiteralExpr):
+            return self._fold(expr)
+        return expr
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> Expr:
+        return expr
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> Expr:
+        expr.left, expr.right = self._operand_results(2)
+        if not isinstance(expr.left, LiteralExpr):
+            return expr
+
+        left_is_result = is_truthy(expr.left.value)
+        if expr.operator.type is TokenType.AND:
+            left_is_result = not left_is_result
+        return expr.left if left_is_result else expr.right
+
+    def visit_call_expr(self, expr: CallExpr) -> Expr:
+        expr.callee, *expr.arguments = self._operand_results(1 + len(expr.arguments))
+        return expr
+
+    def visit_get_expr(self, expr: GetExpr) -> Expr:
+        (expr.object,) = self._operand_results(1)
+        return expr
+
+    def visit_set_expr(self, expr: SetExpr) -> Expr:
+        expr.object, expr.value = self._operand_results(2)
+        return expr
+
+    def visit_this_expr(self, expr: ThisExpr) -> Expr:
+        return expr
+
+    def visit_super_expr(self, expr: SuperExpr) -> Expr:
+        return expr
+
+    def visit_variable_expr(self, expr: VariableExpr) -> Expr:
+        scopes = self._scopes
+        if not self.whole_program and self._function_depth > 0:
+            scopes = scopes[1:]
+        for scope in reversed(scopes):
+            constant = scope.get(expr.name.lexeme)
+            if constant is not None:
+                return LiteralExpr(constant.value)
+        return expr
+
+    def _optimize_all(self, statements: list[Stmt]) -> list[Stmt]:
+        optimized: list[Stmt] = []
+        for statement in statements:
+            result = statement.accept(self)
+            if result is not None:
+                optimized.append(result)
+        return optimized
+
+    def _fold(self, expr: Expr) -> Expr:
+        """Evaluate an expression with literal operands, unless it fails."""
+        try:
+            return LiteralExpr(expr.accept(self._evaluator))
+        except Exception:
+            # leave the error to be reported at runtime
+            return expr
+
+
+class _BindingCounter(Expr.Visitor[tuple[Expr, ...]], Stmt.Visitor[None]):
+    """Counts declarations of and assignments to each variable name.
+
+    As in the `Resolver`, visiting an expression returns its operands
+    instead of counting them, and expressions are walked with an explicit
+    stack.
+    """
+
+    def __init__(self, declarations: Counter[str], assignments: Counter[str]) -> None:
+        self._declarations = declarations
+        self._assignments = assignments
+
+    def count(self, statements: list[Stmt]) -> None:
+        for statement in statements:
+            statement.accept(self)
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        self._count_expression(stmt.expression)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        self._count_expression(stmt.expression)
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        self._declarations[stmt.name.lexeme] += 1
+        if stmt.initializer is not None:
+            self._count_expression(stmt.initializer)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        self.count(stmt.statements)
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        self._count_expression(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        self._count_expression(stmt.condition)
+        stmt.body.accept(self)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        self._declarations[stmt.name.lexeme] += 1
+        self._count_function(stmt)
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        # methods are properties, not variables
+        self._declarations[stmt.name.lexeme] += 1
+        for method in stmt.methods:
+            self._count_function(method)
+
+    def _count_function(self, stmt: FunctionStmt) -> None:
+        # parameters shadow variables of the same name
+        for param in stmt.params:
+            self._declarations[param.lexeme] += 1
+        self.count(stmt.body)
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        if stmt.value is not None:
+            self._count_expression(stmt.value)
+
+    def visit_assign_expr(self, expr: AssignExpr) -> tuple[Expr, ...]:
+        self._assignments[expr.name.lexeme] += 1
+        return (expr.value,)
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> tuple[Expr, ...]:
+        return expr.left, expr.right
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> tuple[Expr, ...]:
+        return (expr.expression,)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> tuple[Expr, ...]:
+        return (expr.right,)
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> tuple[Expr, ...]:
+        return ()
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> tuple[Expr, ...]:
+        return expr.left, expr.right
+
+    def visit_variable_expr(self, expr: VariableExpr) -> tuple[Expr, ...]:
+        return ()
+
+    def visit_call_expr(self, expr: CallExpr) -> tuple[Expr, ...]:
+        return (expr.callee, *expr.arguments)
+
+    def visit_get_expr(self, expr: GetExpr) -> tuple[Expr, ...]:
+        return (expr.object,)
+
+    def visit_set_expr(self, expr: SetExpr) -> tuple[Expr, ...]:
+        return expr.object, expr.value
+
+    def visit_this_expr(self, expr: ThisExpr) -> tuple[Expr, ...]:
+        return ()
+
+    def visit_super_expr(self, expr: SuperExpr) -> tuple[Expr, ...]:
+        return ()
+
+    def _count_expression(self, expr: Expr) -> None:
+        pending = [expr]
+        while pending:
+            pending.extend(pending.pop().accept(self))
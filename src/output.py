@@ -0,0 +1,86 @@
+import sys
+from abc import ABC, abstractmethod
+from typing import TextIO
+
+
+class OutputSink(ABC):
+    """Where the `Interpreter` writes what `print` statements print."""
+
+    @abstractmethod
+    def write_line(self, text: str) -> None:
+        """Writes one printed value followed by a newline."""
+
+    def flush(self) -> None:
+        """Writes out anything held back."""
+
+
+class BufferedSink(OutputSink):
+    """Collects printed lines and writes them to a stream in batches.
+
+    Lines are joined and written with a single call once they add up to
+    `threshold` characters, and whenever the sink is flushed, instead of
+    one `print()` call per line.
+
+    Attributes:
+        threshold: Number of buffered characters that triggers a write.
+    """
+
+    DEFAULT_THRESHOLD = 1 << 16
+
+    def __init__(
+        self, stream: TextIO | None = None, threshold: int = DEFAULT_THRESHOLD
+    ) -> None:
+        # None writes to whatever `sys.stdout` is at the time of writing
+        self._stream = stream
+        self.threshold = threshold
+        self._lines: list[str] = []
+        self._size = 0
+
+    def write_line(self, text: str) -> None:
+        self._lines.append(text)
+        self._size += len(text) + 1
+        if self._size >= self.threshold:
+            self._write()
+
+    def flush(self) -> None:
+        self._write()
+        (self._stream or sys.stdout).flush()
+
+    def _write(self) -> None:
+        if not self._lines:
+            return
+        self._lines.append("")
+        (self._stream or sys.stdout).write("\n".join(self._lines))
+        self._lines.clear()
+        self._size = 0
+
+
+class LineBufferedSink(OutputSink):
+    """Writes and flushes every line as soon as it is printed, so that
+    output shows up immediately even when it goes to a pipe."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self._stream = stream
+
+    def write_line(self, text: str) -> None:
+        stream = self._stream or sys.stdout
+        stream.write(text + "\n")
+        stream.flush()
+
+
+class CaptureSink(OutputSink):
+    """Keeps printed lines in memory, for embedding and tests.
+
+    Attributes:
+        lines: Every line printed so far, without newlines.
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def write_line(self, text: str) -> None:
+        self.lines.append(text)
+
+    def getvalue(self) -> str:
+        """Everything printed so far, as it would have been written."""
+        return "".join(line + "\n" for line in self.lines)
@@ -1,5 +1,6 @@
-from collections.abc import Callable
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
 from src.token import Token
+from src.token_stream import TokenStream
 from src.token_type import TokenType
 from src.expr import Expr
 from src.expr import BinaryExpr
@@ -9,31 +10,118 @@ from src.expr import GroupingExpr
 from src.expr import VariableExpr
 from src.expr import AssignExpr
 from src.expr import LogicalExpr
+from src.expr import CallExpr
+from src.expr import GetExpr
+from src.expr import SetExpr
+from src.expr import ThisExpr
+from src.expr import SuperExpr
 from src.exceptions import ParseError
-from src.stmt import Stmt, PrintStmt, ExpressionStmt, VarStmt, BlockStmt, IfStmt
+from src.ast_interner import AstInterner
+from src.stmt import (
+    Stmt,
+    PrintStmt,
+    ExpressionStmt,
+    VarStmt,
+    BlockStmt,
+    IfStmt,
+    WhileStmt,
+    FunctionStmt,
+    ReturnStmt,
+    ClassStmt,
+)
 
 
 class Parser:
+    EQUALITY_OPERATORS = frozenset({TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL})
+    COMPARISON_OPERATORS = frozenset(
+        {
+            TokenType.GREATER,
+            TokenType.GREATER_EQUAL,
+            TokenType.LESS,
+            TokenType.LESS_EQUAL,
+        }
+    )
+    TERM_OPERATORS = frozenset({TokenType.MINUS, TokenType.PLUS})
+    FACTOR_OPERATORS = frozenset({TokenType.SLASH, TokenType.STAR})
+    UNARY_OPERATORS = frozenset({TokenType.BANG, TokenType.MINUS})
+
+    KEYWORD_LITERALS = {
+        TokenType.FALSE: False,
+        TokenType.TRUE: True,
+        TokenType.NIL: None,
+    }
+    VALUE_LITERALS = frozenset({TokenType.NUMBER, TokenType.STRING})
+
+    MAX_ARGUMENTS = 255
+
+    # tokens that start a statement, where synchronization can resume
+    STATEMENT_KEYWORDS = frozenset(
+        {
+            TokenType.CLASS,
+            TokenType.FUN,
+            TokenType.VAR,
+            TokenType.FOR,
+            TokenType.IF,
+            TokenType.WHILE,
+            TokenType.PRINT,
+            TokenType.RETURN,
+        }
+    )
+
     def __init__(
         self,
-        tokens: list[Token],
+        tokens: Sequence[Token] | TokenStream,
         error_reporter: Callable[[Token, str], None],
+        interner: AstInterner | None = None,
     ):
-        """Initialize the parser with tokens and error reporting."""
-        self._tokens: list[Token] = tokens
+        """Initialize the parser with tokens and error reporting.
+
+        With an `interner`, identical constant subtrees of the parsed
+        expressions are shared as soon as each expression is complete.
+        """
+        self._tokens = tokens
         self._current = 0
         self._error_reporter = error_reporter
+        self._interner = interner
+        # number of function bodies the parser is inside of
+        self._function_depth = 0
+        # whether the innermost function is an initializer
+        self._initializer = False
+        # for each class body the parser is inside of, innermost last,
+        # whether the class has a superclass
+        self._classes: list[bool] = []
+
+    @classmethod
+    def streaming(
+        cls,
+        tokens: Iterable[Token],
+        error_reporter: Callable[[Token, str], None],
+        interner: AstInterner | None = None,
+    ) -> Parser:
+        """A parser that pulls tokens on demand, e.g. from
+        `RegexScanner.stream_tokens()`, keeping only a small ring buffer of
+        them instead of the whole token list."""
+        return cls(TokenStream(tokens), error_reporter, interner)
 
     def parse(self) -> list[Stmt]:
-        statements: list[Stmt] = []
+        return list(self.declarations())
+
+    def declarations(self) -> Iterator[Stmt]:
+        """Yields each top-level declaration as soon as it is parsed.
+
+        Declarations with syntax errors are reported and skipped.
+        """
         while not self._is_at_end():
             decl = self._declaration()
             if decl is not None:
-                statements.append(decl)
-        return statements
+                yield decl
 
     def _declaration(self) -> Stmt | None:
         try:
+            if self._match(TokenType.CLASS):
+                return self._class_declaration()
+            if self._match(TokenType.FUN):
+                return self._function("function")
             if self._match(TokenType.VAR):
                 return self._var_declaration()
             return self._statement()
@@ -41,6 +129,56 @@ class Parser:
             self._synchronize()
             return None
 
+    def _class_declaration(self) -> Stmt:
+        name = self._consume(TokenType.IDENTIFIER, "Expect class name.")
+        superclass: VariableExpr | None = None
+        if self._match(TokenType.LESS):
+            superclass = VariableExpr(
+                self._consume(TokenType.IDENTIFIER, "Expect superclass name.")
+            )
+            if superclass.name.lexeme == name.lexeme:
+                self._error(superclass.name, "A class can't inherit from itself.")
+
+        self._consume(TokenType.LEFT_BRACE, "Expect '{' before class body.")
+        methods: list[FunctionStmt] = []
+        self._classes.append(superclass is not None)
+        try:
+            while not self._check(TokenType.RIGHT_BRACE) and not self._is_at_end():
+                methods.append(self._function("method"))
+        finally:
+            self._classes.pop()
+        self._consume(TokenType.RIGHT_BRACE, "Expect '}' after class body.")
+        return ClassStmt(name, superclass, methods)
+
+    def _function(self, kind: str) -> FunctionStmt:
+        name = self._consume(TokenType.IDENTIFIER, f"Expect {kind} name.")
+        self._consume(TokenType.LEFT_PAREN, f"Expect '(' after {kind} name.")
+        params: list[Token] = []
+        if not self._check(TokenType.RIGHT_PAREN):
+            while True:
+                if len(params) >= Parser.MAX_ARGUMENTS:
+                    self._error(self._peek(), "Can't have more than 255 parameters.")
+                param = self._consume(TokenType.IDENTIFIER, "Expect parameter name.")
+                if any(other.lexeme == param.lexeme for other in params):
+                    self._error(
+                        param, "Already a variable with this name in this scope."
+                    )
+                params.append(param)
+                if not self._match(TokenType.COMMA):
+                    break
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after parameters.")
+
+        self._consume(TokenType.LEFT_BRACE, f"Expect '{{' before {kind} body.")
+        self._function_depth += 1
+        initializer = self._initializer
+        self._initializer = kind == "method" and name.lexeme == "init"
+        try:
+            body = self._block()
+        finally:
+            self._function_depth -= 1
+            self._initializer = initializer
+        return FunctionStmt(name, params, body)
+
     def _var_declaration(self) -> Stmt:
         name = self._consume(TokenType.IDENTIFIER, "Expect variable name.")
         initalizer: Expr | None = None
@@ -63,11 +201,59 @@ class Parser:
 
         return IfStmt(condition, then_branch, else_branch)
 
+    def _while_statement(self) -> Stmt:
+        self._consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
+        condition = self._expression()
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
+        return WhileStmt(condition, self._statement())
+
+    def _for_statement(self) -> Stmt:
+        """Parses a `for` loop into the equivalent `while` loop.
+
+        The increment runs after the body in a block of its own; that block
+        declares nothing, so the `Resolver` elides it and iterations run
+        without creating an environment.
+        """
+        self._consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
+        initializer: Stmt | None
+        if self._match(TokenType.SEMICOLON):
+            initializer = None
+        elif self._match(TokenType.VAR):
+            initializer = self._var_declaration()
+        else:
+            initializer = self._expression_statement()
+
+        condition: Expr | None = None
+        if not self._check(TokenType.SEMICOLON):
+            condition = self._expression()
+        self._consume(TokenType.SEMICOLON, "Expect ';' after loop condition.")
+
+        increment: Expr | None = None
+        if not self._check(TokenType.RIGHT_PAREN):
+            increment = self._expression()
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
+
+        body = self._statement()
+        if increment is not None:
+            body = BlockStmt([body, ExpressionStmt(increment)])
+        if condition is None:
+            condition = self._interned(LiteralExpr(True))
+        body = WhileStmt(condition, body)
+        if initializer is not None:
+            body = BlockStmt([initializer, body])
+        return body
+
     def _statement(self) -> Stmt:
+        if self._match(TokenType.FOR):
+            return self._for_statement()
         if self._match(TokenType.IF):
             return self._if_statement()
         if self._match(TokenType.PRINT):
             return self._print_statement()
+        if self._match(TokenType.RETURN):
+            return self._return_statement()
+        if self._match(TokenType.WHILE):
+            return self._while_statement()
         if self._match(TokenType.LEFT_BRACE):
             return BlockStmt(self._block())
         return self._expression_statement()
@@ -86,6 +272,20 @@ class Parser:
         self._consume(TokenType.SEMICOLON, "Expect ';' after value.")
         return PrintStmt(value)
 
+    def _return_statement(self) -> Stmt:
+        keyword = self._previous()
+        if self._function_depth == 0:
+            # reported without unwinding, since the statement itself parses
+            self._error(keyword, "Can't return from top-level code.")
+
+        value: Expr | None = None
+        if not self._check(TokenType.SEMICOLON):
+            if self._initializer:
+                self._error(keyword, "Can't return a value from an initializer.")
+            value = self._expression()
+        self._consume(TokenType.SEMICOLON, "Expect ';' after return value.")
+        return ReturnStmt(keyword, value)
+
     def _expression_statement(self) -> Stmt:
         expr = self._expression()
         self._consume(TokenType.SEMICOLON, "Expect ';' after expression.")
@@ -93,7 +293,13 @@ class Parser:
 
     def _expression(self) -> Expr:
         """Parse an expression (top-level rule)."""
-        return self._assignment()
+        return self._interned(self._assignment())
+
+    def _interned(self, expr: Expr) -> Expr:
+        """The expression with its constant subtrees shared, if interning."""
+        if self._interner is None:
+            return expr
+        return self._interner.intern(expr)
 
     def _assignment(self) -> Expr:
         expr = self._or()
@@ -105,6 +311,8 @@ class Parser:
             if isinstance(expr, VariableExpr):
                 name = expr.name
                 return AssignExpr(name, value)
+            if isinstance(expr, GetExpr):
+                return SetExpr(expr.object, expr.name, value)
 
             # error(equals, "Invalid assignment target.");  # TODO
 
@@ -132,7 +340,7 @@ class Parser:
         """Parse equality expressions (== !=)."""
         expr = self._comparison()
 
-        while self._match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
+        while self._match_any(Parser.EQUALITY_OPERATORS):
             operator = self._previous()
             right = self._comparison()
             expr = BinaryExpr(expr, operator, right)
@@ -142,12 +350,7 @@ class Parser:
         """Parse comparison expressions (> >= < <=)."""
         expr = self._term()
 
-        while self._match(
-            TokenType.GREATER,
-            TokenType.GREATER_EQUAL,
-            TokenType.LESS,
-            TokenType.LESS_EQUAL,
-        ):
+        while self._match_any(Parser.COMPARISON_OPERATORS):
             operator = self._previous()
             right = self._term()
             expr = BinaryExpr(expr, operator, right)
@@ -157,7 +360,7 @@ class Parser:
         """Parse term expressions (+ -)."""
         expr = self._factor()
 
-        while self._match(TokenType.MINUS, TokenType.PLUS):
+        while self._match_any(Parser.TERM_OPERATORS):
             operator = self._previous()
             right = self._factor()
             expr = BinaryExpr(expr, operator, right)
@@ -167,7 +370,7 @@ class Parser:
         """Parse factor expressions (* /)."""
         expr = self._unary()
 
-        while self._match(TokenType.SLASH, TokenType.STAR):
+        while self._match_any(Parser.FACTOR_OPERATORS):
             operator = self._previous()
             right = self._unary()
             expr = BinaryExpr(expr, operator, right)
@@ -175,27 +378,61 @@ class Parser:
 
     def _unary(self) -> Expr:
         """Parse unary expressions (! -)."""
-        if self._match(TokenType.BANG, TokenType.MINUS):
+        if self._match_any(Parser.UNARY_OPERATORS):
             operator = self._previous()
             right = self._unary()
             return UnaryExpr(operator, right)
-        return self._primary()
+        return self._call()
+
+    def _call(self) -> Expr:
+        """Parse call expressions, `callee(arguments)`, and property
+        accesses, `object.name`."""
+        expr = self._primary()
+
+        while True:
+            if self._match(TokenType.LEFT_PAREN):
+                expr = self._finish_call(expr)
+            elif self._match(TokenType.DOT):
+                expr = self._finish_get(expr)
+            else:
+                return expr
+
+    def _finish_get(self, object: Expr) -> Expr:
+        """Parse the name of a property access whose `.` was just consumed."""
+        name = self._consume(TokenType.IDENTIFIER, "Expect property name after '.'.")
+        return GetExpr(object, name)
+
+    def _finish_call(self, callee: Expr) -> Expr:
+        """Parse the arguments of a call whose `(` was just consumed."""
+        arguments: list[Expr] = []
+        if not self._check(TokenType.RIGHT_PAREN):
+            while True:
+                if len(arguments) >= Parser.MAX_ARGUMENTS:
+                    self._error(self._peek(), "Can't have more than 255 arguments.")
+                arguments.append(self._expression())
+                if not self._match(TokenType.COMMA):
+                    break
+
+        paren = self._consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments.")
+        return CallExpr(callee, paren, arguments)
 
     def _primary(self) -> Expr:
         """Parse primary expressions (literals, identifiers, parentheses)."""
-        if self._match(TokenType.FALSE):
-            return LiteralExpr(False)
-        if self._match(TokenType.TRUE):
-            return LiteralExpr(True)
-        if self._match(TokenType.NIL):
-            return LiteralExpr(None)
-
-        if self._match(TokenType.NUMBER, TokenType.STRING):
+        if self._match_any(Parser.KEYWORD_LITERALS):
+            return LiteralExpr(Parser.KEYWORD_LITERALS[self._previous().type])
+
+        if self._match_any(Parser.VALUE_LITERALS):
             return LiteralExpr(self._previous().literal)
 
         if self._match(TokenType.IDENTIFIER):
             return VariableExpr(self._previous())
 
+        if self._match(TokenType.THIS):
+            return self._this(self._previous())
+
+        if self._match(TokenType.SUPER):
+            return self._super(self._previous())
+
         if self._match(TokenType.LEFT_PAREN):
             expr = self._expression()
             self._consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
@@ -203,13 +440,32 @@ class Parser:
 
         raise self._error(self._peek(), "Expect expression.")
 
-    def _match(self, *types: TokenType):
+    def _this(self, keyword: Token) -> Expr:
+        """Parse `this`, whose keyword was just consumed."""
+        if not self._classes:
+            self._error(keyword, "Can't use 'this' outside of a class.")
+        return ThisExpr(keyword)
+
+    def _super(self, keyword: Token) -> Expr:
+        """Parse `super.method`, whose keyword was just consumed."""
+        if not self._classes:
+            self._error(keyword, "Can't use 'super' outside of a class.")
+        elif not self._classes[-1]:
+            self._error(keyword, "Can't use 'super' in a class with no superclass.")
+        self._consume(TokenType.DOT, "Expect '.' after 'super'.")
+        method = self._consume(TokenType.IDENTIFIER, "Expect superclass method name.")
+        return SuperExpr(keyword, method)
+
+    def _match(self, *types: TokenType) -> bool:
         """Check if current token matches any of the given types."""
-        for type in types:
-            if self._check(type):
-                self._advance()
-                return True
-        return False
+        return self._match_any(types)
+
+    def _match_any(self, types: Collection[TokenType]) -> bool:
+        """Consume the current token if its type is in `types`."""
+        if self._is_at_end() or self._peek().type not in types:
+            return False
+        self._advance()
+        return True
 
     def _consume(self, type: TokenType, message: str) -> Token:
         """Consume a token of the expected type or report an error."""
@@ -227,33 +483,18 @@ class Parser:
         self._advance()
 
         while not self._is_at_end():
-            if self._previous().type == TokenType.SEMICOLON:
+            if self._previous().type is TokenType.SEMICOLON:
                 return
 
-            match self._peek().type:
-                case TokenType.CLASS:
-                    return
-                case TokenType.FUN:
-                    return
-                case TokenType.VAR:
-                    return
-                case TokenType.FOR:
-                    return
-                case TokenType.IF:
-                    return
-                case TokenType.WHILE:
-                    return
-                case TokenType.PRINT:
-                    return
-                case TokenType.RETURN:
-                    return
+            if self._peek().type in Parser.STATEMENT_KEYWORDS:
+                return
             self._advance()
 
     def _check(self, type: TokenType) -> bool:
         """Check if current token is of the given type."""
         if self._is_at_end():
             return False
-        return self._peek().type == type
+        return self._peek().type is type
 
     def _advance(self) -> Token:
         """Advance to the next token and return the current one."""
@@ -263,7 +504,7 @@ class Parser:
 
     def _is_at_end(self) -> bool:
         """Check if we've reached the end of tokens."""
-        return self._peek().type == TokenType.EOF
+        return self._peek().type is TokenType.EOF
 
     def _peek(self) -> Token:
         """Return the current token without advancing."""
@@ -1,31 +1,129 @@
+import mmap
 import sys
+from collections.abc import Iterator
 from pathlib import Path
+from src.ast_cache import AstCache
+from src.ast_interner import AstInterner
 from src.token import Token
+from src.token_buffer import Source
 from src.token_type import TokenType
-from src.scanner import Scanner
-from src.parser import Parser
+from src.regex_scanner import RegexScanner
+from src.pratt_parser import PrattParser
+from src.resolver import Resolver
+from src.optimizer import Optimizer
+from src.purity import PurityAnalysis
+from src.type_inference import TypeInference
 from src.exceptions import PloxRuntimeError
 from src.interpreter import Interpreter
+from src.output import LineBufferedSink, OutputSink
+from src.vm import VM
+from src.closure_compiler import ClosureCompiler
+from src.transpiler import ProgramCache, PythonEngine
+from src.stmt import Stmt
 from src.constants import EX_DATAERR, EX_SOFTWARE
 
 
 class Plox:
-    """The Lox interpreter class. Handles running files and REPL."""
+    """The Lox interpreter class. Handles running files and REPL.
 
-    def __init__(self):
+    Attributes:
+        engine: Name of the execution engine, one of `ENGINES`.
+        optimization_level: 0 runs the AST as parsed, 1 runs the `Optimizer`
+            and `TypeInference`.
+        explain_types: Report which operators `TypeInference` proved.
+        streaming: Run files one top-level declaration at a time, each as
+            soon as it is parsed, instead of parsing the whole file first.
+        strict: With `streaming`, check the whole file for syntax errors
+            before running anything, so that a file with errors does not
+            run at all.
+        cache: Where files that are not streamed keep their parsed
+            statements between runs, or None to always parse. The python
+            engine keeps its compiled programs next to them.
+        intern: Share identical constant subtrees and literal values
+            between parsed expressions. Ignored with `explain_types`,
+            which reports each operator by its own line.
+        output: Where the tree-walking interpreter writes printed values;
+            by default stdout, buffered when running files and line by
+            line in the REPL.
+        memoize: Run the `PurityAnalysis` so that the tree-walking
+            interpreter caches the results of pure functions. Other engines
+            ignore it.
+        stats: Report the memo and inline caches on stderr when a file or
+            the REPL finishes.
+    """
+
+    ENGINES = ("tree", "vm", "closure", "python")
+
+    MMAP_THRESHOLD = 1 << 20
+
+    def __init__(
+        self,
+        engine: str = "tree",
+        optimization_level: int = 0,
+        explain_types: bool = False,
+        streaming: bool = False,
+        strict: bool = False,
+        cache: AstCache | None = None,
+        intern: bool = False,
+        output: OutputSink | None = None,
+        memoize: bool = False,
+        stats: bool = False,
+    ):
+        if engine not in Plox.ENGINES:
+            raise ValueError(f"unknown engine: {engine}")
         self._had_error = False
         self._had_runtime_error = False
-        self._interpreter = Interpreter()
+        self.engine = engine
+        self.optimization_level = optimization_level
+        self.explain_types = explain_types
+        self.streaming = streaming
+        self.strict = strict
+        self.cache = cache
+        self.intern = intern
+        self.memoize = memoize
+        self.stats = stats
+        self._interner = AstInterner() if intern and not explain_types else None
+        self._interpreter: Interpreter | VM | ClosureCompiler | PythonEngine
+        if engine == "vm":
+            self._interpreter = VM()
+        elif engine == "closure":
+            self._interpreter = ClosureCompiler()
+        elif engine == "python":
+            self._interpreter = PythonEngine()
+        else:
+            self._interpreter = Interpreter(output)
+        self._program_cache: ProgramCache | None = None
+        if engine == "python" and cache is not None:
+            self._program_cache = ProgramCache(cache.directory, cache.max_bytes)
+        self.output = output
+        # whether each program run is the whole program, rather than one
+        # of several that share globals, such as REPL lines
+        self._whole_program = True
 
     def run_file(self, path: Path) -> int:
-        """Runs a Plox script from a file."""
+        """Runs a Plox script from a file.
+
+        Files of at least `MMAP_THRESHOLD` bytes are memory-mapped and
+        scanned as bytes rather than decoded into one string up front.
+        """
         try:
-            lines = Path.read_text(path, encoding="utf8")
+            size = path.stat().st_size
         except FileNotFoundError:
             print(f"error: file not found: {path}", file=sys.stderr)
             return 1
-        self._run(lines)
 
+        # an empty file cannot be mapped
+        if size >= Plox.MMAP_THRESHOLD and size > 0:
+            with (
+                path.open("rb") as file,
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source,
+            ):
+                self._run_script(source)
+        else:
+            self._run_script(path.read_text(encoding="utf8"))
+
+        if self.stats:
+            self._report_stats()
         if self._had_error:
             return EX_DATAERR
 
@@ -35,6 +133,9 @@ class Plox:
 
     def run_prompt(self) -> int:
         """Runs the Plox REPL (Read-Eval-Print Loop)."""
+        self._whole_program = False
+        if isinstance(self._interpreter, Interpreter) and self.output is None:
+            self._interpreter.output = LineBufferedSink()
         while True:
             try:
                 line = input("> ")
@@ -45,22 +146,177 @@ class Plox:
                 print()
                 break
             self._run(line)
+        if self.stats:
+            self._report_stats()
         return 0
 
-    def _run(self, source: str) -> None:
-        """Runs the given source code."""
-        scanner = Scanner(source, self._error_line)
-        tokens = scanner.scan_tokens()
-        parser = Parser(tokens, self._error)
+    def _run_script(self, source: Source) -> None:
+        if self.streaming:
+            self._run_streaming(source)
+        else:
+            self._run(source, cached=self.cache is not None)
+
+    def _run(self, source: Source, cached: bool = False) -> None:
+        """Runs the given source code, parsing it through `cache` if `cached`."""
+        frontend = self._parse_cached if cached else self._parse
+        try:
+            # explanations come from the frontend, which a cached program skips
+            if isinstance(self._interpreter, PythonEngine) and not self.explain_types:
+                self._interpreter.run_source(
+                    source,
+                    frontend,
+                    self._runtime_error,
+                    self._frontend_options(),
+                    self._program_cache if cached else None,
+                )
+                return
+
+            statements = frontend(source)
+            if statements is None:
+                return
+
+            self._interpreter.interpret(statements, self._runtime_error)
+        except RecursionError:
+            self._nested_too_deeply()
+
+    def _run_streaming(self, source: Source) -> None:
+        """Runs source code one top-level declaration at a time.
+
+        Each declaration is executed as soon as it is parsed and is not kept
+        afterwards. A syntax error stops execution, but parsing continues
+        so that every error is reported. In strict mode the source is parsed
+        once up front and nothing runs if it has errors.
+        """
+        if self.strict:
+            for _ in self._stream_declarations(source):
+                pass
+            if self._had_error:
+                return
+
+        self._whole_program = False
+        interpreter = self._interpreter
+        try:
+            for statement in self._stream_declarations(source):
+                if self._had_error or self._had_runtime_error:
+                    continue
+                try:
+                    statements = self._prepare([statement])
+                    if isinstance(interpreter, Interpreter):
+                        # output is flushed once, when the stream ends or
+                        # before a runtime error is reported, not per
+                        # declaration
+                        interpreter.interpret(
+                            statements, self._runtime_error, flush=False
+                        )
+                    else:
+                        interpreter.interpret(statements, self._runtime_error)
+                except RecursionError:
+                    self._nested_too_deeply()
+        finally:
+            if isinstance(interpreter, Interpreter):
+                interpreter.output.flush()
+
+    def _stream_declarations(self, source: Source) -> Iterator[Stmt]:
+        scanner = RegexScanner(source, self._error_line)
+        parser = PrattParser.streaming(
+            scanner.stream_tokens(), self._error, self._interner
+        )
+        return parser.declarations()
+
+    def _parse(self, source: Source) -> list[Stmt] | None:
+        """Scans, parses and resolves source code.
+
+        Returns None if there were errors.
+        """
+        statements = self._syntax_tree(source)
+        if statements is None:
+            return None
+        return self._prepare(statements)
+
+    def _parse_cached(self, source: Source) -> list[Stmt] | None:
+        """Like `_parse`, but skips scanning and parsing on a cache hit."""
+        assert self.cache is not None
+        statements = self.cache.load(source)
+        if statements is None:
+            statements = self._syntax_tree(source)
+            if statements is None:
+                return None
+            self.cache.store(source, statements)
+        elif self._interner is not None:
+            self._interner.intern_statements(statements)
+        return self._prepare(statements)
+
+    def _syntax_tree(self, source: Source) -> list[Stmt] | None:
+        """Scans and parses source code. Returns None if there were errors."""
+        scanner = RegexScanner(source, self._error_line)
+        tokens = scanner.scan_buffer()
+        parser = PrattParser(tokens, self._error, self._interner)
         statements = parser.parse()
         if self._had_error:
-            return
+            return None
+        return statements
 
-        self._interpreter.interpret(statements, self._runtime_error)
+    def _prepare(self, statements: list[Stmt]) -> list[Stmt]:
+        """Optimizes and resolves parsed statements.
+
+        Statements nested too deeply for the `Optimizer` or `TypeInference`
+        run as far as they were optimized: each rewrite and proof stands on
+        its own, so an unfinished pass leaves a correct program.
+        """
+        if self.optimization_level > 0:
+            try:
+                statements = Optimizer(self._whole_program).optimize(statements)
+            except RecursionError:
+                pass
+        Resolver().resolve(statements)
+        if self.memoize:
+            PurityAnalysis().analyze(statements)
+
+        if self.optimization_level > 0 or self.explain_types:
+            inference = TypeInference(self._whole_program)
+            try:
+                inference.infer(statements)
+            except RecursionError:
+                pass
+            if self.explain_types:
+                for explanation in inference.explanations:
+                    print(explanation, file=sys.stderr)
+        return statements
+
+    def _frontend_options(self) -> str:
+        """The options that change the statements `_parse` returns."""
+        return (
+            f"O{self.optimization_level} intern={self._interner is not None} "
+            f"memoize={self.memoize} whole_program={self._whole_program}"
+        )
+
+    def _report_stats(self) -> None:
+        """Reports the memo cache of every memoized function called and the
+        inline caches of every property access run."""
+        if not isinstance(self._interpreter, Interpreter):
+            return
+        stats = self._interpreter.memo_stats()
+        for memo in stats.caches:
+            print(
+                f"memo {memo.name}: {len(memo.results)} entries, {memo.hits} hits, "
+                f"{memo.misses} misses, {memo.evictions} evictions",
+                file=sys.stderr,
+            )
+        print(
+            f"memo: {len(stats.caches)} functions, hit rate {stats.hit_rate:.1%}",
+            file=sys.stderr,
+        )
+        caches = self._interpreter.inline_cache_stats()
+        print(
+            f"inline caches: {caches.sites} sites ({caches.monomorphic} monomorphic, "
+            f"{caches.polymorphic} polymorphic, {caches.megamorphic} megamorphic), "
+            f"hit rate {caches.hit_rate:.1%}",
+            file=sys.stderr,
+        )
 
     def _error(self, token: Token, message: str) -> None:
         """Reports an error at a specific token."""
-        if token.type == TokenType.EOF:
+        if token.type is TokenType.EOF:
             self._report(token.line, " at end", message)
         else:
             self._report(token.line, f" at '{token.lexeme}'", message)
@@ -69,11 +325,26 @@ class Plox:
         """Reports an error at a specific line (for scanner errors)."""
         self._report(line, "", message)
 
+    def _nested_too_deeply(self) -> None:
+        """Reports a program that ran out of Python stack outside of a Lox
+        call, which reports it as a stack overflow instead."""
+        if isinstance(self._interpreter, Interpreter):
+            self._interpreter.output.flush()
+        print(
+            f"Program nested too deeply for the {self.engine} engine.", file=sys.stderr
+        )
+        self._had_runtime_error = True
+
     def _runtime_error(self, error: PloxRuntimeError) -> None:
+        if isinstance(self._interpreter, Interpreter):
+            self._interpreter.output.flush()
         print(f"{error.message}\n[line {error.token.line}]", file=sys.stderr)
         self._had_runtime_error = True
 
     def _report(self, line: int, where: str, message: str) -> None:
         """Reports an error with line number and message."""
+        # while streaming, output of earlier declarations may be pending
+        if isinstance(self._interpreter, Interpreter):
+            self._interpreter.output.flush()
         print(f"[line {line} Error{where} : {message}]", file=sys.stderr)
         self._had_error = True
@@ -0,0 +1,76 @@
+from typing import Generic, TypeVar
+
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LogicalExpr,
+    SetExpr,
+    UnaryExpr,
+)
+
+T = TypeVar("T")
+
+
+def operands(expr: Expr) -> tuple[Expr, ...]:
+    """The subexpressions of an expression, in the order they are evaluated."""
+    match expr:
+        case BinaryExpr() | LogicalExpr():
+            return expr.left, expr.right
+        case UnaryExpr():
+            return (expr.right,)
+        case GroupingExpr():
+            return (expr.expression,)
+        case AssignExpr():
+            return (expr.value,)
+        case CallExpr():
+            return (expr.callee, *expr.arguments)
+        case GetExpr():
+            return (expr.object,)
+        case SetExpr():
+            return expr.object, expr.value
+    return ()
+
+
+class PostorderVisitor(Generic[T]):
+    """A visitor that visits the operands of an expression before the
+    expression itself, with an explicit stack rather than recursively, so
+    expressions can be nested as deeply as memory allows.
+
+    `_walk_expression` returns the result of visiting an expression. The
+    visit method of an expression does not visit its operands: it takes
+    their results, in the order `operands` gives them, from
+    `_operand_results`.
+    """
+
+    _results: list[T]
+
+    def _walk_expression(self, expr: Expr) -> T:
+        # expressions waiting for the results of their operands are flagged
+        # True under those operands
+        results: list[T] = []
+        self._results = results
+        pending: list[tuple[Expr, bool]] = [(expr, False)]
+        while pending:
+            expr, ready = pending.pop()
+            if ready:
+                results.append(expr.accept(self))  # type: ignore[arg-type]
+                continue
+            children = operands(expr)
+            if not children:
+                results.append(expr.accept(self))  # type: ignore[arg-type]
+                continue
+            pending.append((expr, True))
+            pending.extend((child, False) for child in reversed(children))
+        return results.pop()
+
+    def _operand_results(self, count: int) -> list[T]:
+        """The results of the last `count` operands visited, in order."""
+        results = self._results
+        start = len(results) - count
+        taken = results[start:]
+        del results[start:]
+        return taken
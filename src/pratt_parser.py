@@ -0,0 +1,210 @@
+from collections.abc import Callable
+from enum import IntEnum
+
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.parser import Parser
+from src.token import Token
+from src.token_type import TokenType
+
+
+class Precedence(IntEnum):
+    """Binding power of infix operators, from loosest to tightest."""
+
+    NONE = 0
+    ASSIGNMENT = 1
+    OR = 2
+    AND = 3
+    EQUALITY = 4
+    COMPARISON = 5
+    TERM = 6
+    FACTOR = 7
+    UNARY = 8
+
+
+type AtomRule = Callable[[Token], Expr]
+type InfixRule = Callable[[Expr, Token, Expr], Expr]
+
+
+def _literal(token: Token) -> Expr:
+    return LiteralExpr(token.literal)
+
+
+def _keyword_literal(token: Token) -> Expr:
+    return LiteralExpr(Parser.KEYWORD_LITERALS[token.type])
+
+
+def _variable(token: Token) -> Expr:
+    return VariableExpr(token)
+
+
+def _binary(left: Expr, operator: Token, right: Expr) -> Expr:
+    return BinaryExpr(left, operator, right)
+
+
+def _logical(left: Expr, operator: Token, right: Expr) -> Expr:
+    return LogicalExpr(left, operator, right)
+
+
+def _assign(target: Expr, equals: Token, value: Expr) -> Expr:
+    if isinstance(target, VariableExpr):
+        return AssignExpr(target.name, value)
+    if isinstance(target, GetExpr):
+        return SetExpr(target.object, target.name, value)
+    # like `Parser._assignment`, an invalid target is not reported yet
+    return target
+
+
+class PrattParser(Parser):
+    """A `Parser` whose expressions are parsed by precedence climbing.
+
+    Instead of one method per precedence level, `_parse_precedence` looks
+    up the current token in the rule tables and keeps folding infix
+    operators into the left operand while they bind at least as tightly as
+    the level it was asked for. Statements are parsed exactly as in
+    `Parser`, and the trees are identical to the ones it builds.
+
+    Operands that are still waiting for their operator to be completed
+    (the left side of an infix operator, an open prefix operator or
+    parenthesis, the callee of a call whose arguments are being parsed)
+    are kept on an explicit stack rather than in Python frames, so
+    expressions can be nested as deeply as memory allows.
+    """
+
+    def _expression(self) -> Expr:
+        return self._interned(self._parse_precedence(Precedence.ASSIGNMENT))
+
+    def _parse_precedence(self, precedence: Precedence) -> Expr:
+        """Parse an expression whose operators bind at least as tightly as
+        `precedence`."""
+        atom_rules = PrattParser.ATOM_RULES
+        prefix_rules = PrattParser.PREFIX_RULES
+        infix_rules = PrattParser.INFIX_RULES
+        # (operator, left operand or None for a prefix, enclosing precedence);
+        # the operator of a call is its `(` and its left operand the callee
+        pending: list[tuple[Token, Expr | None, Precedence]] = []
+        # the arguments parsed so far of each call on `pending`, innermost last
+        arguments: list[list[Expr]] = []
+
+        while True:
+            # prefix operators and parentheses open until an atom is found
+            token = self._peek()
+            operand_precedence = prefix_rules.get(token.type)
+            if operand_precedence is not None:
+                self._advance()
+                pending.append((token, None, precedence))
+                precedence = operand_precedence
+                continue
+            atom = atom_rules.get(token.type)
+            if atom is not None:
+                self._advance()
+                expr = atom(token)
+            elif token.type is TokenType.THIS:
+                self._advance()
+                expr = self._this(token)
+            elif token.type is TokenType.SUPER:
+                self._advance()
+                expr = self._super(token)
+            else:
+                raise self._error(token, "Expect expression.")
+
+            # fold infix operators, closing pending operators whose operand
+            # is complete, until one needs a right operand; calls and
+            # property accesses bind tightest of all, so they apply to the
+            # operand at hand
+            while True:
+                token = self._peek()
+                if token.type is TokenType.LEFT_PAREN:
+                    self._advance()
+                    if self._check(TokenType.RIGHT_PAREN):
+                        expr = CallExpr(expr, self._advance(), [])
+                        continue
+                    # the callee waits while each argument is parsed
+                    pending.append((token, expr, precedence))
+                    arguments.append([])
+                    precedence = Precedence.ASSIGNMENT
+                    break
+                if token.type is TokenType.DOT:
+                    self._advance()
+                    expr = self._finish_get(expr)
+                    continue
+                rule = infix_rules.get(token.type)
+                if rule is not None and rule[0] >= precedence:
+                    self._advance()
+                    pending.append((token, expr, precedence))
+                    precedence = rule[1]
+                    break
+                if not pending:
+                    return expr
+
+                operator, left, precedence = pending.pop()
+                if left is not None and operator.type is TokenType.LEFT_PAREN:
+                    call_arguments = arguments[-1]
+                    call_arguments.append(self._interned(expr))
+                    if self._match(TokenType.COMMA):
+                        if len(call_arguments) >= Parser.MAX_ARGUMENTS:
+                            self._error(
+                                self._peek(), "Can't have more than 255 arguments."
+                            )
+                        pending.append((operator, left, precedence))
+                        precedence = Precedence.ASSIGNMENT
+                        break
+                    paren = self._consume(
+                        TokenType.RIGHT_PAREN, "Expect ')' after arguments."
+                    )
+                    arguments.pop()
+                    expr = CallExpr(left, paren, call_arguments)
+                elif left is not None:
+                    expr = infix_rules[operator.type][2](left, operator, expr)
+                elif operator.type is TokenType.LEFT_PAREN:
+                    self._consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
+                    expr = GroupingExpr(expr)
+                else:
+                    expr = UnaryExpr(operator, expr)
+
+    # tokens that are a whole operand by themselves
+    ATOM_RULES: dict[TokenType, AtomRule] = {
+        TokenType.NUMBER: _literal,
+        TokenType.STRING: _literal,
+        TokenType.FALSE: _keyword_literal,
+        TokenType.TRUE: _keyword_literal,
+        TokenType.NIL: _keyword_literal,
+        TokenType.IDENTIFIER: _variable,
+    }
+
+    # tokens that open an operand, and the precedence of that operand
+    PREFIX_RULES: dict[TokenType, Precedence] = {
+        TokenType.LEFT_PAREN: Precedence.ASSIGNMENT,
+        TokenType.BANG: Precedence.UNARY,
+        TokenType.MINUS: Precedence.UNARY,
+    }
+
+    # operator precedence, precedence of the right operand, and the node
+    # built from both operands; assignment is right-associative, so its
+    # value is parsed at its own level
+    INFIX_RULES: dict[TokenType, tuple[Precedence, Precedence, InfixRule]] = {
+        TokenType.EQUAL: (Precedence.ASSIGNMENT, Precedence.ASSIGNMENT, _assign),
+        TokenType.OR: (Precedence.OR, Precedence.AND, _logical),
+        TokenType.AND: (Precedence.AND, Precedence.EQUALITY, _logical),
+        TokenType.BANG_EQUAL: (Precedence.EQUALITY, Precedence.COMPARISON, _binary),
+        TokenType.EQUAL_EQUAL: (Precedence.EQUALITY, Precedence.COMPARISON, _binary),
+        TokenType.GREATER: (Precedence.COMPARISON, Precedence.TERM, _binary),
+        TokenType.GREATER_EQUAL: (Precedence.COMPARISON, Precedence.TERM, _binary),
+        TokenType.LESS: (Precedence.COMPARISON, Precedence.TERM, _binary),
+        TokenType.LESS_EQUAL: (Precedence.COMPARISON, Precedence.TERM, _binary),
+        TokenType.MINUS: (Precedence.TERM, Precedence.FACTOR, _binary),
+        TokenType.PLUS: (Precedence.TERM, Precedence.FACTOR, _binary),
+        TokenType.SLASH: (Precedence.FACTOR, Precedence.UNARY, _binary),
+        TokenType.STAR: (Precedence.FACTOR, Precedence.UNARY, _binary),
+    }
@@ -0,0 +1,196 @@
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+
+
+class PurityAnalysis(Expr.Visitor[tuple[Expr, ...]], Stmt.Visitor[None]):
+    """Marks the functions whose calls the `Interpreter` may memoize.
+
+    Runs after the `Resolver`. A function declared at the top level is
+    pure when its body prints nothing, declares no functions or classes,
+    uses no properties, reads and assigns only its parameters and its own
+    locals, and calls only pure functions, by their global names. Calls
+    of a pure function with equal arguments return equal results, so pure
+    functions are marked `memoized`, along with the `callees` whose
+    results theirs depend on.
+
+    A name that is declared more than once, declared as a variable or a
+    class, or assigned anywhere in the program could later call a
+    different function, so a function with such a name is never pure.
+
+    Like the `Resolver`, expressions are walked with an explicit stack.
+    """
+
+    def __init__(self) -> None:
+        # whether the function body being walked is still pure
+        self._pure = True
+        # the global names it calls
+        self._callees: set[str] = set()
+        # global names assigned anywhere in the program
+        self._assigned: set[str] = set()
+
+    def analyze(self, statements: list[Stmt]) -> None:
+        declarations: dict[str, list[FunctionStmt]] = {}
+        variables: set[str] = set()
+        # the global names called by each function whose body is pure
+        callees: dict[str, set[str]] = {}
+        for statement in statements:
+            if not isinstance(statement, FunctionStmt):
+                if isinstance(statement, (VarStmt, ClassStmt)):
+                    variables.add(statement.name.lexeme)
+                statement.accept(self)
+                continue
+
+            name = statement.name.lexeme
+            declarations.setdefault(name, []).append(statement)
+            self._pure = True
+            self._callees = set()
+            self._walk(statement.body)
+            if self._pure:
+                callees[name] = self._callees
+            # calls outside function bodies belong to no function
+            self._callees = set()
+
+        pure = {
+            name
+            for name in callees
+            if len(declarations[name]) == 1
+            and name not in variables
+            and name not in self._assigned
+        }
+        # a function calling one that turned out impure is impure too
+        changed = True
+        while changed:
+            impure = {name for name in pure if not callees[name] <= pure}
+            pure -= impure
+            changed = bool(impure)
+
+        for name in pure:
+            declaration = declarations[name][0]
+            declaration.memoized = True
+            declaration.callees = frozenset(callees[name])
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        self._walk_expression(stmt.expression)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        self._pure = False
+        self._walk_expression(stmt.expression)
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        if stmt.initializer is not None:
+            self._walk_expression(stmt.initializer)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        self._walk(stmt.statements)
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        self._walk_expression(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        self._walk_expression(stmt.condition)
+        stmt.body.accept(self)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        # a nested function is a new value on every call; its body is
+        # still walked for the globals it assigns
+        self._pure = False
+        self._walk(stmt.body)
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        self._pure = False
+        for method in stmt.methods:
+            self._walk(method.body)
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        if stmt.value is not None:
+            self._walk_expression(stmt.value)
+
+    def visit_assign_expr(self, expr: AssignExpr) -> tuple[Expr, ...]:
+        if expr.location is None:
+            self._assigned.add(expr.name.lexeme)
+            self._pure = False
+        return (expr.value,)
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> tuple[Expr, ...]:
+        return expr.left, expr.right
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> tuple[Expr, ...]:
+        return (expr.expression,)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> tuple[Expr, ...]:
+        return (expr.right,)
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> tuple[Expr, ...]:
+        return ()
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> tuple[Expr, ...]:
+        return expr.left, expr.right
+
+    def visit_variable_expr(self, expr: VariableExpr) -> tuple[Expr, ...]:
+        # globals other than called functions can change between calls
+        if expr.location is None:
+            self._pure = False
+        return ()
+
+    def visit_call_expr(self, expr: CallExpr) -> tuple[Expr, ...]:
+        callee = expr.callee
+        if isinstance(callee, VariableExpr) and callee.location is None:
+            self._callees.add(callee.name.lexeme)
+            return tuple(expr.arguments)
+        # a local can hold any function
+        self._pure = False
+        return (callee, *expr.arguments)
+
+    def visit_get_expr(self, expr: GetExpr) -> tuple[Expr, ...]:
+        # fields can change between calls
+        self._pure = False
+        return (expr.object,)
+
+    def visit_set_expr(self, expr: SetExpr) -> tuple[Expr, ...]:
+        self._pure = False
+        return expr.object, expr.value
+
+    def visit_this_expr(self, expr: ThisExpr) -> tuple[Expr, ...]:
+        self._pure = False
+        return ()
+
+    def visit_super_expr(self, expr: SuperExpr) -> tuple[Expr, ...]:
+        self._pure = False
+        return ()
+
+    def _walk(self, statements: list[Stmt]) -> None:
+        for statement in statements:
+            statement.accept(self)
+
+    def _walk_expression(self, expr: Expr) -> None:
+        pending = [expr]
+        while pending:
+            pending.extend(pending.pop().accept(self))
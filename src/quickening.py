@@ -0,0 +1,127 @@
+import operator
+from collections.abc import Callable
+
+from src.token_type import TokenType
+
+type FastPath = Callable[[object, object], object]
+
+
+def _fast_paths() -> dict[tuple[TokenType, type, type], FastPath]:
+    number_ops: dict[TokenType, FastPath] = {
+        TokenType.PLUS: operator.add,
+        TokenType.MINUS: operator.sub,
+        TokenType.STAR: operator.mul,
+        TokenType.SLASH: operator.truediv,
+        TokenType.GREATER: operator.gt,
+        TokenType.GREATER_EQUAL: operator.ge,
+        TokenType.LESS: operator.lt,
+        TokenType.LESS_EQUAL: operator.le,
+        TokenType.EQUAL_EQUAL: operator.eq,
+        TokenType.BANG_EQUAL: operator.ne,
+    }
+    string_ops: dict[TokenType, FastPath] = {
+        TokenType.PLUS: operator.add,
+        TokenType.EQUAL_EQUAL: operator.eq,
+        TokenType.BANG_EQUAL: operator.ne,
+    }
+    paths = {(op, float, float): path for op, path in number_ops.items()}
+    paths.update({(op, str, str): path for op, path in string_ops.items()})
+    return paths
+
+
+class BinarySpecialization:
+    """Quickening state of a single `BinaryExpr`.
+
+    After a successful generic evaluation the node records the operand
+    types it saw and installs a fast path for number/number or
+    string/string operands. When later operands have other types the
+    fast path is dropped (a deoptimization) and the generic path runs
+    again. A node that deoptimizes `MAX_DEOPTS` times stays generic.
+
+    Attributes:
+        left_type: Type of the left operand the fast path expects.
+        right_type: Type of the right operand the fast path expects.
+        fast_path: The installed fast path, or None while generic.
+        hits: Evaluations served by the fast path.
+        misses: Evaluations whose operand types did not match the fast path.
+        generic: Evaluations that went through the generic path.
+        deopts: Number of times the fast path was dropped.
+    """
+
+    __slots__ = (
+        "left_type",
+        "right_type",
+        "fast_path",
+        "hits",
+        "misses",
+        "generic",
+        "deopts",
+    )
+
+    MAX_DEOPTS = 4
+
+    FAST_PATHS = _fast_paths()
+
+    def __init__(self) -> None:
+        self.left_type: type | None = None
+        self.right_type: type | None = None
+        self.fast_path: FastPath | None = None
+        self.hits = 0
+        self.misses = 0
+        self.generic = 0
+        self.deopts = 0
+
+    @property
+    def kind(self) -> str:
+        """'number', 'string' or 'generic', depending on the fast path."""
+        if self.fast_path is None:
+            return "generic"
+        return "number" if self.left_type is float else "string"
+
+    def record(self, operator: TokenType, left: object, right: object) -> None:
+        """Record a generic evaluation and specialize for its operand types."""
+        self.generic += 1
+        if self.fast_path is not None or self.deopts >= self.MAX_DEOPTS:
+            return
+
+        key = (operator, type(left), type(right))
+        fast_path = BinarySpecialization.FAST_PATHS.get(key)
+        if fast_path is not None:
+            self.left_type = type(left)
+            self.right_type = type(right)
+            self.fast_path = fast_path
+
+    def deoptimize(self) -> None:
+        """Drop the fast path after operands of unexpected types."""
+        self.misses += 1
+        self.deopts += 1
+        self.fast_path = None
+        self.left_type = None
+        self.right_type = None
+
+
+class SpecializationStats:
+    """Totals over the specializations created by an interpreter."""
+
+    def __init__(self, specializations: list[BinarySpecialization]) -> None:
+        self.nodes = len(specializations)
+        self.specialized = sum(1 for s in specializations if s.fast_path is not None)
+        self.hits = sum(s.hits for s in specializations)
+        self.misses = sum(s.misses for s in specializations)
+        self.generic = sum(s.generic for s in specializations)
+        self.deopts = sum(s.deopts for s in specializations)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of evaluations served by a fast path."""
+        total = self.hits + self.generic
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def __repr__(self) -> str:
+        return (
+            f"SpecializationStats(nodes={self.nodes}, specialized={self.specialized}, "
+            f"hits={self.hits}, misses={self.misses}, generic={self.generic}, "
+            f"deopts={self.deopts})"
+        )
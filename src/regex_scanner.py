@@ -0,0 +1,251 @@
+import re
+from collections.abc import Callable, Iterator
+from mmap import mmap
+
+from src.scanner import Scanner
+from src.token import Token
+from src.token_buffer import Source, TokenBuffer, decode, literal_value
+from src.token_type import TokenType
+
+
+class RegexScanner:
+    """Scans source code with a single compiled master regex.
+
+    Produces exactly the same tokens and errors as `Scanner`, but matches a
+    whole lexeme per step instead of calling `_advance`/`_peek` for every
+    character, and records it in a `TokenBuffer` as offsets. ASCII input
+    takes the regex path; identifiers and numbers that touch non-ASCII
+    characters are rescanned with `Scanner`'s own `str.isalpha`/
+    `str.isdigit` rules so Unicode behaves identically.
+
+    The source can also be UTF-8 bytes or a memory-mapped file, which is
+    scanned in place with a bytes version of the pattern; offsets are then
+    byte offsets and only the lexemes that are looked at get decoded.
+    """
+
+    # whitespace before a lexeme is consumed together with it; the group
+    # index of the lexeme is one of the constants below
+    TOKEN_PATTERN = re.compile(
+        r"""
+        [ \r\t]*
+        (?:
+            ([A-Za-z_][A-Za-z_0-9]*)
+          | (!=|==|<=|>=|[(){},.\-+;*!=<>]|/(?!/))
+          | ([0-9]+(?:\.[0-9]+)?)
+          | (\n[ \r\t\n]*)
+          | (//[^\n]*)
+          | ("[^"]*")
+          | ("[^"]*\Z)
+          | (.)
+          | \Z
+        )
+        """,
+        re.VERBOSE | re.DOTALL,
+    )
+    BYTES_TOKEN_PATTERN = re.compile(
+        TOKEN_PATTERN.pattern.encode("ascii"), re.VERBOSE | re.DOTALL
+    )
+    IDENTIFIER = 1
+    OPERATOR = 2
+    NUMBER = 3
+    NEWLINE = 4
+    COMMENT = 5
+    STRING = 6
+    UNTERMINATED = 7
+    OTHER = 8
+
+    OPERATORS = {
+        "(": TokenType.LEFT_PAREN,
+        ")": TokenType.RIGHT_PAREN,
+        "{": TokenType.LEFT_BRACE,
+        "}": TokenType.RIGHT_BRACE,
+        ",": TokenType.COMMA,
+        ".": TokenType.DOT,
+        "-": TokenType.MINUS,
+        "+": TokenType.PLUS,
+        ";": TokenType.SEMICOLON,
+        "*": TokenType.STAR,
+        "/": TokenType.SLASH,
+        "!": TokenType.BANG,
+        "!=": TokenType.BANG_EQUAL,
+        "=": TokenType.EQUAL,
+        "==": TokenType.EQUAL_EQUAL,
+        ">": TokenType.GREATER,
+        ">=": TokenType.GREATER_EQUAL,
+        "<": TokenType.LESS,
+        "<=": TokenType.LESS_EQUAL,
+    }
+
+    # bytes of a Scanner fallback window; grown if a token reaches its end
+    WINDOW_SIZE = 64
+    WHITESPACE = re.compile(rb"[ \r\t\n]")
+
+    def __init__(
+        self, source: Source, error_reporter: Callable[[int, str], None]
+    ) -> None:
+        self._source = source
+        self._error_reporter = error_reporter
+        # line number of `_line_offset`, advanced as scanning moves forward
+        self._line = 1
+        self._line_offset = 0
+        self._encoded = not isinstance(source, str)
+        if self._encoded:
+            self._pattern = RegexScanner.BYTES_TOKEN_PATTERN
+            self._keywords = {
+                text.encode("ascii"): token_type
+                for text, token_type in Scanner.KEYWORDS.items()
+            }
+            self._operators = {
+                text.encode("ascii"): token_type
+                for text, token_type in RegexScanner.OPERATORS.items()
+            }
+            self._newline: str | bytes = b"\n"
+        else:
+            self._pattern = RegexScanner.TOKEN_PATTERN
+            self._keywords = Scanner.KEYWORDS
+            self._operators = RegexScanner.OPERATORS
+            self._newline = "\n"
+            # scans the tokens the regex leaves to the character-level rules
+            self._fallback = Scanner(source, error_reporter)
+
+    def scan_tokens(self) -> list[Token]:
+        """Scans the source code and returns the list of tokens."""
+        return list(self.scan_buffer())
+
+    def scan_buffer(self) -> TokenBuffer:
+        """Scans the source code into a compact `TokenBuffer`."""
+        buffer = TokenBuffer(self._source)
+        append = buffer.append
+        for token_type, start, end in self._spans():
+            append(token_type, start, end)
+        return buffer
+
+    def stream_tokens(self) -> Iterator[Token]:
+        """Yields the tokens one at a time, scanning only as far as needed.
+
+        Only the current token is held by the scanner, so the whole token
+        list never has to be in memory at once.
+        """
+        source = self._source
+        for token_type, start, end in self._spans():
+            lexeme = decode(source[start:end])
+            literal = literal_value(token_type, lexeme)
+            yield Token(token_type, lexeme, literal, self._line_at(end))
+
+    def _spans(self) -> Iterator[tuple[TokenType, int, int]]:
+        """Yields the type and the start/end offsets of every token."""
+        source = self._source
+        keywords = self._keywords
+        operators = self._operators
+        identifier = TokenType.IDENTIFIER
+        number = TokenType.NUMBER
+        string = TokenType.STRING
+        position = 0
+
+        while position is not None:
+            resume_at = None
+            for m in self._pattern.finditer(source, position):
+                kind = m.lastindex
+                if kind == RegexScanner.IDENTIFIER or kind == RegexScanner.NUMBER:
+                    end = m.end()
+                    # Scanner._number looks two characters ahead, so a lexeme
+                    # is only final if neither following character is non-ASCII
+                    if not source[end : end + 2].isascii():
+                        resume_at = m.start(kind)
+                        break
+                    if kind == RegexScanner.NUMBER:
+                        yield number, m.start(kind), end
+                    else:
+                        yield keywords.get(m[kind], identifier), m.start(kind), end
+                elif kind == RegexScanner.OPERATOR:
+                    yield operators[m[kind]], m.start(kind), m.end()
+                elif kind == RegexScanner.STRING:
+                    yield string, m.start(kind), m.end()
+                elif kind == RegexScanner.UNTERMINATED:
+                    line = self._line_at(len(source))
+                    self._error_reporter(line, "Unterminated string.")
+                elif kind == RegexScanner.OTHER:
+                    resume_at = m.start(kind)
+                    break
+
+            position = None
+            if resume_at is not None:
+                if self._encoded:
+                    token_type, position = self._rescan_encoded(resume_at)
+                else:
+                    token_type, position = self._rescan(resume_at)
+                if token_type is not None:
+                    yield token_type, resume_at, position
+
+        yield TokenType.EOF, len(source), len(source)
+
+    def _rescan(self, start: int) -> tuple[TokenType | None, int]:
+        """Scans one token with `Scanner`.
+
+        Returns its type, or None if it was not a token, and where it ended.
+        """
+        scanner = self._fallback
+        scanner._start = start
+        scanner._current = start
+        scanner._line = self._line_at(start)
+        scanner._scan_token()
+        token_type = scanner._tokens.pop().type if scanner._tokens else None
+        return token_type, scanner._current
+
+    def _rescan_encoded(self, start: int) -> tuple[TokenType | None, int]:
+        """Scans one token of a bytes source with `Scanner`.
+
+        Only a window of the source is decoded. A fallback token never
+        contains whitespace, so a window that stops at whitespace or at the
+        end of the source holds the whole token; a window cut short by its
+        size is retried with a larger one if the token reaches its end.
+        """
+        source = self._source
+        line = self._line_at(start)
+        size = RegexScanner.WINDOW_SIZE
+        while True:
+            end = start + size
+            whitespace = RegexScanner.WHITESPACE.search(source, start, end)
+            if whitespace is not None or end >= len(source):
+                end = whitespace.start() if whitespace else len(source)
+                truncated = False
+            else:
+                # step back to the start of a UTF-8 sequence
+                while end > start and source[end] & 0xC0 == 0x80:
+                    end -= 1
+                truncated = True
+                if end == start:
+                    size *= 4
+                    continue
+            text = source[start:end].decode("utf8")  # type: ignore[union-attr]
+
+            scanner = Scanner(text, self._error_reporter)
+            scanner._line = line
+            scanner._scan_token()
+            # `Scanner._number` looks up to two characters past the token;
+            # anything but a token is a single character with its error
+            # already reported
+            if truncated and scanner._tokens and scanner._current >= len(text) - 2:
+                size *= 4
+                continue
+
+            token_type = scanner._tokens[0].type if scanner._tokens else None
+            return token_type, start + len(text[: scanner._current].encode("utf8"))
+
+    def _line_at(self, offset: int) -> int:
+        """The line of an offset at or after every offset asked for before.
+
+        Newlines are counted in place; a memory map has no `count`, so its
+        newlines are found one by one rather than copied out in a slice.
+        """
+        source = self._source
+        newline = self._newline
+        if isinstance(source, mmap):
+            position = source.find(newline, self._line_offset, offset)  # type: ignore[arg-type]
+            while position != -1:
+                self._line += 1
+                position = source.find(newline, position + 1, offset)  # type: ignore[arg-type]
+        else:
+            self._line += source.count(newline, self._line_offset, offset)  # type: ignore[arg-type]
+        self._line_offset = offset
+        return self._line
@@ -0,0 +1,202 @@
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token import Token
+
+
+class Resolver(Expr.Visitor[tuple[Expr, ...]], Stmt.Visitor[None]):
+    """Statically binds local variables to frame slots.
+
+    Runs between the `Parser` and the `Interpreter`. Every `VarStmt` in a
+    block gets the slot it defines, and every `VariableExpr`/`AssignExpr`
+    that refers to a block variable gets a (depth, slot) pair, where depth
+    counts frames up from the current one. Anything not found in an
+    enclosing block is left unresolved and treated as a global.
+
+    Blocks that declare no variables get no frame of their own: they are
+    marked `elided` and run in the enclosing environment, so nested
+    declaration-free blocks all share one frame.
+
+    A function's parameters take the first slots of the frame its body
+    runs in; a method's frame has `this` in slot 0 and its parameters
+    after it. The methods of a class with a superclass are resolved in a
+    frame of their own holding `super` in slot 0. Functions that declare
+    no functions anywhere in their body are marked `pooled`: nothing can
+    hold on to their frames after a call, so the frames can be reused.
+
+    Expressions are walked with an explicit stack: visiting an expression
+    returns its operands instead of resolving them, so deeply nested
+    expressions do not use up Python frames.
+    """
+
+    def __init__(self) -> None:
+        self._scopes: list[dict[str, int]] = []
+        # the functions whose bodies are being resolved, innermost last
+        self._functions: list[FunctionStmt] = []
+
+    def resolve(self, statements: list[Stmt]) -> None:
+        for statement in statements:
+            statement.accept(self)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        stmt.elided = not any(
+            isinstance(statement, (VarStmt, FunctionStmt, ClassStmt))
+            for statement in stmt.statements
+        )
+        if stmt.elided:
+            self.resolve(stmt.statements)
+            return
+
+        self._scopes.append({})
+        self.resolve(stmt.statements)
+        self._scopes.pop()
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        # the initializer is resolved first so that it sees outer variables
+        if stmt.initializer is not None:
+            self._resolve_expression(stmt.initializer)
+        stmt.slot = self._declare(stmt.name)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        # declared first, so that the body can call the function
+        stmt.slot = self._declare(stmt.name)
+        self._function(stmt, {})
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        stmt.slot = self._declare(stmt.name)
+        if stmt.superclass is not None:
+            self._resolve_expression(stmt.superclass)
+            self._scopes.append({"super": 0})
+        for method in stmt.methods:
+            self._function(method, {"this": 0})
+        if stmt.superclass is not None:
+            self._scopes.pop()
+
+    def _function(self, stmt: FunctionStmt, scope: dict[str, int]) -> None:
+        """Resolve a function's body in a new scope, which starts out with
+        the given variables before the parameters."""
+        # the frames of every enclosing function can outlive their calls
+        # in this function's closure
+        for function in self._functions:
+            function.pooled = False
+        stmt.pooled = True
+
+        self._functions.append(stmt)
+        for param in stmt.params:
+            scope[param.lexeme] = len(scope)
+        self._scopes.append(scope)
+        self.resolve(stmt.body)
+        self._scopes.pop()
+        self._functions.pop()
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        if stmt.value is not None:
+            self._resolve_expression(stmt.value)
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        self._resolve_expression(stmt.expression)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        self._resolve_expression(stmt.expression)
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        self._resolve_expression(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        self._resolve_expression(stmt.condition)
+        stmt.body.accept(self)
+
+    def visit_assign_expr(self, expr: AssignExpr) -> tuple[Expr, ...]:
+        expr.location = self._resolve_local(expr.name)
+        return (expr.value,)
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> tuple[Expr, ...]:
+        return expr.left, expr.right
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> tuple[Expr, ...]:
+        return (expr.expression,)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> tuple[Expr, ...]:
+        return (expr.right,)
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> tuple[Expr, ...]:
+        return ()
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> tuple[Expr, ...]:
+        return expr.left, expr.right
+
+    def visit_variable_expr(self, expr: VariableExpr) -> tuple[Expr, ...]:
+        expr.location = self._resolve_local(expr.name)
+        return ()
+
+    def visit_call_expr(self, expr: CallExpr) -> tuple[Expr, ...]:
+        return (expr.callee, *expr.arguments)
+
+    def visit_get_expr(self, expr: GetExpr) -> tuple[Expr, ...]:
+        return (expr.object,)
+
+    def visit_set_expr(self, expr: SetExpr) -> tuple[Expr, ...]:
+        return expr.object, expr.value
+
+    def visit_this_expr(self, expr: ThisExpr) -> tuple[Expr, ...]:
+        expr.location = self._resolve_local(expr.keyword)
+        return ()
+
+    def visit_super_expr(self, expr: SuperExpr) -> tuple[Expr, ...]:
+        expr.location = self._resolve_local(expr.keyword)
+        return ()
+
+    def _declare(self, name: Token) -> int | None:
+        """The slot of a variable declared in the innermost scope, or None
+        for a global."""
+        if not self._scopes:
+            return None
+
+        scope = self._scopes[-1]
+        slot = scope.get(name.lexeme)
+        if slot is None:
+            slot = len(scope)
+            scope[name.lexeme] = slot
+        return slot
+
+    def _resolve_expression(self, expr: Expr) -> None:
+        # scopes do not change within an expression, so the order in which
+        # its variables are resolved does not matter
+        pending = [expr]
+        while pending:
+            pending.extend(pending.pop().accept(self))
+
+    def _resolve_local(self, name: Token) -> tuple[int, int] | None:
+        """Find the innermost block variable with the given name."""
+        for depth, scope in enumerate(reversed(self._scopes)):
+            slot = scope.get(name.lexeme)
+            if slot is not None:
+                return depth, slot
+        return None
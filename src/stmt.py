@@ -1,4 +1,4 @@
-from src.expr import Expr
+from src.expr import Expr, VariableExpr
 from src.token import Token
 
 from abc import ABC, abstractmethod
@@ -13,6 +13,8 @@ class Stmt(ABC):
     Base class for all statement nodes.
     """
 
+    __slots__ = ()
+
     class Visitor(ABC, Generic[R]):
         @abstractmethod
         def visit_expression_stmt(self, stmt: ExpressionStmt) -> R: ...
@@ -24,12 +26,22 @@ class Stmt(ABC):
         def visit_block_stmt(self, stmt: BlockStmt) -> R: ...
         @abstractmethod
         def visit_if_stmt(self, stmt: IfStmt) -> R: ...
+        @abstractmethod
+        def visit_while_stmt(self, stmt: WhileStmt) -> R: ...
+        @abstractmethod
+        def visit_function_stmt(self, stmt: FunctionStmt) -> R: ...
+        @abstractmethod
+        def visit_return_stmt(self, stmt: ReturnStmt) -> R: ...
+        @abstractmethod
+        def visit_class_stmt(self, stmt: ClassStmt) -> R: ...
 
     @abstractmethod
     def accept(self, visitor: Stmt.Visitor[R]) -> R: ...
 
 
 class ExpressionStmt(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
@@ -38,6 +50,8 @@ class ExpressionStmt(Stmt):
 
 
 class PrintStmt(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
@@ -46,23 +60,33 @@ class PrintStmt(Stmt):
 
 
 class VarStmt(Stmt):
+    __slots__ = ("name", "initializer", "slot")
+
     def __init__(self, name: Token, initializer: Expr | None) -> None:
         self.name = name
         self.initializer = initializer
+        # frame slot set by the Resolver; None for globals
+        self.slot: int | None = None
 
     def accept(self, visitor: Stmt.Visitor[R]) -> R:
         return visitor.visit_var_stmt(self)
 
 
 class BlockStmt(Stmt):
+    __slots__ = ("statements", "elided")
+
     def __init__(self, statements: list[Stmt]) -> None:
         self.statements = statements
+        # set by the Resolver when the block declares no variables
+        self.elided = False
 
     def accept(self, visitor: Stmt.Visitor[R]) -> R:
         return visitor.visit_block_stmt(self)
 
 
 class IfStmt(Stmt):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__(
         self, condition: Expr, then_branch: Stmt, else_branch: Stmt | None
     ) -> None:
@@ -72,3 +96,66 @@ class IfStmt(Stmt):
 
     def accept(self, visitor: Stmt.Visitor[R]) -> R:
         return visitor.visit_if_stmt(self)
+
+
+class WhileStmt(Stmt):
+    __slots__ = ("condition", "body")
+
+    def __init__(self, condition: Expr, body: Stmt) -> None:
+        self.condition = condition
+        self.body = body
+
+    def accept(self, visitor: Stmt.Visitor[R]) -> R:
+        return visitor.visit_while_stmt(self)
+
+
+class FunctionStmt(Stmt):
+    __slots__ = ("name", "params", "body", "slot", "pooled", "memoized", "callees")
+
+    def __init__(self, name: Token, params: list[Token], body: list[Stmt]) -> None:
+        self.name = name
+        self.params = params
+        self.body = body
+        # frame slot of the function's name set by the Resolver; None for
+        # globals
+        self.slot: int | None = None
+        # set by the Resolver when no function declared in the body can
+        # keep a call's frame alive after the call returns
+        self.pooled = False
+        # set by the PurityAnalysis when calls with equal arguments always
+        # return equal results
+        self.memoized = False
+        # set by the PurityAnalysis on memoized functions: the global names
+        # of the functions it calls
+        self.callees: frozenset[str] = frozenset()
+
+    def accept(self, visitor: Stmt.Visitor[R]) -> R:
+        return visitor.visit_function_stmt(self)
+
+
+class ReturnStmt(Stmt):
+    __slots__ = ("keyword", "value")
+
+    def __init__(self, keyword: Token, value: Expr | None) -> None:
+        self.keyword = keyword
+        self.value = value
+
+    def accept(self, visitor: Stmt.Visitor[R]) -> R:
+        return visitor.visit_return_stmt(self)
+
+
+class ClassStmt(Stmt):
+    __slots__ = ("name", "superclass", "methods", "slot")
+
+    def __init__(
+        self, name: Token, superclass: VariableExpr | None, methods: list[FunctionStmt]
+    ) -> None:
+        self.name = name
+        self.superclass = superclass
+        self.methods = methods
+        # frame slot of the class's name set by the Resolver; None for
+        # globals
+        self.slot: int | None = None
+
+    def accept(self, visitor: Stmt.Visitor[R]) -> R:
+        return visitor.visit_class_stmt(self)
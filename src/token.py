@@ -11,6 +11,8 @@ class Token:
         line: The line number where the token appears in the source code.
     """
 
+    __slots__ = ("type", "lexeme", "literal", "line")
+
     def __init__(
         self,
         type: TokenType,
@@ -0,0 +1,146 @@
+import sys
+from array import array
+from mmap import mmap
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+
+from src.token import Token
+from src.token_type import TokenType
+
+# source code as text, or as UTF-8 encoded bytes (possibly memory-mapped)
+type Source = str | bytes | mmap
+
+
+def literal_value(token_type: TokenType, lexeme: str) -> str | float | None:
+    """The literal `Scanner` attaches to a token with the given lexeme."""
+    if token_type is TokenType.NUMBER:
+        return float(lexeme)
+    if token_type is TokenType.STRING:
+        return lexeme[1:-1]
+    return None
+
+
+def decode(spelling: str | bytes) -> str:
+    """The text of a lexeme sliced from a `Source`."""
+    if isinstance(spelling, str):
+        return spelling
+    return spelling.decode("utf8")
+
+
+class TokenBuffer(Sequence[Token]):
+    """Stores scanned tokens as parallel arrays over the source code.
+
+    A token is a type code and the start/end offsets of its lexeme, about
+    nine bytes instead of a `Token` object with its own lexeme string and
+    literal. Lexemes and literals are sliced from the source when a token
+    is looked at, and lines are found by binary search in a table of
+    newline offsets that is only built the first time a line is needed.
+
+    Indexing returns a `Token` view, so a buffer can be used wherever a
+    list of tokens is expected.
+
+    The source may also be UTF-8 bytes, in which case offsets are byte
+    offsets and lexemes are decoded as they are looked at.
+
+    Attributes:
+        source: The source code the offsets point into.
+    """
+
+    __slots__ = (
+        "source",
+        "_types",
+        "_starts",
+        "_ends",
+        "_newlines",
+        "_names",
+        "_view_index",
+        "_view",
+    )
+
+    # TokenType values by code; `auto()` numbers the members from 1
+    TYPES = {token_type.value: token_type for token_type in TokenType}
+
+    def __init__(self, source: Source) -> None:
+        self.source = source
+        self._types = array("B")
+        self._starts = array("I")
+        self._ends = array("I")
+        self._newlines: array[int] | None = None
+        # identifier lexemes, shared by every token that spells them and
+        # keyed by their spelling in the source
+        self._names: dict[str | bytes, str] = {}
+        # the parser looks at the same token several times in a row
+        self._view_index = -1
+        self._view: Token | None = None
+
+    def append(self, type: TokenType, start: int, end: int) -> None:
+        """Adds the token spelled by source[start:end]."""
+        self._types.append(type.value)
+        self._starts.append(start)
+        self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __getitem__(self, index: int) -> Token:  # type: ignore[override]
+        if index == self._view_index:
+            return self._view  # type: ignore[return-value]
+
+        token_type = TokenBuffer.TYPES[self._types[index]]
+        lexeme = self.lexeme(index)
+        literal = literal_value(token_type, lexeme)
+        view = Token(token_type, lexeme, literal, self.line(index))
+        self._view_index = index
+        self._view = view
+        return view
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self._types)):
+            yield self[index]
+
+    def type(self, index: int) -> TokenType:
+        """The type of a token, without creating a view."""
+        return TokenBuffer.TYPES[self._types[index]]
+
+    def lexeme(self, index: int) -> str:
+        """The text of a token, sliced from the source."""
+        spelling = self.source[self._starts[index] : self._ends[index]]
+        if self._types[index] == TokenType.IDENTIFIER.value:
+            name = self._names.get(spelling)
+            if name is None:
+                name = self._names[spelling] = decode(spelling)
+            return name
+        return decode(spelling)
+
+    def line(self, index: int) -> int:
+        """The line a token ends on, like `Scanner` reports it."""
+        return self.line_at(self._ends[index])
+
+    def line_at(self, offset: int) -> int:
+        """The line of a source offset."""
+        if self._newlines is None:
+            self._newlines = self._newline_offsets()
+        return 1 + bisect_left(self._newlines, offset)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the buffer, excluding the source."""
+        size = sys.getsizeof(self._names)
+        for values in (self._types, self._starts, self._ends, self._newlines):
+            if values is not None:
+                size += sys.getsizeof(values)
+        for spelling, name in self._names.items():
+            size += sys.getsizeof(spelling)
+            if name is not spelling:
+                size += sys.getsizeof(name)
+        return size
+
+    def _newline_offsets(self) -> array[int]:
+        offsets = array("I")
+        source = self.source
+        newline = "\n" if isinstance(source, str) else b"\n"
+        offset = source.find(newline)  # type: ignore[arg-type]
+        while offset != -1:
+            offsets.append(offset)
+            offset = source.find(newline, offset + 1)  # type: ignore[arg-type]
+        return offsets
@@ -0,0 +1,46 @@
+from collections.abc import Iterable
+
+from src.token import Token
+from src.token_type import TokenType
+
+
+class TokenStream:
+    """A bounded window over a lazily produced sequence of tokens.
+
+    The `Parser` indexes tokens by absolute position but only ever looks
+    at the current token and the one before it. A stream pulls tokens
+    from an iterator as the parser asks for them and keeps the last
+    `size` of them in a ring buffer, so tokens the parser has moved past
+    can be freed.
+
+    Attributes:
+        size: Number of tokens kept in the ring buffer.
+    """
+
+    __slots__ = ("size", "_tokens", "_ring", "_end", "_eof")
+
+    def __init__(self, tokens: Iterable[Token], size: int = 4) -> None:
+        self.size = size
+        self._tokens = iter(tokens)
+        self._ring: list[Token | None] = [None] * size
+        # absolute position one past the newest token in the ring
+        self._end = 0
+        self._eof: Token | None = None
+
+    def __getitem__(self, index: int) -> Token:
+        while index >= self._end:
+            self._pull()
+        if index < self._end - self.size or index < 0:
+            raise IndexError(f"token {index} is no longer buffered")
+        return self._ring[index % self.size]  # type: ignore[return-value]
+
+    def _pull(self) -> None:
+        # past the end of the input the EOF token repeats, like the
+        # parser's own `_advance` stays on it
+        token = self._eof
+        if token is None:
+            token = next(self._tokens)
+            if token.type is TokenType.EOF:
+                self._eof = token
+        self._ring[self._end % self.size] = token
+        self._end += 1
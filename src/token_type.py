@@ -2,7 +2,11 @@ from enum import Enum, auto
 
 
 class TokenType(Enum):
-    """Enumeration of all possible token types in the source code."""
+    """Enumeration of all possible token types in the source code.
+
+    Members compare by identity and are hashable, so they can be used as
+    dictionary keys and in sets.
+    """
 
     # single-character tokens
     LEFT_PAREN = auto()
@@ -55,8 +59,3 @@ class TokenType(Enum):
 
     def __repr__(self) -> str:
         return f"TokenType.{self.name}"
-
-    def __eq__(self, value: object) -> bool:
-        if not isinstance(value, TokenType):
-            return NotImplemented
-        return self.name == value.name
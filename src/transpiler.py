@@ -0,0 +1,801 @@
+import hashlib
+import marshal
+import math
+import sys
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from types import CodeType
+
+from src.ast_cache import TOKEN_TYPES, DiskCache
+from src.exceptions import PloxRuntimeError
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.inline_cache import InlineCache
+from src.lox_callable import NATIVES, LoxCallable, NativeFunction, check_call
+from src.lox_class import (
+    BoundMethod,
+    LoxClass,
+    LoxInstance,
+    find_method,
+    get_property,
+    lookup_property,
+    set_property,
+)
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token import Token
+from src.token_buffer import Source
+from src.token_type import TokenType
+from src.values import is_equal, is_truthy, stringify
+
+NUMBER = (int, float)
+
+
+class TranspiledProgram:
+    """A Lox program compiled to a Python code object.
+
+    Attributes:
+        source: The generated Python source.
+        code: The compiled code object; running it defines `_lox_main`.
+        tokens: Tokens referenced by the generated code for error reporting.
+        constants: Literal values that have no Python source form.
+        caches: Number of property accesses, each of which gets an
+            `InlineCache` when the program runs.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        tokens: list[Token],
+        constants: list[object],
+        caches: int,
+        code: CodeType | None = None,
+    ) -> None:
+        self.source = source
+        if code is None:
+            try:
+                code = compile(source, "<plox>", "exec")
+            except SyntaxError as error:
+                # the generated source is only ever invalid for nesting
+                # deeper than Python allows, such as too many nested blocks
+                raise RecursionError(error.msg) from None
+        self.code: CodeType = code
+        self.tokens = tokens
+        self.constants = constants
+        self.caches = caches
+
+
+class TranspiledFunction(LoxCallable):
+    """A function declared in Lox code, as run by the `PythonEngine`.
+
+    Attributes:
+        function: The generated Python function, taking the arguments.
+    """
+
+    __slots__ = ("function",)
+
+    def __init__(self, name: str, arity: int, function: Callable[..., object]) -> None:
+        super().__init__(name, arity)
+        self.function = function
+
+
+class TranspiledMethod(TranspiledFunction):
+    """A method; its Python function takes the instance before the
+    arguments."""
+
+    __slots__ = ()
+
+
+class TailCall:
+    """Returned by a function in place of the result of its tail call;
+    `_call` makes the call after the returning Python frame is gone."""
+
+    __slots__ = ("callee", "arguments", "token")
+
+    def __init__(self, callee: object, arguments: tuple[object, ...], token: Token):
+        self.callee = callee
+        self.arguments = arguments
+        self.token = token
+
+
+class Transpiler(Expr.Visitor[str], Stmt.Visitor[None]):
+    """Generates equivalent Python source from a list of statements.
+
+    Block locals become uniquely named Python locals of `_lox_main`, globals
+    live in the `_g` dict. Operators that can fail call runtime helpers with
+    the originating token, so errors report the Lox line.
+
+    Lox functions become nested Python functions. A Python closure shares
+    the variable itself rather than its value at the time, so in a function
+    (or `_lox_main`) that declares functions, every local lives in a
+    one-element list and nested functions receive the lists they can see
+    as default arguments: each run of a declaration gets its own list.
+
+    Methods become Python functions taking `this` first; a class with a
+    superclass keeps it in a local for its methods' `super`. Each property
+    access gets an `InlineCache` of its own, and a call of a property
+    calls a method without creating a `BoundMethod` for it.
+    """
+
+    NUMERIC_HELPERS = {
+        TokenType.GREATER: "_gt",
+        TokenType.GREATER_EQUAL: "_ge",
+        TokenType.LESS: "_lt",
+        TokenType.LESS_EQUAL: "_le",
+        TokenType.MINUS: "_sub",
+        TokenType.SLASH: "_div",
+        TokenType.STAR: "_mul",
+    }
+
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+        self._indent = 1
+        self._scopes: list[dict[str, str]] = []
+        self._tokens: list[Token] = []
+        self._constants: list[object] = []
+        self._names = 0
+        # Python locals holding a one-element list rather than the value
+        self._boxed: set[str] = set()
+        # whether locals of the function being generated are boxed
+        self._boxing = False
+        # in an initializer, the source of its `this`, which it returns
+        self._initializer: str | None = None
+        self._caches = 0
+
+    def transpile(self, statements: list[Stmt]) -> TranspiledProgram:
+        """Generates and compiles the Python equivalent of the statements."""
+        self._lines = ["def _lox_main():"]
+        # functions and classes declared at the top level are globals, not
+        # locals, and run only once
+        self._boxing = any(
+            _declares_functions(statement)
+            for statement in statements
+            if not isinstance(statement, (FunctionStmt, ClassStmt))
+        )
+        for statement in statements:
+            statement.accept(self)
+        self._emit("pass")
+        source = "\n".join(self._lines) + "\n"
+        return TranspiledProgram(source, self._tokens, self._constants, self._caches)
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        self._emit(self._expr(stmt.expression))
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        self._emit(f"_print(_str({self._expr(stmt.expression)}))")
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        value = "None"
+        if stmt.initializer is not None:
+            value = self._expr(stmt.initializer)
+
+        if not self._scopes:
+            self._emit(f"_g[{stmt.name.lexeme!r}] = {value}")
+            return
+
+        name = self._declare_local(stmt.name)
+        if name in self._boxed:
+            self._emit(f"{name} = [{value}]")
+        else:
+            self._emit(f"{name} = {value}")
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        self._scopes.append({})
+        for statement in stmt.statements:
+            statement.accept(self)
+        self._scopes.pop()
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        self._emit(f"if _truthy({self._expr(stmt.condition)}):")
+        self._emit_body(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self._emit("else:")
+            self._emit_body(stmt.else_branch)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        self._emit(f"while _truthy({self._expr(stmt.condition)}):")
+        self._emit_body(stmt.body)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        function = self._fresh("_f")
+        target = self._declare_target(stmt.name)
+        self._function(function, stmt, None)
+        name = stmt.name.lexeme
+        self._emit(f"{target} = _fn({name!r}, {len(stmt.params)}, {function})")
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        target = self._declare_target(stmt.name)
+        klass = self._fresh("_cls")
+        self._emit(f"{klass} = _class({stmt.name.lexeme!r})")
+        superclass = stmt.superclass
+        if superclass is not None:
+            value = self._expr(superclass)
+            # the methods' `super`
+            self._scopes.append({})
+            local = self._declare_local(
+                Token(TokenType.SUPER, "super", None, superclass.name.line)
+            )
+            if local in self._boxed:
+                self._emit(f"{local} = [{value}]")
+                value = f"{local}[0]"
+            else:
+                self._emit(f"{local} = {value}")
+                value = local
+            self._emit(f"{klass}.inherit({value}, {self._token(superclass.name)})")
+
+        this = Token(TokenType.THIS, "this", None, stmt.name.line)
+        for method in stmt.methods:
+            function = self._fresh("_f")
+            self._function(function, method, this)
+            name = method.name.lexeme
+            self._emit(
+                f"{klass}.add_method({name!r}, "
+                f"_method({name!r}, {len(method.params)}, {function}))"
+            )
+        if superclass is not None:
+            self._scopes.pop()
+        self._emit(f"{target} = {klass}")
+
+    def _declare_target(self, name: Token) -> str:
+        """The source of the variable a function or class declaration
+        assigns; a local is declared before the body, so that the body can
+        refer to it."""
+        if not self._scopes:
+            return f"_g[{name.lexeme!r}]"
+        target = self._declare_local(name)
+        if target in self._boxed:
+            self._emit(f"{target} = [None]")
+            target += "[0]"
+        return target
+
+    def _function(self, function: str, stmt: FunctionStmt, this: Token | None) -> None:
+        """Emits the Python function named `function` for a function, or
+        for a method when given the `this` it takes first."""
+        # the boxes visible here, bound now rather than when the body runs
+        captured = dict.fromkeys(
+            name
+            for scope in self._scopes
+            for name in scope.values()
+            if name in self._boxed
+        )
+        enclosing_boxing = self._boxing
+        enclosing_initializer = self._initializer
+        self._boxing = any(_declares_functions(statement) for statement in stmt.body)
+        self._scopes.append({})
+        receiver = [] if this is None else [this]
+        params = [self._declare_local(param) for param in [*receiver, *stmt.params]]
+        header = ", ".join([*params, *(f"{name}={name}" for name in captured)])
+        self._emit(f"def {function}({header}):")
+        self._indent += 1
+        for param in params:
+            if param in self._boxed:
+                self._emit(f"{param} = [{param}]")
+        self._initializer = None
+        if this is not None and stmt.name.lexeme == "init":
+            self._initializer = self._variable(this)
+        for statement in stmt.body:
+            statement.accept(self)
+        if self._initializer is not None:
+            self._emit(f"return {self._initializer}")
+        self._emit("pass")
+        self._indent -= 1
+        self._scopes.pop()
+        self._boxing = enclosing_boxing
+        self._initializer = enclosing_initializer
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        value = stmt.value
+        if value is None:
+            self._emit(f"return {self._initializer or 'None'}")
+        elif isinstance(value, CallExpr):
+            callee, arguments = self._call_parts(value)
+            token = self._token(value.paren)
+            self._emit(f"return _TailCall({callee}, {arguments}, {token})")
+        else:
+            self._emit(f"return {self._expr(value)}")
+
+    def visit_call_expr(self, expr: CallExpr) -> str:
+        callee = expr.callee
+        if isinstance(callee, GetExpr):
+            # the instance is evaluated once, before the property is looked up
+            instance = self._fresh("_k")
+            lookup = self._property(callee.name)
+            arguments = "".join(
+                f"{self._expr(argument)}, " for argument in expr.arguments
+            )
+            return (
+                f"_invoke({instance} := {self._expr(callee.object)}, "
+                f"_lookup({instance}, {lookup}), "
+                f"({arguments.removesuffix(' ')}), {self._token(expr.paren)})"
+            )
+
+        callee_source, arguments = self._call_parts(expr)
+        return f"_call({callee_source}, {arguments}, {self._token(expr.paren)})"
+
+    def visit_get_expr(self, expr: GetExpr) -> str:
+        instance = self._expr(expr.object)
+        return f"_get_prop({instance}, {self._property(expr.name)})"
+
+    def visit_set_expr(self, expr: SetExpr) -> str:
+        instance = self._expr(expr.object)
+        value = self._expr(expr.value)
+        name = self._token(expr.name)
+        return f"_set_prop({instance}, {name}, {value}, _ic[{self._cache()}])"
+
+    def visit_this_expr(self, expr: ThisExpr) -> str:
+        return self._variable(expr.keyword)
+
+    def visit_super_expr(self, expr: SuperExpr) -> str:
+        this = Token(TokenType.THIS, "this", None, expr.keyword.line)
+        instance = self._variable(this)
+        superclass = self._variable(expr.keyword)
+        return f"_super({instance}, {superclass}, {self._token(expr.method)})"
+
+    def visit_assign_expr(self, expr: AssignExpr) -> str:
+        value = self._expr(expr.value)
+        local = self._resolve_local(expr.name)
+        if local in self._boxed:
+            return f"_store({local}, {value})"
+        if local is not None:
+            return f"({local} := {value})"
+        name = expr.name.lexeme
+        return f"_set({name!r}, {value}, {self._token(expr.name)})"
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> str:
+        left = self._expr(expr.left)
+        right = self._expr(expr.right)
+
+        match expr.operator.type:
+            case TokenType.EQUAL_EQUAL:
+                return f"_eq({left}, {right})"
+            case TokenType.BANG_EQUAL:
+                return f"(not _eq({left}, {right}))"
+            case TokenType.PLUS:
+                helper = "_add"
+            case _:
+                helper = Transpiler.NUMERIC_HELPERS[expr.operator.type]
+
+        return f"{helper}({left}, {right}, {self._token(expr.operator)})"
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> str:
+        return self._expr(expr.expression)
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> str:
+        right = self._expr(expr.right)
+        if expr.operator.type is TokenType.BANG:
+            return f"(not _truthy({right}))"
+        return f"_neg({right}, {self._token(expr.operator)})"
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> str:
+        value = expr.value
+        if isinstance(value, float) and not math.isfinite(value):
+            self._constants.append(value)
+            return f"_c[{len(self._constants) - 1}]"
+        return repr(value)
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> str:
+        left = self._expr(expr.left)
+        right = self._expr(expr.right)
+        temp = self._fresh("_k")
+        if expr.operator.type is TokenType.OR:
+            return f"({temp} if _truthy({temp} := {left}) else {right})"
+        return f"({right} if _truthy({temp} := {left}) else {temp})"
+
+    def visit_variable_expr(self, expr: VariableExpr) -> str:
+        return self._variable(expr.name)
+
+    def _variable(self, name: Token) -> str:
+        local = self._resolve_local(name)
+        if local in self._boxed:
+            return f"{local}[0]"
+        if local is not None:
+            return local
+        return f"_get({name.lexeme!r}, {self._token(name)})"
+
+    def _expr(self, expr: Expr) -> str:
+        return expr.accept(self)
+
+    def _call_parts(self, expr: CallExpr) -> tuple[str, str]:
+        """Returns the source of the callee and of the argument tuple."""
+        arguments = "".join(f"{self._expr(argument)}, " for argument in expr.arguments)
+        return self._expr(expr.callee), f"({arguments.removesuffix(' ')})"
+
+    def _declare_local(self, name: Token) -> str:
+        """Binds a Lox local in the innermost scope to a fresh Python name."""
+        local = self._fresh("_l")
+        if self._boxing:
+            self._boxed.add(local)
+        self._scopes[-1][name.lexeme] = local
+        return local
+
+    def _emit(self, line: str) -> None:
+        self._lines.append("    " * self._indent + line)
+
+    def _emit_body(self, stmt: Stmt) -> None:
+        """Emits a nested statement followed by `pass` in case it is empty."""
+        self._indent += 1
+        stmt.accept(self)
+        self._emit("pass")
+        self._indent -= 1
+
+    def _fresh(self, prefix: str) -> str:
+        self._names += 1
+        return f"{prefix}{self._names}"
+
+    def _property(self, name: Token) -> str:
+        """The name and inline cache arguments of a property access."""
+        return f"{self._token(name)}, _ic[{self._cache()}]"
+
+    def _cache(self) -> int:
+        self._caches += 1
+        return self._caches - 1
+
+    def _token(self, token: Token) -> str:
+        self._tokens.append(token)
+        return f"_t[{len(self._tokens) - 1}]"
+
+    def _resolve_local(self, name: Token) -> str | None:
+        for scope in reversed(self._scopes):
+            if name.lexeme in scope:
+                return scope[name.lexeme]
+        return None
+
+
+class ProgramCache(DiskCache):
+    """A directory of transpiled programs, so unchanged scripts skip the
+    frontend and code generation in later runs.
+
+    Entries hold the `marshal`ed code object with the tokens, constants
+    and inline cache count it runs with. They are keyed by the source,
+    the frontend options that shaped the code and the format and Python
+    versions, since `marshal` data is only readable by the Python version
+    that wrote it.
+    """
+
+    SUFFIX = ".pyc"
+
+    # bumped whenever the encoding below changes
+    FORMAT_VERSION = 1
+
+    def load(self, source: Source, options: str) -> TranspiledProgram | None:
+        """The cached program for the source and options, or None on a miss."""
+        path = self._path(source, options)
+        try:
+            program = ProgramCache._decode(path.read_bytes())
+            # the modification time orders entries for eviction
+            path.touch()
+        except OSError:
+            program = None
+        except (ValueError, EOFError, TypeError, KeyError):
+            # corrupt, or written in another format; drop it
+            path.unlink(missing_ok=True)
+            program = None
+
+        self._count(program is not None)
+        return program
+
+    def store(self, source: Source, options: str, program: TranspiledProgram) -> None:
+        """Caches the program transpiled from the source with the options."""
+        tokens = [
+            (token.type.value, token.lexeme, token.literal, token.line)
+            for token in program.tokens
+        ]
+        data = marshal.dumps(
+            (
+                ProgramCache.FORMAT_VERSION,
+                program.code,
+                program.source,
+                tokens,
+                program.constants,
+                program.caches,
+            )
+        )
+        self._write(self._path(source, options), data)
+
+    def _path(self, source: Source, options: str) -> Path:
+        variant = (
+            f"program {ProgramCache.FORMAT_VERSION} "
+            f"{sys.implementation.cache_tag} {options}"
+        )
+        return self._entry_path(source, variant)
+
+    @staticmethod
+    def _decode(data: bytes) -> TranspiledProgram:
+        version, code, source, tokens, constants, caches = marshal.loads(data)
+        if version != ProgramCache.FORMAT_VERSION or not isinstance(code, CodeType):
+            raise ValueError("unsupported program cache entry")
+        return TranspiledProgram(
+            source,
+            [
+                Token(TOKEN_TYPES[type_value], lexeme, literal, line)
+                for type_value, lexeme, literal, line in tokens
+            ],
+            list(constants),
+            caches,
+            code,
+        )
+
+
+class PythonEngine:
+    """Runs Lox programs transpiled to Python code objects.
+
+    Programs are cached by the hash of their Lox source and the frontend
+    options they were parsed with, in memory and, given a `ProgramCache`,
+    on disk, so running the same source again skips scanning, parsing and
+    code generation, in this run or a later one. Globals persist between
+    calls.
+    """
+
+    CACHE_SIZE = 128
+
+    _cache: OrderedDict[tuple[str, str], TranspiledProgram] = OrderedDict()
+
+    def __init__(self) -> None:
+        self._globals: dict[str, object] = dict(NATIVES)
+
+    def interpret(
+        self, statements: list[Stmt], error_reporter: Callable[[PloxRuntimeError], None]
+    ) -> None:
+        self.execute(Transpiler().transpile(statements), error_reporter)
+
+    def run_source(
+        self,
+        source: Source,
+        frontend: Callable[[Source], list[Stmt] | None],
+        error_reporter: Callable[[PloxRuntimeError], None],
+        options: str = "",
+        cache: ProgramCache | None = None,
+    ) -> None:
+        """Runs source code, using `frontend` to parse it on a cache miss.
+
+        `options` describes how `frontend` parses, so that programs parsed
+        differently are cached apart. `frontend` returns None when the
+        source has errors; nothing is run or cached in that case.
+        """
+        data = source.encode("utf8") if isinstance(source, str) else source
+        key = (hashlib.sha256(data).hexdigest(), options)
+        program = PythonEngine._cache.get(key)
+        if program is None and cache is not None:
+            program = cache.load(source, options)
+        if program is None:
+            statements = frontend(source)
+            if statements is None:
+                return
+            program = Transpiler().transpile(statements)
+            if cache is not None:
+                cache.store(source, options, program)
+        if key not in PythonEngine._cache:
+            PythonEngine._cache[key] = program
+            if len(PythonEngine._cache) > PythonEngine.CACHE_SIZE:
+                PythonEngine._cache.popitem(last=False)
+        else:
+            PythonEngine._cache.move_to_end(key)
+
+        self.execute(program, error_reporter)
+
+    def execute(
+        self,
+        program: TranspiledProgram,
+        error_reporter: Callable[[PloxRuntimeError], None],
+    ) -> None:
+        """Executes a transpiled program against this engine's globals."""
+        namespace = self._namespace(program)
+        exec(program.code, namespace)
+        try:
+            namespace["_lox_main"]()
+        except PloxRuntimeError as error:
+            error_reporter(error)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+
+    def _namespace(self, program: TranspiledProgram) -> dict[str, object]:
+        globals = self._globals
+
+        def get(name: str, token: Token) -> object:
+            if name in globals:
+                return globals[name]
+            raise PloxRuntimeError(token, f"Undefined variable '{name}'.")
+
+        def set(name: str, value: object, token: Token) -> object:
+            if name in globals:
+                globals[name] = value
+                return value
+            raise PloxRuntimeError(token, f"Undefined variable '{name}'.")
+
+        return {
+            "__builtins__": {},
+            "_g": globals,
+            "_fn": TranspiledFunction,
+            "_method": TranspiledMethod,
+            "_class": LoxClass,
+            "_call": _call,
+            "_invoke": _invoke,
+            "_lookup": _lookup,
+            "_get_prop": get_property,
+            "_set_prop": set_property,
+            "_super": _super,
+            "_ic": [InlineCache() for _ in range(program.caches)],
+            "_TailCall": TailCall,
+            "_store": _store,
+            "_t": program.tokens,
+            "_c": program.constants,
+            "_get": get,
+            "_set": set,
+            "_print": print,
+            "_str": stringify,
+            "_truthy": is_truthy,
+            "_eq": is_equal,
+            "_add": _add,
+            "_sub": _sub,
+            "_mul": _mul,
+            "_div": _div,
+            "_gt": _gt,
+            "_ge": _ge,
+            "_lt": _lt,
+            "_le": _le,
+            "_neg": _neg,
+        }
+
+
+def _declares_functions(stmt: Stmt) -> bool:
+    """Whether the statement is or contains a function declaration; the
+    methods of a class count."""
+    match stmt:
+        case FunctionStmt() | ClassStmt():
+            return True
+        case BlockStmt(statements=statements):
+            return any(_declares_functions(statement) for statement in statements)
+        case IfStmt(then_branch=then_branch, else_branch=else_branch):
+            return _declares_functions(then_branch) or (
+                else_branch is not None and _declares_functions(else_branch)
+            )
+        case WhileStmt(body=body):
+            return _declares_functions(body)
+    return False
+
+
+def _call(callee: object, arguments: tuple[object, ...], token: Token) -> object:
+    """Calls a value, then makes the tail calls it returns one after another."""
+    try:
+        while True:
+            function = check_call(callee, arguments, token)
+            if isinstance(function, NativeFunction):
+                return function.function(*arguments)
+            if type(function) is BoundMethod:
+                method = function.method
+                assert type(method) is TranspiledMethod
+                result = method.function(function.receiver, *arguments)
+            elif type(function) is LoxClass:
+                instance = LoxInstance(function)
+                initializer = function.initializer
+                if initializer is not None:
+                    assert type(initializer) is TranspiledMethod
+                    initializer.function(instance, *arguments)
+                return instance
+            else:
+                assert isinstance(function, TranspiledFunction)
+                result = function.function(*arguments)
+            if type(result) is not TailCall:
+                return result
+            callee, arguments, token = result.callee, result.arguments, result.token
+    except RecursionError:
+        raise PloxRuntimeError(token, "Stack overflow.") from None
+
+
+def _lookup(instance: object, name: Token, cache: InlineCache) -> object:
+    """The method a property call calls, or the value of the field."""
+    target = lookup_property(instance, name, cache)
+    if type(target) is int:
+        assert type(instance) is LoxInstance
+        return instance.fields[target]
+    return target
+
+
+def _invoke(
+    instance: object, callee: object, arguments: tuple[object, ...], token: Token
+) -> object:
+    """Calls what `_lookup` found: a method with the instance as `this`,
+    without binding it, and anything else like `_call` does."""
+    if type(callee) is not TranspiledMethod:
+        return _call(callee, arguments, token)
+    check_call(callee, arguments, token)
+    try:
+        result = callee.function(instance, *arguments)
+    except RecursionError:
+        raise PloxRuntimeError(token, "Stack overflow.") from None
+    if type(result) is TailCall:
+        return _call(result.callee, result.arguments, result.token)
+    return result
+
+
+def _super(instance: object, superclass: object, name: Token) -> BoundMethod:
+    assert type(instance) is LoxInstance
+    assert type(superclass) is LoxClass
+    return BoundMethod(instance, find_method(superclass, name))
+
+
+def _store(box: list[object], value: object) -> object:
+    box[0] = value
+    return value
+
+
+def _add(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) + float(right)
+    if isinstance(left, str) and isinstance(right, str):
+        return left + right
+    raise PloxRuntimeError(token, "Operands must be two numbers or two strings.")
+
+
+def _sub(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) - float(right)
+    raise PloxRuntimeError(token, "Operands must be numbers.")
+
+
+def _mul(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) * float(right)
+    raise PloxRuntimeError(token, "Operands must be numbers.")
+
+
+def _div(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) / float(right)
+    raise PloxRuntimeError(token, "Operands must be numbers.")
+
+
+def _gt(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) > float(right)
+    raise PloxRuntimeError(token, "Operands must be numbers.")
+
+
+def _ge(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) >= float(right)
+    raise PloxRuntimeError(token, "Operands must be numbers.")
+
+
+def _lt(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) < float(right)
+    raise PloxRuntimeError(token, "Operands must be numbers.")
+
+
+def _le(left: object, right: object, token: Token) -> object:
+    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+        return float(left) <= float(right)
+    raise PloxRuntimeError(token, "Operands must be numbers.")
+
+
+def _neg(operand: object, token: Token) -> object:
+    if isinstance(operand, NUMBER):
+        return -float(operand)
+    raise PloxRuntimeError(token, "Operand must be a number.")
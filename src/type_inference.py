@@ -0,0 +1,352 @@
+import operator
+from enum import Enum, auto
+
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    CallExpr,
+    Expr,
+    GetExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    SetExpr,
+    SuperExpr,
+    ThisExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from src.postorder import PostorderVisitor
+from src.quickening import BinarySpecialization, FastPath
+from src.stmt import (
+    BlockStmt,
+    ClassStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    IfStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+    VarStmt,
+    WhileStmt,
+)
+from src.token_type import TokenType
+
+# a variable, function or class declaration, or a function and the index
+# of one of its parameters
+type Binding = VarStmt | FunctionStmt | ClassStmt | tuple[FunctionStmt, int]
+
+
+class LoxType(Enum):
+    """Static types tracked by `TypeInference`, from least to most general."""
+
+    NEVER = auto()
+    NUMBER = auto()
+    STRING = auto()
+    BOOLEAN = auto()
+    NIL = auto()
+    ANY = auto()
+
+    def join(self, other: LoxType) -> LoxType:
+        """The most specific type that covers both types."""
+        if self is LoxType.NEVER:
+            return other
+        if other is LoxType.NEVER or other is self:
+            return self
+        return LoxType.ANY
+
+
+class TypeInference(
+    PostorderVisitor[LoxType], Expr.Visitor[LoxType], Stmt.Visitor[None]
+):
+    """Proves operand types of arithmetic and comparison operators.
+
+    Runs after the `Resolver`. Every variable declaration is a binding
+    whose type is the join of its initializer and of every value assigned
+    to it; binding types are recomputed until they stop changing. Then
+    each `+ - * / < <= > >=` whose operands are proven to be two numbers
+    (or, for `+`, two strings), and each unary `-` on a proven number,
+    gets an unchecked `static_path` that the interpreter calls instead of
+    checking operand types.
+
+    Variables read outside the scope of their declaration in this program
+    (for example globals defined by an earlier REPL line) are `ANY`, and
+    so are functions, classes, their parameters, properties and the
+    values calls return. A function body runs after later statements have
+    had the chance to redeclare the globals it reads, so a global read in
+    a function body is `ANY` too, unless the program declares it exactly
+    once and never assigns it. Without `whole_program`, later programs
+    (such as the next REPL line) may redeclare any global, so every
+    global read in a function body is `ANY`.
+
+    A local declared again in the same scope keeps the slot of the earlier
+    declaration, and closures over that one go on using it, so every
+    declaration of a slot shares one binding.
+
+    Expressions are typed operands first, as a `PostorderVisitor`.
+    """
+
+    CHECKED_OPERATORS = frozenset(
+        {
+            TokenType.PLUS,
+            TokenType.MINUS,
+            TokenType.STAR,
+            TokenType.SLASH,
+            TokenType.GREATER,
+            TokenType.GREATER_EQUAL,
+            TokenType.LESS,
+            TokenType.LESS_EQUAL,
+        }
+    )
+
+    MAX_PASSES = 16
+
+    def __init__(self, whole_program: bool = True) -> None:
+        self.whole_program = whole_program
+        self._bindings: dict[Binding, LoxType] = {}
+        self._next_bindings: dict[Binding, LoxType] = {}
+        self._scopes: list[dict[str, Binding]] = [{}]
+        # globals declared once and never assigned, which function bodies
+        # may trust; none until the first pass has seen the whole program
+        self._stable_globals: frozenset[str] = frozenset()
+        # how many times the walk declared each global, and the names it
+        # assigned
+        self._declarations: dict[str, int] = {}
+        self._assigned: set[str] = set()
+        # each local the walk saw declared again in the same scope, and the
+        # first declaration of its slot
+        self._shared_slots: dict[Binding, Binding] = {}
+        # how many function bodies the walk is inside
+        self._function_depth = 0
+        self._annotate = False
+        self.explanations: list[str] = []
+
+    def infer(self, statements: list[Stmt]) -> None:
+        """Infers binding types and annotates the provable operators."""
+        for _ in range(TypeInference.MAX_PASSES):
+            self._walk(statements)
+            stable_globals = self._find_stable_globals()
+            changed = (
+                self._next_bindings != self._bindings
+                or stable_globals != self._stable_globals
+            )
+            self._bindings = self._next_bindings
+            self._stable_globals = stable_globals
+            if not changed:
+                break
+        else:
+            # did not settle; prove nothing rather than risk a wrong proof
+            return
+
+        self._annotate = True
+        self._walk(statements)
+        self._annotate = False
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        self._walk_expression(stmt.expression)
+
+    def visit_print_stmt(self, stmt: PrintStmt) -> None:
+        self._walk_expression(stmt.expression)
+
+    def visit_var_stmt(self, stmt: VarStmt) -> None:
+        value = LoxType.NIL
+        if stmt.initializer is not None:
+            value = self._walk_expression(stmt.initializer)
+        self._declare(stmt.name.lexeme, stmt)
+        self._bind(stmt, value)
+
+    def visit_block_stmt(self, stmt: BlockStmt) -> None:
+        self._scopes.append({})
+        for statement in stmt.statements:
+            statement.accept(self)
+        self._scopes.pop()
+
+    def visit_if_stmt(self, stmt: IfStmt) -> None:
+        self._walk_expression(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: WhileStmt) -> None:
+        self._walk_expression(stmt.condition)
+        stmt.body.accept(self)
+
+    def visit_function_stmt(self, stmt: FunctionStmt) -> None:
+        self._declare(stmt.name.lexeme, stmt)
+        self._bind(stmt, LoxType.ANY)
+        self._function(stmt)
+
+    def visit_class_stmt(self, stmt: ClassStmt) -> None:
+        self._declare(stmt.name.lexeme, stmt)
+        self._bind(stmt, LoxType.ANY)
+        if stmt.superclass is not None:
+            self._walk_expression(stmt.superclass)
+        for method in stmt.methods:
+            self._function(method)
+
+    def _function(self, stmt: FunctionStmt) -> None:
+        parameters: dict[str, Binding] = {}
+        for index, param in enumerate(stmt.params):
+            self._bind((stmt, index), LoxType.ANY)
+            parameters[param.lexeme] = (stmt, index)
+        self._scopes.append(parameters)
+        self._function_depth += 1
+        for statement in stmt.body:
+            statement.accept(self)
+        self._function_depth -= 1
+        self._scopes.pop()
+
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
+        if stmt.value is not None:
+            self._walk_expression(stmt.value)
+
+    def visit_assign_expr(self, expr: AssignExpr) -> LoxType:
+        (value,) = self._operand_results(1)
+        self._assigned.add(expr.name.lexeme)
+        binding = self._lookup(expr.name.lexeme)
+        if binding is not None:
+            self._bind(binding, value)
+        return value
+
+    def visit_binary_expr(self, expr: BinaryExpr) -> LoxType:
+        left, right = self._operand_results(2)
+        kind = expr.operator.type
+
+        if self._annotate and kind in TypeInference.CHECKED_OPERATORS:
+            expr.static_path = self._static_path(kind, left, right)
+            self._explain(
+                expr.operator.line, expr.operator.lexeme, expr.static_path, left, right
+            )
+
+        match kind:
+            case TokenType.PLUS:
+                if left is LoxType.NEVER or right is LoxType.NEVER:
+                    return LoxType.NEVER
+                if left is right and left in (LoxType.NUMBER, LoxType.STRING):
+                    return left
+                return LoxType.ANY
+            case TokenType.MINUS | TokenType.STAR | TokenType.SLASH:
+                return LoxType.NUMBER
+        return LoxType.BOOLEAN
+
+    def visit_grouping_expr(self, expr: GroupingExpr) -> LoxType:
+        (expression,) = self._operand_results(1)
+        return expression
+
+    def visit_unary_expr(self, expr: UnaryExpr) -> LoxType:
+        (right,) = self._operand_results(1)
+        if expr.operator.type is TokenType.BANG:
+            return LoxType.BOOLEAN
+
+        if self._annotate:
+            expr.static_path = operator.neg if right is LoxType.NUMBER else None
+            self._explain(
+                expr.operator.line, expr.operator.lexeme, expr.static_path, right
+            )
+        return LoxType.NUMBER
+
+    def visit_literal_expr(self, expr: LiteralExpr) -> LoxType:
+        value = expr.value
+        if value is None:
+            return LoxType.NIL
+        if isinstance(value, bool):
+            return LoxType.BOOLEAN
+        if isinstance(value, float):
+            return LoxType.NUMBER
+        if isinstance(value, str):
+            return LoxType.STRING
+        return LoxType.ANY
+
+    def visit_logical_expr(self, expr: LogicalExpr) -> LoxType:
+        left, right = self._operand_results(2)
+        return left.join(right)
+
+    def visit_variable_expr(self, expr: VariableExpr) -> LoxType:
+        name = expr.name.lexeme
+        binding = self._lookup(name)
+        if binding is None:
+            return LoxType.ANY
+        if (
+            self._function_depth > 0
+            and self._scopes[0].get(name) is binding
+            and name not in self._stable_globals
+        ):
+            return LoxType.ANY
+        binding = self._shared_slots.get(binding, binding)
+        return self._bindings.get(binding, LoxType.NEVER)
+
+    def visit_call_expr(self, expr: CallExpr) -> LoxType:
+        self._operand_results(1 + len(expr.arguments))
+        return LoxType.ANY
+
+    def visit_get_expr(self, expr: GetExpr) -> LoxType:
+        self._operand_results(1)
+        return LoxType.ANY
+
+    def visit_set_expr(self, expr: SetExpr) -> LoxType:
+        _, value = self._operand_results(2)
+        # a field can hold any value, so its type is not tracked
+        return value
+
+    def visit_this_expr(self, expr: ThisExpr) -> LoxType:
+        return LoxType.ANY
+
+    def visit_super_expr(self, expr: SuperExpr) -> LoxType:
+        return LoxType.ANY
+
+    def _walk(self, statements: list[Stmt]) -> None:
+        self._next_bindings = {}
+        self._scopes = [{}]
+        self._declarations = {}
+        self._assigned = set()
+        self._shared_slots = {}
+        for statement in statements:
+            statement.accept(self)
+
+    def _bind(self, binding: Binding, value: LoxType) -> None:
+        binding = self._shared_slots.get(binding, binding)
+        current = self._next_bindings.get(binding, LoxType.NEVER)
+        self._next_bindings[binding] = current.join(value)
+
+    def _declare(self, name: str, binding: Binding) -> None:
+        scope = self._scopes[-1]
+        if len(self._scopes) == 1:
+            self._declarations[name] = self._declarations.get(name, 0) + 1
+        elif name in scope:
+            previous = scope[name]
+            self._shared_slots[binding] = self._shared_slots.get(previous, previous)
+        scope[name] = binding
+
+    def _find_stable_globals(self) -> frozenset[str]:
+        """The globals of the last walk that function bodies may trust."""
+        if not self.whole_program:
+            return frozenset()
+        return frozenset(
+            name
+            for name, count in self._declarations.items()
+            if count == 1 and name not in self._assigned
+        )
+
+    def _lookup(self, name: str) -> Binding | None:
+        """Find the declaration in scope for a name, if it is in this program."""
+        for scope in reversed(self._scopes):
+            binding = scope.get(name)
+            if binding is not None:
+                return binding
+        return None
+
+    def _static_path(
+        self, op: TokenType, left: LoxType, right: LoxType
+    ) -> FastPath | None:
+        if left is LoxType.NUMBER and right is LoxType.NUMBER:
+            return BinarySpecialization.FAST_PATHS[(op, float, float)]
+        if op is TokenType.PLUS and left is right is LoxType.STRING:
+            return BinarySpecialization.FAST_PATHS[(op, str, str)]
+        return None
+
+    def _explain(
+        self, line: int, lexeme: str, static_path: object, *operands: LoxType
+    ) -> None:
+        types = ", ".join(operand.name.lower() for operand in operands)
+        verdict = "unchecked" if static_path is not None else "checked"
+        self.explanations.append(f"[line {line}] '{lexeme}' on {types}: {verdict}")
@@ -0,0 +1,33 @@
+"""Lox value semantics shared by every execution engine."""
+
+
+def is_truthy(value: object) -> bool:
+    """Determine if a value is truthy in Lox."""
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return bool(value)
+    return True
+
+
+def is_equal(value_a: object, value_b: object) -> bool:
+    """Test if two values are equal in Lox."""
+    if value_a is None and value_b is None:
+        return True
+    if value_a is None:
+        return False
+    return value_a == value_b
+
+
+def stringify(value: object) -> str:
+    """Convert a Lox value to its string representation."""
+    if value is None:
+        return "nil"
+
+    if isinstance(value, float):
+        text = str(value)
+        if text.endswith(".0"):
+            text = text[0 : len(text) - 2]
+        return text
+
+    return str(value)
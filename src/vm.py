@@ -0,0 +1,432 @@
+from collections.abc import Callable
+
+from src.chunk import Chunk, Function, OpCode
+from src.compiler import Compiler
+from src.exceptions import PloxRuntimeError
+from src.lox_callable import NATIVES, LoxCallable, NativeFunction, check_call
+from src.lox_class import (
+    BoundMethod,
+    LoxClass,
+    LoxInstance,
+    get_property,
+    lookup_property,
+    set_property,
+)
+from src.stmt import Stmt
+from src.token import Token
+from src.token_type import TokenType
+from src.values import is_equal, is_truthy, stringify
+
+# opcodes as plain ints so the dispatch loop compares small ints
+CONSTANT = OpCode.CONSTANT.value
+NIL = OpCode.NIL.value
+TRUE = OpCode.TRUE.value
+FALSE = OpCode.FALSE.value
+POP = OpCode.POP.value
+POPN = OpCode.POPN.value
+GET_LOCAL = OpCode.GET_LOCAL.value
+SET_LOCAL = OpCode.SET_LOCAL.value
+DEFINE_GLOBAL = OpCode.DEFINE_GLOBAL.value
+GET_GLOBAL = OpCode.GET_GLOBAL.value
+SET_GLOBAL = OpCode.SET_GLOBAL.value
+EQUAL = OpCode.EQUAL.value
+NOT_EQUAL = OpCode.NOT_EQUAL.value
+GREATER = OpCode.GREATER.value
+GREATER_EQUAL = OpCode.GREATER_EQUAL.value
+LESS = OpCode.LESS.value
+LESS_EQUAL = OpCode.LESS_EQUAL.value
+ADD = OpCode.ADD.value
+SUBTRACT = OpCode.SUBTRACT.value
+MULTIPLY = OpCode.MULTIPLY.value
+DIVIDE = OpCode.DIVIDE.value
+NOT = OpCode.NOT.value
+NEGATE = OpCode.NEGATE.value
+PRINT = OpCode.PRINT.value
+JUMP = OpCode.JUMP.value
+JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+JUMP_IF_TRUE = OpCode.JUMP_IF_TRUE.value
+CALL = OpCode.CALL.value
+TAIL_CALL = OpCode.TAIL_CALL.value
+CLOSURE = OpCode.CLOSURE.value
+GET_UPVALUE = OpCode.GET_UPVALUE.value
+SET_UPVALUE = OpCode.SET_UPVALUE.value
+CLOSE_UPVALUE = OpCode.CLOSE_UPVALUE.value
+CLASS = OpCode.CLASS.value
+INHERIT = OpCode.INHERIT.value
+METHOD = OpCode.METHOD.value
+GET_PROPERTY = OpCode.GET_PROPERTY.value
+SET_PROPERTY = OpCode.SET_PROPERTY.value
+INVOKE = OpCode.INVOKE.value
+GET_SUPER = OpCode.GET_SUPER.value
+RETURN = OpCode.RETURN.value
+
+NUMBER = (int, float)
+
+
+class Upvalue:
+    """A variable captured by a closure.
+
+    While the variable is still on the stack the upvalue refers to its
+    slot; once closed, `slot` is -1 and the upvalue holds the value.
+    """
+
+    __slots__ = ("slot", "value")
+
+    def __init__(self, slot: int) -> None:
+        self.slot = slot
+        self.value: object = None
+
+
+class Closure(LoxCallable):
+    """A `Function` together with the variables it captured."""
+
+    __slots__ = ("function", "upvalues")
+
+    def __init__(self, function: Function, upvalues: list[Upvalue]) -> None:
+        super().__init__(function.name, function.arity)
+        self.function = function
+        self.upvalues = upvalues
+
+
+class VM:
+    """Executes statements by compiling them to bytecode for a stack machine.
+
+    Implements the same `interpret` interface as `Interpreter`, so `Plox`
+    can use either engine. Globals persist between calls.
+
+    Calls do not recurse in Python: a call saves the caller's chunk,
+    instruction pointer and frame base on a list of frames and the loop
+    carries on in the callee, so call depth is limited by `MAX_FRAMES`
+    rather than Python's recursion limit, and tail calls use no frame.
+
+    Calling a bound method or a class puts the receiver or the new
+    instance in the callee's slot, where the method or initializer finds
+    it as `this`.
+    """
+
+    MAX_FRAMES = 4096
+
+    OPERATOR_TOKENS = {
+        GREATER: (TokenType.GREATER, ">"),
+        GREATER_EQUAL: (TokenType.GREATER_EQUAL, ">="),
+        LESS: (TokenType.LESS, "<"),
+        LESS_EQUAL: (TokenType.LESS_EQUAL, "<="),
+        ADD: (TokenType.PLUS, "+"),
+        SUBTRACT: (TokenType.MINUS, "-"),
+        MULTIPLY: (TokenType.STAR, "*"),
+        DIVIDE: (TokenType.SLASH, "/"),
+        NEGATE: (TokenType.MINUS, "-"),
+        CALL: (TokenType.RIGHT_PAREN, ")"),
+        TAIL_CALL: (TokenType.RIGHT_PAREN, ")"),
+        INVOKE: (TokenType.RIGHT_PAREN, ")"),
+        INHERIT: (TokenType.LESS, "<"),
+    }
+
+    def __init__(self) -> None:
+        self._globals: dict[str, object] = dict(NATIVES)
+
+    def interpret(
+        self, statements: list[Stmt], error_reporter: Callable[[PloxRuntimeError], None]
+    ) -> None:
+        chunk = Compiler().compile(statements)
+        try:
+            self.run(chunk)
+        except PloxRuntimeError as error:
+            error_reporter(error)
+
+    def run(self, chunk: Chunk) -> None:
+        """Executes a compiled chunk."""
+        code = chunk.code
+        constants = chunk.constants
+        properties = chunk.properties
+        globals = self._globals
+        stack: list[object] = []
+        push = stack.append
+        pop = stack.pop
+        ip = 0
+        # stack index of the running call's slot 0
+        base = 0
+        upvalues: list[Upvalue] = []
+        # the chunk, return address, base and upvalues of each caller
+        frames: list[tuple[Chunk, int, int, list[Upvalue]]] = []
+        # upvalues still referring to a stack slot, by slot
+        open_upvalues: dict[int, Upvalue] = {}
+        try:
+            while True:
+                op = code[ip]
+                ip += 1
+
+                if op == GET_LOCAL:
+                    push(stack[base + code[ip]])
+                    ip += 1
+                elif op == CONSTANT:
+                    push(constants[code[ip]])
+                    ip += 1
+                elif op == GET_GLOBAL:
+                    name = constants[code[ip]]
+                    assert isinstance(name, str)
+                    if name not in globals:
+                        raise self._undefined(chunk, ip, name)
+                    push(globals[name])
+                    ip += 1
+                elif op == ADD:
+                    right = pop()
+                    left = stack[-1]
+                    if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+                        stack[-1] = float(left) + float(right)
+                    elif isinstance(left, str) and isinstance(right, str):
+                        stack[-1] = left + right
+                    else:
+                        raise self._error(
+                            chunk, ip, "Operands must be two numbers or two strings."
+                        )
+                elif op == SUBTRACT:
+                    right = pop()
+                    left = self._numbers(chunk, ip, stack[-1], right)
+                    stack[-1] = left - float(right)  # type: ignore[arg-type]
+                elif op == MULTIPLY:
+                    right = pop()
+                    left = self._numbers(chunk, ip, stack[-1], right)
+                    stack[-1] = left * float(right)  # type: ignore[arg-type]
+                elif op == DIVIDE:
+                    right = pop()
+                    left = self._numbers(chunk, ip, stack[-1], right)
+                    stack[-1] = left / float(right)  # type: ignore[arg-type]
+                elif op == LESS:
+                    right = pop()
+                    left = self._numbers(chunk, ip, stack[-1], right)
+                    stack[-1] = left < float(right)  # type: ignore[arg-type]
+                elif op == LESS_EQUAL:
+                    right = pop()
+                    left = self._numbers(chunk, ip, stack[-1], right)
+                    stack[-1] = left <= float(right)  # type: ignore[arg-type]
+                elif op == GREATER:
+                    right = pop()
+                    left = self._numbers(chunk, ip, stack[-1], right)
+                    stack[-1] = left > float(right)  # type: ignore[arg-type]
+                elif op == GREATER_EQUAL:
+                    right = pop()
+                    left = self._numbers(chunk, ip, stack[-1], right)
+                    stack[-1] = left >= float(right)  # type: ignore[arg-type]
+                elif op == SET_LOCAL:
+                    stack[base + code[ip]] = stack[-1]
+                    ip += 1
+                elif op == POP:
+                    pop()
+                elif op == JUMP_IF_FALSE:
+                    if is_truthy(stack[-1]):
+                        ip += 1
+                    else:
+                        ip = code[ip]
+                elif op == JUMP_IF_TRUE:
+                    if is_truthy(stack[-1]):
+                        ip = code[ip]
+                    else:
+                        ip += 1
+                elif op == JUMP:
+                    ip = code[ip]
+                elif op == PRINT:
+                    print(stringify(pop()))
+                elif op == SET_GLOBAL:
+                    name = constants[code[ip]]
+                    assert isinstance(name, str)
+                    if name not in globals:
+                        raise self._undefined(chunk, ip, name)
+                    globals[name] = stack[-1]
+                    ip += 1
+                elif op == DEFINE_GLOBAL:
+                    name = constants[code[ip]]
+                    assert isinstance(name, str)
+                    globals[name] = pop()
+                    ip += 1
+                elif op == EQUAL:
+                    right = pop()
+                    stack[-1] = is_equal(stack[-1], right)
+                elif op == NOT_EQUAL:
+                    right = pop()
+                    stack[-1] = not is_equal(stack[-1], right)
+                elif op == NOT:
+                    stack[-1] = not is_truthy(stack[-1])
+                elif op == NEGATE:
+                    operand = stack[-1]
+                    if not isinstance(operand, NUMBER):
+                        raise self._error(chunk, ip, "Operand must be a number.")
+                    stack[-1] = -float(operand)
+                elif op == NIL:
+                    push(None)
+                elif op == TRUE:
+                    push(True)
+                elif op == FALSE:
+                    push(False)
+                elif op == POPN:
+                    del stack[-code[ip] :]
+                    ip += 1
+                elif op == GET_UPVALUE:
+                    upvalue = upvalues[code[ip]]
+                    slot = upvalue.slot
+                    push(upvalue.value if slot < 0 else stack[slot])
+                    ip += 1
+                elif op == SET_UPVALUE:
+                    upvalue = upvalues[code[ip]]
+                    if upvalue.slot < 0:
+                        upvalue.value = stack[-1]
+                    else:
+                        stack[upvalue.slot] = stack[-1]
+                    ip += 1
+                elif op == GET_PROPERTY:
+                    name, cache = properties[code[ip]]
+                    stack[-1] = get_property(stack[-1], name, cache)
+                    ip += 1
+                elif op == SET_PROPERTY:
+                    name, cache = properties[code[ip]]
+                    value = pop()
+                    stack[-1] = set_property(stack[-1], name, value, cache)
+                    ip += 1
+                elif op == CALL or op == TAIL_CALL or op == INVOKE:
+                    if op == INVOKE:
+                        # the receiver is in the callee's slot
+                        name, cache = properties[code[ip]]
+                        count = code[ip + 1]
+                        next_ip = ip + 2
+                        receiver = stack[-1 - count]
+                        callee = lookup_property(receiver, name, cache)
+                        if type(callee) is int:
+                            assert type(receiver) is LoxInstance
+                            callee = stack[-1 - count] = receiver.fields[callee]
+                    else:
+                        count = code[ip]
+                        next_ip = ip + 1
+                        callee = stack[-1 - count]
+                    if type(callee) is not Closure or callee.arity != count:
+                        function = check_call(
+                            callee, stack[len(stack) - count :], self._token(chunk, ip)
+                        )
+                        if type(function) is BoundMethod:
+                            stack[-1 - count] = function.receiver
+                            callee = function.method
+                        elif type(function) is LoxClass:
+                            stack[-1 - count] = LoxInstance(function)
+                            callee = function.initializer
+                            if callee is None:
+                                ip = next_ip
+                                continue
+                        else:
+                            assert isinstance(function, NativeFunction)
+                            result = function.function(*stack[len(stack) - count :])
+                            del stack[-1 - count :]
+                            push(result)
+                            ip = next_ip
+                            continue
+                    assert type(callee) is Closure
+
+                    if op == TAIL_CALL:
+                        # the callee takes over the returning call's frame
+                        if open_upvalues:
+                            self._close_upvalues(stack, open_upvalues, base)
+                        stack[base:] = stack[-1 - count :]
+                    else:
+                        if len(frames) == VM.MAX_FRAMES:
+                            raise self._error(chunk, ip, "Stack overflow.")
+                        frames.append((chunk, next_ip, base, upvalues))
+                        base = len(stack) - 1 - count
+                    chunk = callee.function.chunk
+                    code = chunk.code
+                    constants = chunk.constants
+                    properties = chunk.properties
+                    upvalues = callee.upvalues
+                    ip = 0
+                elif op == CLOSURE:
+                    function = constants[code[ip]]
+                    assert isinstance(function, Function)
+                    captured: list[Upvalue] = []
+                    for is_local, index in function.upvalues:
+                        if not is_local:
+                            captured.append(upvalues[index])
+                            continue
+                        slot = base + index
+                        upvalue = open_upvalues.get(slot)
+                        if upvalue is None:
+                            upvalue = open_upvalues[slot] = Upvalue(slot)
+                        captured.append(upvalue)
+                    push(Closure(function, captured))
+                    ip += 1
+                elif op == CLASS:
+                    name = constants[code[ip]]
+                    assert isinstance(name, str)
+                    push(LoxClass(name))
+                    ip += 1
+                elif op == INHERIT:
+                    klass = pop()
+                    assert type(klass) is LoxClass
+                    klass.inherit(stack[-1], self._token(chunk, ip))
+                elif op == METHOD:
+                    name = constants[code[ip]]
+                    assert isinstance(name, str)
+                    method = pop()
+                    assert type(method) is Closure
+                    klass = stack[-1]
+                    assert type(klass) is LoxClass
+                    klass.add_method(name, method)
+                    ip += 1
+                elif op == GET_SUPER:
+                    name = constants[code[ip]]
+                    assert isinstance(name, str)
+                    superclass = pop()
+                    assert type(superclass) is LoxClass
+                    method = superclass.methods.get(name)
+                    if method is None:
+                        raise self._undefined_property(chunk, ip, name)
+                    stack[-1] = BoundMethod(stack[-1], method)  # type: ignore[arg-type]
+                    ip += 1
+                elif op == CLOSE_UPVALUE:
+                    self._close_upvalues(stack, open_upvalues, len(stack) - 1)
+                    pop()
+                elif op == RETURN:
+                    if not frames:
+                        return
+                    result = pop()
+                    if open_upvalues:
+                        self._close_upvalues(stack, open_upvalues, base)
+                    del stack[base:]
+                    push(result)
+                    chunk, ip, base, upvalues = frames.pop()
+                    code = chunk.code
+                    constants = chunk.constants
+                    properties = chunk.properties
+        finally:
+            # closures that outlive the run must not refer to its stack
+            self._close_upvalues(stack, open_upvalues, 0)
+
+    def _close_upvalues(
+        self, stack: list[object], open_upvalues: dict[int, Upvalue], first: int
+    ) -> None:
+        """Move the values of the open upvalues at or above slot `first`
+        off the stack and into the upvalues."""
+        for slot in [slot for slot in open_upvalues if slot >= first]:
+            upvalue = open_upvalues.pop(slot)
+            upvalue.value = stack[slot]
+            upvalue.slot = -1
+
+    def _numbers(self, chunk: Chunk, ip: int, left: object, right: object) -> float:
+        """Check that both operands are numbers and return the left as a float."""
+        if isinstance(left, NUMBER) and isinstance(right, NUMBER):
+            return float(left)
+        raise self._error(chunk, ip, "Operands must be numbers.")
+
+    def _error(self, chunk: Chunk, ip: int, message: str) -> PloxRuntimeError:
+        """Build a runtime error for the instruction that ends just before `ip`."""
+        return PloxRuntimeError(self._token(chunk, ip), message)
+
+    def _token(self, chunk: Chunk, ip: int) -> Token:
+        """Rebuild the operator token of the instruction just before `ip`."""
+        op = chunk.code[ip - 1]
+        type, lexeme = VM.OPERATOR_TOKENS[op]
+        return Token(type, lexeme, None, chunk.lines[ip - 1])
+
+    def _undefined(self, chunk: Chunk, ip: int, name: str) -> PloxRuntimeError:
+        token = Token(TokenType.IDENTIFIER, name, None, chunk.lines[ip])
+        return PloxRuntimeError(token, f"Undefined variable '{name}'.")
+
+    def _undefined_property(self, chunk: Chunk, ip: int, name: str) -> PloxRuntimeError:
+        token = Token(TokenType.IDENTIFIER, name, None, chunk.lines[ip])
+        return PloxRuntimeError(token, f"Undefined property '{name}'.")
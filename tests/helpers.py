@@ -0,0 +1,53 @@
+"""Helpers shared by the tests."""
+
+import pytest
+
+from src.expr import Expr
+from src.parser import Parser
+from src.resolver import Resolver
+from src.scanner import Scanner
+from src.stmt import Stmt
+
+
+def dummy_error_reporter(*args: object) -> None:
+    """Dummy error reporter for tests."""
+    pass
+
+
+def parse(source: str, parser_class: type[Parser] = Parser) -> list[Stmt]:
+    """Scans and parses source code, ignoring errors."""
+    tokens = Scanner(source, dummy_error_reporter).scan_tokens()
+    return parser_class(tokens, dummy_error_reporter).parse()
+
+
+def resolve(source: str) -> list[Stmt]:
+    """Parses and resolves source code, ignoring errors."""
+    statements = parse(source)
+    Resolver().resolve(statements)
+    return statements
+
+
+def same_tree(left: object, right: object) -> bool:
+    """Compares syntax trees node by node."""
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(map(same_tree, left, right))
+    if type(left) is not type(right):
+        return False
+    if not isinstance(left, (Expr, Stmt)):
+        return left == right
+    return all(
+        same_tree(getattr(left, name), getattr(right, name)) for name in left.__slots__
+    )
+
+
+def feed_repl(monkeypatch: pytest.MonkeyPatch, lines: list[str]) -> None:
+    """Makes the REPL read `lines`, then the end of input."""
+    remaining = iter(lines)
+
+    def read_line(prompt: str) -> str:
+        try:
+            return next(remaining)
+        except StopIteration:
+            raise EOFError from None
+
+    monkeypatch.setattr("builtins.input", read_line)
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from src.ast_arena import AstArena
+from src.ast_cache import Tag
+from src.ast_printer import AstPrinter
+from src.pratt_parser import PrattParser
+from src.stmt import ExpressionStmt, IfStmt, VarStmt
+from tests.helpers import parse, same_tree
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def test_nodes_have_no_instance_dict():
+    for statement in parse(
+        "var a = -1; { a = (a + 2) or nil; } if (a) print a;", PrattParser
+    ):
+        assert not hasattr(statement, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "script", sorted(DATA_DIR.glob("*.plox")), ids=lambda path: path.stem
+)
+def test_round_trip_scripts(script: Path):
+    statements = parse(script.read_text(encoding="utf8"), PrattParser)
+    arena = AstArena()
+    roots = [arena.add(statement) for statement in statements]
+    assert same_tree([arena.node(root) for root in roots], statements)
+
+
+def test_missing_children_round_trip():
+    statements = parse("var a; if (a) print 1;", PrattParser)
+    arena = AstArena()
+    roots = [arena.add(statement) for statement in statements]
+    declaration, branch = (arena.node(root) for root in roots)
+    assert isinstance(declaration, VarStmt) and declaration.initializer is None
+    assert isinstance(branch, IfStmt) and branch.else_branch is None
+
+
+def test_children_are_stored_before_their_parent():
+    arena = AstArena()
+    root = arena.add(parse("print 1 + 2 * 3;", PrattParser)[0])
+    assert root == len(arena) - 1
+    assert [arena.kind(index) for index in range(len(arena))] == [
+        Tag.LITERAL_EXPR,
+        Tag.LITERAL_EXPR,
+        Tag.LITERAL_EXPR,
+        Tag.BINARY_EXPR,
+        Tag.BINARY_EXPR,
+        Tag.PRINT_STMT,
+    ]
+
+
+def test_subtrees_can_be_rebuilt():
+    arena = AstArena()
+    arena.add(parse("print -(1 + 2);", PrattParser)[0])
+    assert AstPrinter().print(arena.node(2)) == "(+ 1.0 2.0)"
+
+
+def test_deep_trees_round_trip():
+    depth = 10_000
+    [statement] = parse("-" * depth + "1;", PrattParser)
+    arena = AstArena()
+    rebuilt = arena.node(arena.add(statement))
+    assert isinstance(rebuilt, ExpressionStmt)
+    assert AstPrinter().print(rebuilt.expression) == "(- " * depth + "1.0" + ")" * depth
+
+
+def test_arena_is_smaller_than_the_nodes():
+    statements = parse("var a = 1;\n" + "a = a * 2 + (a - 1) / 3;\n" * 200, PrattParser)
+    arena = AstArena()
+    for statement in statements:
+        arena.add(statement)
+    assert arena.nbytes < 20 * len(arena)
@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import src.plox
+from src.ast_cache import AstCache, AstReader, AstWriter
+from src.plox import Plox
+from tests.helpers import parse, same_tree
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        'var a = 1.5; var b = "two"; var c;',
+        "{ var a = true; { a = !a and nil or false; } }",
+        "if (a >= -2) print (a + 1) * 3 / 4; else { print a != a == b; }",
+        'print "ünïcode" + "é";',
+    ],
+)
+def test_round_trip(source: str):
+    statements = parse(source)
+    data = AstWriter().write(statements)
+    assert same_tree(AstReader(data).read(), statements)
+
+
+def test_round_trip_scripts():
+    for script in DATA_DIR.glob("*.plox"):
+        statements = parse(script.read_text(encoding="utf8"))
+        assert same_tree(AstReader(AstWriter().write(statements)).read(), statements)
+
+
+@pytest.mark.parametrize("cut", [0, 4, 5, 12, -1])
+def test_truncated_data_is_rejected(cut: int):
+    data = AstWriter().write(parse('var a = "x"; print a + 1;'))
+    with pytest.raises(ValueError):
+        AstReader(data[:cut]).read()
+
+
+def test_warm_run_skips_scanner_and_parser(tmp_path, monkeypatch, capsys):
+    cache = AstCache(tmp_path / "cache")
+    script = DATA_DIR / "control_flow.plox"
+    expected = script.with_suffix(".out").read_text(encoding="utf8")
+
+    assert Plox(cache=cache).run_file(script) == 0
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    def fail(*args: object) -> None:
+        raise AssertionError("scanned on a warm run")
+
+    monkeypatch.setattr(src.plox, "RegexScanner", fail)
+    for engine in Plox.ENGINES:
+        assert (
+            Plox(engine=engine, optimization_level=1, cache=cache).run_file(script) == 0
+        )
+    assert cache.hits == len(Plox.ENGINES)
+    assert capsys.readouterr().out == expected * (1 + len(Plox.ENGINES))
+
+
+def test_source_with_errors_is_not_cached(tmp_path, capsys):
+    cache = AstCache(tmp_path / "cache")
+    script = tmp_path / "broken.plox"
+    script.write_text("print 1 +;", encoding="utf8")
+
+    Plox(cache=cache).run_file(script)
+
+    assert not (tmp_path / "cache").exists() or not any((tmp_path / "cache").iterdir())
+
+
+def test_corrupt_entry_is_a_miss(tmp_path, capsys):
+    cache = AstCache(tmp_path)
+    source = "print 1;"
+    cache.store(source, parse(source))
+    (entry,) = tmp_path.glob("*.ast")
+    entry.write_bytes(entry.read_bytes()[:-1])
+
+    assert cache.load(source) is None
+    assert not entry.exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    sources = [f"print {n};" for n in range(3)]
+    cache = AstCache(tmp_path)
+    for age, source in enumerate(sources[:2]):
+        cache.store(source, parse(source))
+        os.utime(cache._path(source), ns=(age, age))
+
+    # using the oldest entry makes the second one the least recently used
+    assert cache.load(sources[0]) is not None
+    cache.max_bytes = sum(path.stat().st_size for path in tmp_path.glob("*.ast"))
+    cache.store(sources[2], parse(sources[2]))
+
+    assert cache.load(sources[0]) is not None
+    assert cache.load(sources[1]) is None
+    assert cache.load(sources[2]) is not None
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+
+from src.ast_interner import AstInterner
+from src.expr import BinaryExpr, Expr, GroupingExpr, LiteralExpr
+from src.parser import Parser
+from src.plox import Plox
+from src.pratt_parser import PrattParser
+from src.scanner import Scanner
+from src.stmt import PrintStmt, Stmt
+from tests.helpers import dummy_error_reporter
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def parse(source: str, parser_class: type[Parser] = PrattParser) -> list[Stmt]:
+    tokens = Scanner(source, dummy_error_reporter).scan_tokens()
+    return parser_class(tokens, dummy_error_reporter, AstInterner()).parse()
+
+
+def printed(stmt: Stmt) -> Expr:
+    assert isinstance(stmt, PrintStmt)
+    return stmt.expression
+
+
+@pytest.mark.parametrize("parser_class", [Parser, PrattParser])
+def test_literals_share_a_constant_pool(parser_class: type[Parser]):
+    statements = parse('print 1.5;\nprint 1.5;\nprint "a";\nprint "a";', parser_class)
+    first, second, third, fourth = map(printed, statements)
+    assert first is second
+    assert third is fourth
+    assert first is not third
+
+
+def test_equal_values_of_different_types_are_not_shared():
+    interner = AstInterner()
+    values = [0.0, -0.0, 1.0, True, None, False]
+    interned = [interner.intern(LiteralExpr(value)) for value in values]
+    assert len({id(expr) for expr in interned}) == len(values)
+
+
+def test_constant_subtrees_are_shared_across_lines():
+    first, second = map(printed, parse("print (1 + 2) * 3;\nprint (1 + 2) * 3;"))
+    assert first is second
+    assert isinstance(first, BinaryExpr)
+    assert isinstance(first.left, GroupingExpr)
+
+
+def test_subtrees_that_can_fail_keep_their_line():
+    first, second = map(printed, parse('print -"a" + 1;\nprint -"a" + 1;'))
+    assert first is not second
+    assert isinstance(first, BinaryExpr) and isinstance(second, BinaryExpr)
+    assert first.left is not second.left
+    assert first.right is second.right
+
+
+def test_variables_are_not_shared():
+    first, second = map(printed, parse("print a + 1;\nprint a + 1;"))
+    assert first is not second
+    assert isinstance(first, BinaryExpr) and isinstance(second, BinaryExpr)
+    assert first.left is not second.left
+    assert first.right is second.right
+
+
+def test_division_is_not_shared():
+    first, second = map(printed, parse("print 1 / 2;\nprint 1 / 2;"))
+    assert first is not second
+
+
+def test_shared_nodes_are_counted():
+    interner = AstInterner()
+    tokens = Scanner("print 1 + 2;\n" * 3, dummy_error_reporter).scan_tokens()
+    PrattParser(tokens, dummy_error_reporter, interner).parse()
+    # `1`, `2` and `1 + 2` of the second and third statements
+    assert interner.shared == 6
+    assert len(interner) == 3
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+@pytest.mark.parametrize("optimization_level", [0, 1])
+@pytest.mark.parametrize(
+    "script", sorted(DATA_DIR.glob("*.plox")), ids=lambda path: path.stem
+)
+def test_interning_matches_golden_output(
+    script: Path, engine: str, optimization_level: int, capsys
+):
+    expected = script.with_suffix(".out").read_text(encoding="utf8")
+
+    plox = Plox(engine=engine, optimization_level=optimization_level, intern=True)
+    assert plox.run_file(script) == 0
+    assert capsys.readouterr().out == expected
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+def test_runtime_errors_report_their_own_line(engine: str, tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text(
+        '{ var a = 1; print a + 1; }\n{ var b = 2; var a = "x"; print a + "y"; }\n'
+        'if (false) print -"a";\nprint -"a";\n'
+    )
+
+    status = Plox(engine=engine, intern=True).run_file(script)
+
+    captured = capsys.readouterr()
+    assert captured.out == "2\nxy\n"
+    assert "[line 4]" in captured.err
+    assert status != 0
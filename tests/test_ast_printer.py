@@ -1,4 +1,12 @@
-from src.expr import BinaryExpr, LiteralExpr, GroupingExpr, UnaryExpr
+from src.expr import (
+    AssignExpr,
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    LogicalExpr,
+    UnaryExpr,
+    VariableExpr,
+)
 from src.token import Token
 from src.token_type import TokenType
 from src.ast_printer import AstPrinter
@@ -44,3 +52,12 @@ def test_complex():
     right = GroupingExpr(LiteralExpr("45.67"))
     result = AstPrinter().print(BinaryExpr(left, expression, right))
     assert result == "(* (- 123) (group 45.67))"
+
+
+def test_variable_assign_and_logical():
+    name = Token(type=TokenType.IDENTIFIER, lexeme="a", literal=None, line=1)
+    operator = Token(type=TokenType.OR, lexeme="or", literal=None, line=1)
+    expr = AssignExpr(
+        name, LogicalExpr(VariableExpr(name), operator, LiteralExpr(None))
+    )
+    assert AstPrinter().print(expr) == "(= a (or a nil))"
@@ -0,0 +1,162 @@
+import pytest
+from src.chunk import OpCode
+from src.compiler import Compiler
+from src.inline_cache import InlineCache
+from src.interpreter import Interpreter
+from src.lox_class import LoxClass, LoxInstance, get_property, set_property
+from src.parser import Parser
+from src.plox import Plox
+from src.pratt_parser import PrattParser
+from src.scanner import Scanner
+from src.token import Token
+from src.token_type import TokenType
+from tests.helpers import dummy_error_reporter, parse, resolve
+
+
+def name(lexeme: str) -> Token:
+    return Token(TokenType.IDENTIFIER, lexeme, None, 1)
+
+
+def test_instances_with_the_same_fields_share_a_shape():
+    klass = LoxClass("Point")
+    first, second, other = LoxInstance(klass), LoxInstance(klass), LoxInstance(klass)
+    set_x, set_y = InlineCache(), InlineCache()
+    for instance in (first, second):
+        set_property(instance, name("x"), 1.0, set_x)
+        set_property(instance, name("y"), 2.0, set_y)
+    set_property(other, name("y"), 3.0, set_y)
+
+    assert first.shape is second.shape
+    assert first.shape.fields == {"x": 0, "y": 1}
+    assert other.shape is not first.shape
+    assert other.shape.fields == {"y": 0}
+    # the second instance took the transitions the first one cached
+    assert (set_x.hits, set_x.misses) == (1, 1)
+    assert (set_y.hits, set_y.misses) == (1, 2)
+
+
+def test_cache_goes_polymorphic_then_megamorphic():
+    cache = InlineCache()
+    assert cache.state == "uninitialized"
+
+    classes = [LoxClass(f"C{index}") for index in range(InlineCache.MAX_SHAPES + 1)]
+    instances = []
+    for klass in classes:
+        instance = LoxInstance(klass)
+        set_property(instance, name("x"), 1.0, InlineCache())
+        instances.append(instance)
+
+    get_property(instances[0], name("x"), cache)
+    get_property(instances[0], name("x"), cache)
+    assert cache.state == "monomorphic"
+    for instance in instances[1:-1]:
+        get_property(instance, name("x"), cache)
+    assert cache.state == "polymorphic"
+    get_property(instances[-1], name("x"), cache)
+    assert cache.state == "megamorphic"
+    assert len(cache.shapes) == InlineCache.MAX_SHAPES
+    assert (cache.hits, cache.misses) == (1, InlineCache.MAX_SHAPES + 1)
+
+
+def test_interpreter_counts_inline_cache_hits(capsys):
+    statements = resolve(
+        "class A { get() { return this.v; } }"
+        "class B < A {}"
+        "var a = A(); a.v = 1; var b = B(); b.v = 2;"
+        "for (var i = 0; i < 10; i = i + 1) { print a.get() + b.get(); }"
+    )
+    interpreter = Interpreter()
+    interpreter.interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "3\n" * 10
+
+    stats = interpreter.inline_cache_stats()
+    # `a.v =`, `b.v =` and the two `.get()` calls see one shape each,
+    # `this.v` sees the shapes of both classes
+    assert stats.sites == 5
+    assert stats.monomorphic == 4
+    assert stats.polymorphic == 1
+    assert stats.megamorphic == 0
+    assert stats.misses == 6
+    assert stats.hits == 36
+
+
+@pytest.mark.parametrize("parser", [Parser, PrattParser])
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("class {}", "Expect class name."),
+        ("class A < {}", "Expect superclass name."),
+        ("class A < A {}", "A class can't inherit from itself."),
+        ("class A }", "Expect '{' before class body."),
+        ("class A { f() {}", "Expect '}' after class body."),
+        ("print this;", "Can't use 'this' outside of a class."),
+        ("fun f() { return this; }", "Can't use 'this' outside of a class."),
+        ("print super.f;", "Can't use 'super' outside of a class."),
+        (
+            "class A { f() { super.f(); } }",
+            "Can't use 'super' in a class with no superclass.",
+        ),
+        ("class A < B { f() { super; } }", "Expect '.' after 'super'."),
+        ("class A < B { f() { super.1; } }", "Expect superclass method name."),
+        (
+            "class A { init() { return 1; } }",
+            "Can't return a value from an initializer.",
+        ),
+        ("a.1;", "Expect property name after '.'."),
+    ],
+)
+def test_class_syntax_errors(parser, source: str, message: str):
+    errors: list[str] = []
+    tokens = Scanner(source, dummy_error_reporter).scan_tokens()
+    parser(tokens, lambda token, error: errors.append(error)).parse()
+    assert errors[0] == message
+
+
+def test_compile_method_call_as_invoke():
+    chunk = Compiler().compile(parse("var a; a.f(1);"))
+    code = list(chunk.code)
+    index = code.index(OpCode.INVOKE)
+    (property_name, _) = chunk.properties[code[index + 1]]
+    assert property_name.lexeme == "f"
+    assert code[index + 2] == 1
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+@pytest.mark.parametrize(
+    "source, error",
+    [
+        ("var a = 1;\nprint a.x;", "Only instances have properties.\n[line 2]\n"),
+        ("var a = 1;\na.x = 2;", "Only instances have fields.\n[line 2]\n"),
+        ("class A {}\nprint A().x;", "Undefined property 'x'.\n[line 2]\n"),
+        ("class A {}\nA().f();", "Undefined property 'f'.\n[line 2]\n"),
+        ("var B = 1;\nclass A < B {}", "Superclass must be a class.\n[line 2]\n"),
+        (
+            "class A {}\nclass B < A { f() { return super.g; } }\nB().f();",
+            "Undefined property 'g'.\n[line 2]\n",
+        ),
+        ("class A { init(a) {} }\nA();", "Expected 1 arguments but got 0.\n[line 2]\n"),
+    ],
+)
+def test_class_runtime_errors(engine: str, source: str, error: str, tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text(source)
+
+    status = Plox(engine=engine).run_file(script)
+
+    assert capsys.readouterr().err == error
+    assert status != 0
+
+
+def test_stats_flag_reports_inline_caches(tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text("class A {}\nvar a = A();\na.x = 1;\nprint a.x;")
+
+    status = Plox(stats=True).run_file(script)
+
+    captured = capsys.readouterr()
+    assert status == 0
+    assert captured.out == "1\n"
+    assert (
+        "inline caches: 2 sites (2 monomorphic, 0 polymorphic, 0 megamorphic), "
+        "hit rate 0.0%" in captured.err
+    )
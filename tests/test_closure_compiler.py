@@ -0,0 +1,54 @@
+from src.closure_compiler import ClosureCompiler
+from src.environment import Environment
+from src.exceptions import PloxRuntimeError
+from tests.helpers import resolve
+
+
+def run(source: str) -> list[PloxRuntimeError]:
+    errors: list[PloxRuntimeError] = []
+    ClosureCompiler().interpret(resolve(source), errors.append)
+    return errors
+
+
+def test_compile_returns_one_closure_per_statement():
+    program = ClosureCompiler().compile(resolve("var a = 1; print a; { a = 2; }"))
+    assert len(program) == 3
+    assert all(callable(statement) for statement in program)
+
+
+def test_compiled_closures_can_be_rerun(capsys):
+    (statement,) = ClosureCompiler().compile(resolve("print 6 * 7;"))
+    statement(Environment())
+    statement(Environment())
+    assert capsys.readouterr().out == "42\n42\n"
+
+
+def test_run_arithmetic_and_comparison(capsys):
+    assert run("print (1 + 2) * 3 - 4 / 2; print 2 <= 1;") == []
+    assert capsys.readouterr().out == "7\nFalse\n"
+
+
+def test_block_scoping(capsys):
+    run("var a = 1; { var a = a + 1; print a; } print a;")
+    assert capsys.readouterr().out == "2\n1\n"
+
+
+def test_logical_operators_short_circuit(capsys):
+    run('print nil or "yes"; print false and missing; print !true;')
+    assert capsys.readouterr().out == "yes\nFalse\nFalse\n"
+
+
+def test_runtime_error_reports_operator_line():
+    errors = run('print 1;\nprint "a" * 2;')
+    assert errors[0].message == "Operands must be numbers."
+    assert errors[0].token.line == 2
+
+
+def test_negate_non_number():
+    errors = run('print -"a";')
+    assert errors[0].message == "Operand must be a number."
+
+
+def test_undefined_variable():
+    errors = run("print missing;")
+    assert errors[0].message == "Undefined variable 'missing'."
@@ -0,0 +1,178 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.ast_cache import AstCache
+from src.ast_printer import AstPrinter
+from src.constants import EX_SOFTWARE
+from src.exceptions import PloxRuntimeError
+from src.interpreter import Interpreter
+from src.plox import Plox
+from src.pratt_parser import PrattParser
+from src.regex_scanner import RegexScanner
+from src.resolver import Resolver
+from src.stmt import ExpressionStmt, Stmt
+from tests.helpers import dummy_error_reporter
+
+
+# well past anything Python's recursion limit would allow
+DEPTH = 5 * sys.getrecursionlimit()
+TERMS = 100_000
+
+
+def parse(source: str) -> list[Stmt]:
+    errors: list[str] = []
+    tokens = RegexScanner(source, dummy_error_reporter).scan_buffer()
+    statements = PrattParser(
+        tokens, lambda token, message: errors.append(message)
+    ).parse()
+    assert errors == []
+    return statements
+
+
+def evaluate(source: str, capsys) -> str:
+    """Resolves and runs `print <source>;`, returning what it printed."""
+    statements = parse(f"{{ var a; var result = {source}; print result; }}")
+    Resolver().resolve(statements)
+
+    def report(error: PloxRuntimeError) -> None:
+        raise error
+
+    Interpreter().interpret(statements, report)
+    return capsys.readouterr().out.rstrip("\n")
+
+
+def nested_sum(depth: int) -> str:
+    return "1 + (" * depth + "1" + ")" * depth
+
+
+def test_parse_and_print_deeply_nested_groups():
+    source = "(" * DEPTH + "1" + ")" * DEPTH + ";"
+    [statement] = parse(source)
+    assert isinstance(statement, ExpressionStmt)
+    printed = AstPrinter().print(statement.expression)
+    assert printed == "(group " * DEPTH + "1.0" + ")" * DEPTH
+
+
+def test_parse_deeply_nested_unary_operators():
+    [statement] = parse("-" * DEPTH + "1;")
+    assert isinstance(statement, ExpressionStmt)
+    assert (
+        AstPrinter().print(statement.expression) == "(- " * DEPTH + "1.0" + ")" * DEPTH
+    )
+
+
+def test_parse_long_right_associative_assignment_chain():
+    [statement] = parse("a = " * DEPTH + "1;")
+    assert isinstance(statement, ExpressionStmt)
+    printed = AstPrinter().print(statement.expression)
+    assert printed == "(= a " * DEPTH + "1.0" + ")" * DEPTH
+
+
+def test_parse_deeply_nested_calls():
+    [statement] = parse("f(" * DEPTH + "1, g(2)" + ")" * DEPTH + ";")
+    assert isinstance(statement, ExpressionStmt)
+    printed = AstPrinter().print(statement.expression)
+    assert printed == "(call f " * DEPTH + "1.0 (call g 2.0)" + ")" * DEPTH
+
+
+def test_unclosed_call_is_still_reported():
+    errors: list[str] = []
+    tokens = RegexScanner("f(" * DEPTH + "1;", dummy_error_reporter).scan_buffer()
+    PrattParser(tokens, lambda token, message: errors.append(message)).parse()
+    assert errors == ["Expect ')' after arguments."]
+
+
+def test_unclosed_group_is_still_reported():
+    errors: list[str] = []
+    tokens = RegexScanner("(" * DEPTH + "1;", dummy_error_reporter).scan_buffer()
+    PrattParser(tokens, lambda token, message: errors.append(message)).parse()
+    assert errors == ["Expect ')' after expression."]
+
+
+def test_evaluate_deeply_nested_sum(capsys):
+    assert evaluate(nested_sum(DEPTH), capsys) == str(DEPTH + 1)
+
+
+def test_evaluate_deeply_nested_operators(capsys):
+    assert evaluate("-" * (2 * DEPTH) + "1", capsys) == "1"
+    assert evaluate("!" * (2 * DEPTH + 1) + "nil", capsys) == "True"
+    assert evaluate("false or " * DEPTH + "true", capsys) == "True"
+    assert evaluate("1 and (" * DEPTH + "2" + ")" * DEPTH, capsys) == "2"
+    assert evaluate("a = " * DEPTH + "3", capsys) == "3"
+
+
+def test_evaluate_long_left_associative_chains(capsys):
+    assert evaluate(" + ".join(["1"] * TERMS), capsys) == str(TERMS)
+    assert evaluate(" + ".join(['"a"'] * TERMS), capsys) == "a" * TERMS
+
+
+def test_runtime_error_deep_inside_an_expression(capsys):
+    source = nested_sum(DEPTH).replace("(1)", '(1 + "a")')
+    with pytest.raises(PloxRuntimeError, match="two numbers or two strings"):
+        evaluate(source, capsys)
+
+
+def test_run_file(tmp_path, capsys):
+    script = tmp_path / "deep.plox"
+    chain = " + ".join(["1"] * DEPTH)
+    script.write_text(f"print {nested_sum(DEPTH)};\nprint {chain};")
+    cache = AstCache(tmp_path / "cache")
+
+    for _ in range(2):
+        assert Plox(cache=cache).run_file(script) == 0
+        assert capsys.readouterr().out == f"{DEPTH + 1}\n{DEPTH}\n"
+
+
+# long enough for a chain to be far deeper than the recursion limit, short
+# enough to run on every engine and optimization level
+CHAIN_TERMS = 20_000
+
+# engines whose compiled code nests Python frames or Python syntax as
+# deeply as the Lox expression it came from
+NESTED_ENGINES = ("closure", "python")
+
+
+def deep_script(tmp_path) -> Path:
+    """A script printing a deeply nested sum and a long chain of a variable
+    the optimizer cannot replace by its value."""
+    script = tmp_path / "deep.plox"
+    nested = "a + (" * DEPTH + "a" + ")" * DEPTH
+    chain = " + ".join(["a"] * CHAIN_TERMS)
+    script.write_text(f"var a = 1;\na = 1;\nprint {nested};\nprint {chain};")
+    return script
+
+
+@pytest.mark.parametrize("explain_types", [False, True])
+@pytest.mark.parametrize("optimization_level", [0, 1])
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+def test_deep_input_on_every_engine(
+    engine: str, optimization_level: int, explain_types: bool, tmp_path, capsys
+):
+    plox = Plox(
+        engine=engine,
+        optimization_level=optimization_level,
+        explain_types=explain_types,
+    )
+    status = plox.run_file(deep_script(tmp_path))
+
+    captured = capsys.readouterr()
+    if engine in NESTED_ENGINES:
+        assert status == EX_SOFTWARE
+        assert captured.err.endswith(
+            f"Program nested too deeply for the {engine} engine.\n"
+        )
+        assert "Traceback" not in captured.err
+    else:
+        assert status == 0
+        assert captured.out == f"{DEPTH + 1}\n{CHAIN_TERMS}\n"
+
+
+def test_deep_input_explanations(tmp_path, capsys):
+    assert Plox(explain_types=True).run_file(deep_script(tmp_path)) == 0
+    explanations = capsys.readouterr().err.splitlines()
+    assert len(explanations) == DEPTH + CHAIN_TERMS - 1
+    assert set(explanations) == {"[line 3] '+' on number, number: unchecked"} | {
+        "[line 4] '+' on number, number: unchecked"
+    }
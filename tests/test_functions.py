@@ -0,0 +1,151 @@
+import pytest
+from src.chunk import OpCode
+from src.compiler import Compiler
+from src.expr import CallExpr, VariableExpr
+from src.interpreter import Interpreter
+from src.parser import Parser
+from src.plox import Plox
+from src.scanner import Scanner
+from src.stmt import FunctionStmt, ReturnStmt
+from src.transpiler import Transpiler
+from tests.helpers import dummy_error_reporter, parse, resolve
+
+
+def test_parse_function_and_call():
+    function, call = parse("fun add(a, b) { return a + b; } add(1, 2)(3);")
+    assert isinstance(function, FunctionStmt)
+    assert [param.lexeme for param in function.params] == ["a", "b"]
+    (body,) = function.body
+    assert isinstance(body, ReturnStmt)
+
+    outer = call.expression
+    assert isinstance(outer, CallExpr)
+    assert isinstance(outer.callee, CallExpr)
+    assert isinstance(outer.callee.callee, VariableExpr)
+    assert len(outer.callee.arguments) == 2
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("fun (a) {}", "Expect function name."),
+        ("fun f a) {}", "Expect '(' after function name."),
+        ("fun f(a, 1) {}", "Expect parameter name."),
+        ("fun f(a {}", "Expect ')' after parameters."),
+        ("fun f(a) return a;", "Expect '{' before function body."),
+        ("fun f(a, a) {}", "Already a variable with this name in this scope."),
+        ("return 1;", "Can't return from top-level code."),
+        ("fun f() { return 1 }", "Expect ';' after return value."),
+        ("f(1, 2;", "Expect ')' after arguments."),
+    ],
+)
+def test_function_syntax_errors(source: str, message: str):
+    errors: list[str] = []
+    tokens = Scanner(source, dummy_error_reporter).scan_tokens()
+    Parser(tokens, lambda token, error: errors.append(error)).parse()
+    assert errors[0] == message
+
+
+def test_resolver_pools_frames_of_functions_without_closures():
+    leaf, outer = resolve("fun leaf(n) { return n; } fun outer() { fun inner() {} }")
+    assert isinstance(leaf, FunctionStmt) and leaf.pooled
+    assert isinstance(outer, FunctionStmt) and not outer.pooled
+    (inner,) = outer.body
+    assert isinstance(inner, FunctionStmt) and inner.pooled
+
+
+def test_calls_reuse_pooled_frames(capsys):
+    statements = resolve(
+        "fun fib(n) { if (n < 2) return n; return fib(n - 2) + fib(n - 1); }"
+        "print fib(15);"
+    )
+    interpreter = Interpreter()
+    interpreter.interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "610\n"
+    # one frame per level of recursion; every other call reuses one
+    assert interpreter.frames_allocated == 15
+    assert interpreter.frames_reused == 1973 - 15
+
+
+def test_captured_frames_are_not_pooled(capsys):
+    statements = resolve(
+        "fun make(n) { fun get() { return n; } return get; }"
+        "var a = make(1); var b = make(2); print a() + b();"
+    )
+    interpreter = Interpreter()
+    interpreter.interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "3\n"
+    # both calls of `make` allocate; the second call of `get` reuses one
+    assert interpreter.frames_allocated == 3
+    assert interpreter.frames_reused == 1
+
+
+def test_tail_calls_reuse_the_frame(capsys):
+    statements = resolve(
+        "fun count(n) { if (n == 0) return n; return count(n - 1); }print count(1000);"
+    )
+    interpreter = Interpreter()
+    interpreter.interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "0\n"
+    assert interpreter.frames_allocated == 1
+    assert interpreter.frames_reused == 1000
+
+
+def test_compile_return_of_call_as_tail_call():
+    chunk = Compiler().compile(parse("fun f(n) { return f(n); }"))
+    (function,) = chunk.constants[:1]
+    code = list(function.chunk.code)
+    assert code[:4] == [OpCode.GET_GLOBAL, 0, OpCode.GET_LOCAL, 1]
+    assert code[4:7] == [OpCode.TAIL_CALL, 1, OpCode.RETURN]
+
+
+def test_compile_closes_captured_locals_at_block_end():
+    chunk = Compiler().compile(parse("{ var a = 1; var b = 2; fun f() { return a; } }"))
+    code = list(chunk.code)
+    assert code[-4:] == [OpCode.POPN, 2, OpCode.CLOSE_UPVALUE, OpCode.RETURN]
+
+
+def test_transpiler_boxes_locals_only_next_to_nested_functions():
+    plain = Transpiler().transpile(parse("fun f(a) { var b = a; return b; }"))
+    assert "_l3 = _l2" in plain.source
+
+    nested = Transpiler().transpile(
+        parse("fun f(a) { fun g() { return a; } return g; }")
+    )
+    assert "_l2 = [_l2]" in nested.source
+    assert "def _f3(_l2=_l2, _l4=_l4):" in nested.source
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+def test_tail_calls_run_in_constant_stack_depth(engine: str, tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text(
+        "fun loop(n, total) {\n"
+        "  if (n == 0) return total;\n"
+        "  return loop(n - 1, total + n);\n"
+        "}\n"
+        "print loop(100000, 0);\n"
+    )
+
+    status = Plox(engine=engine).run_file(script)
+
+    assert capsys.readouterr().out == "5000050000\n"
+    assert status == 0
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+def test_deep_recursion_reports_stack_overflow(engine: str, tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text(
+        "fun deep(n) {\n"
+        "  if (n == 0) return 0;\n"
+        "  return 1 + deep(n - 1);\n"
+        "}\n"
+        "print deep(100000);\n"
+    )
+
+    status = Plox(engine=engine).run_file(script)
+
+    captured = capsys.readouterr()
+    assert captured.err == "Stack overflow.\n[line 3]\n"
+    assert status != 0
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from src.ast_cache import AstCache
+from src.closure_compiler import ClosureCompiler
+from src.constants import EX_SOFTWARE
+from src.interpreter import Interpreter
+from src.plox import Plox
+from src.transpiler import PythonEngine
+from src.vm import VM
+
+
+DATA_DIR = Path(__file__).parent / "data"
+SCRIPTS = sorted(DATA_DIR.glob("*.plox"))
+
+ENGINE_CLASSES = {
+    "tree": Interpreter,
+    "vm": VM,
+    "closure": ClosureCompiler,
+    "python": PythonEngine,
+}
+
+
+@pytest.mark.parametrize("cached", [False, True])
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+def test_each_engine_runs_its_own_interpreter(engine: str, cached: bool, tmp_path):
+    cache = AstCache(tmp_path) if cached else None
+    plox = Plox(engine=engine, cache=cache)
+    assert type(plox._interpreter) is ENGINE_CLASSES[engine]
+
+
+@pytest.mark.parametrize("optimization_level", [0, 1])
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+@pytest.mark.parametrize("script", SCRIPTS, ids=lambda path: path.stem)
+def test_golden_output(script: Path, engine: str, optimization_level: int, capsys):
+    """Every engine prints the expected output for every script."""
+    expected = script.with_suffix(".out").read_text(encoding="utf8")
+
+    plox = Plox(engine=engine, optimization_level=optimization_level)
+    assert type(plox._interpreter) is ENGINE_CLASSES[engine]
+    status = plox.run_file(script)
+
+    assert status == 0
+    assert capsys.readouterr().out == expected
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+def test_closure_does_not_see_later_local(engine: str, tmp_path, capsys):
+    """A closure binds the names it uses where it is declared, so a local
+    declared after it in the same block is not the variable it reads."""
+    script = tmp_path / "late_local.plox"
+    script.write_text("{ fun f() { print a; } var a = 1; f(); }", encoding="utf8")
+
+    status = Plox(engine=engine).run_file(script)
+
+    assert status == EX_SOFTWARE
+    assert "Undefined variable 'a'." in capsys.readouterr().err
@@ -0,0 +1,106 @@
+import pytest
+
+from src.chunk import OpCode
+from src.compiler import Compiler
+from src.expr import AssignExpr, BinaryExpr, LiteralExpr
+from src.interpreter import Interpreter
+from src.optimizer import Optimizer
+from src.parser import Parser
+from src.plox import Plox
+from src.scanner import Scanner
+from src.stmt import BlockStmt, ExpressionStmt, PrintStmt, VarStmt, WhileStmt
+from tests.helpers import dummy_error_reporter, parse, resolve
+
+
+def test_parse_while():
+    (loop,) = parse("while (a < 3) a = a + 1;")
+    assert isinstance(loop, WhileStmt)
+    assert isinstance(loop.condition, BinaryExpr)
+    assert isinstance(loop.body, ExpressionStmt)
+
+
+def test_for_is_desugared_into_while():
+    (outer,) = parse("for (var i = 0; i < 3; i = i + 1) print i;")
+    assert isinstance(outer, BlockStmt)
+    initializer, loop = outer.statements
+    assert isinstance(initializer, VarStmt)
+    assert isinstance(loop, WhileStmt)
+    assert isinstance(loop.body, BlockStmt)
+    body, increment = loop.body.statements
+    assert isinstance(body, PrintStmt)
+    assert isinstance(increment, ExpressionStmt)
+    assert isinstance(increment.expression, AssignExpr)
+
+
+def test_for_clauses_are_optional():
+    (loop,) = parse("for (;;) print 1;")
+    assert isinstance(loop, WhileStmt)
+    assert isinstance(loop.condition, LiteralExpr)
+    assert loop.condition.value is True
+    assert isinstance(loop.body, PrintStmt)
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("while a < 3) print a;", "Expect '(' after 'while'."),
+        ("while (a < 3 print a;", "Expect ')' after condition."),
+        ("for (var i = 0; i < 3) print i;", "Expect ';' after loop condition."),
+        ("for (;; i = i + 1 print i;", "Expect ')' after for clauses."),
+    ],
+)
+def test_loop_syntax_errors(source: str, message: str):
+    errors: list[str] = []
+    tokens = Scanner(source, dummy_error_reporter).scan_tokens()
+    Parser(tokens, lambda token, error: errors.append(error)).parse()
+    assert errors[0] == message
+
+
+def test_iterations_without_declarations_reuse_the_environment(capsys):
+    statements = resolve("for (var i = 0; i < 100; i = i + 1) { i = i + 1; }")
+    interpreter = Interpreter()
+    interpreter.interpret(statements, dummy_error_reporter)
+    # only the block that declares `i`
+    assert interpreter.environments_allocated == 1
+
+
+def test_iterations_with_declarations_get_their_own_environment(capsys):
+    statements = resolve(
+        "var total = 0;"
+        "for (var i = 0; i < 10; i = i + 1) { var square = i * i; total = total + square; }"
+        "print total;"
+    )
+    interpreter = Interpreter()
+    interpreter.interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "285\n"
+    assert interpreter.environments_allocated == 11
+
+
+def test_optimizer_removes_loops_that_never_run():
+    statements = parse("while (false) print 1; while (1 < 2) print 2;")
+    (loop,) = Optimizer().optimize(statements)
+    assert isinstance(loop, WhileStmt)
+    assert isinstance(loop.condition, LiteralExpr)
+
+
+def test_compile_while_jumps_back_to_the_condition():
+    chunk = Compiler().compile(parse("var i = 0; while (i < 3) i = i + 1;"))
+    code = list(chunk.code)
+    loop_start = code.index(OpCode.GET_GLOBAL)
+    back_jump = len(code) - 4
+    assert code[back_jump : back_jump + 2] == [OpCode.JUMP, loop_start]
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+def test_runtime_errors_inside_loops_report_their_line(engine: str, tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text(
+        'for (var i = 0; i < 3; i = i + 1) {\n  print i;\n  if (i == 1) print -"a";\n}\n'
+    )
+
+    status = Plox(engine=engine).run_file(script)
+
+    captured = capsys.readouterr()
+    assert captured.out == "0\n1\n"
+    assert "[line 3]" in captured.err
+    assert status != 0
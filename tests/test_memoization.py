@@ -0,0 +1,143 @@
+import pytest
+from src.interpreter import Interpreter
+from src.memoization import MISSING, MemoCache
+from src.plox import Plox
+from src.purity import PurityAnalysis
+from src.stmt import FunctionStmt, Stmt
+from tests.helpers import dummy_error_reporter, feed_repl, resolve
+
+
+def parse(source: str) -> list[Stmt]:
+    statements = resolve(source)
+    PurityAnalysis().analyze(statements)
+    return statements
+
+
+def memoized(statements: list[Stmt]) -> set[str]:
+    return {
+        statement.name.lexeme
+        for statement in statements
+        if isinstance(statement, FunctionStmt) and statement.memoized
+    }
+
+
+FIB = "fun fib(n) { if (n < 2) return n; return fib(n - 2) + fib(n - 1); }"
+
+
+def test_recursive_function_of_its_parameters_is_pure():
+    statements = parse(
+        FIB + "fun choose(n, k) {"
+        "  if (k == 0 or k == n) return 1;"
+        "  var left = choose(n - 1, k - 1);"
+        "  return left + choose(n - 1, k);"
+        "}"
+    )
+    assert memoized(statements) == {"fib", "choose"}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "fun f(n) { print n; return n; }",
+        "var total = 0; fun f(n) { total = total + n; return total; }",
+        "var scale = 2; fun f(n) { return n * scale; }",
+        "fun f() { return clock(); }",
+        "fun f(n) { fun g() { return n; } return g; }",
+        "fun f(g) { return g(1); }",
+        "fun f(n) { return f; }",
+        "fun f(n) { return n; } f = nil;",
+        "fun f(n) { return n; } fun f(n) { return -n; }",
+        "fun f(n) { return n; } var f = 1;",
+        "{ fun f(n) { return n; } }",
+    ],
+)
+def test_impure_functions_are_not_memoized(source: str):
+    assert memoized(parse(source)) == set()
+
+
+def test_calling_an_impure_function_is_impure():
+    statements = parse(
+        "fun shout(n) { print n; return n; }"
+        "fun relay(n) { return shout(n); }"
+        "fun outer(n) { return relay(n) + 1; }"
+        "fun leaf(n) { return n + 1; }"
+    )
+    assert memoized(statements) == {"leaf"}
+
+
+def test_memoized_calls_run_once_per_argument(capsys):
+    interpreter = Interpreter()
+    interpreter.interpret(parse(FIB + "print fib(60);"), dummy_error_reporter)
+    assert capsys.readouterr().out == "1548008755920\n"
+
+    stats = interpreter.memo_stats()
+    assert stats.misses == 61
+    assert stats.hits == 58
+    assert stats.entries == 61
+
+
+def test_keys_distinguish_booleans_from_numbers(capsys):
+    interpreter = Interpreter()
+    statements = parse("fun same(x) { return x; } print same(1); print same(true);")
+    interpreter.interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "1\nTrue\n"
+
+
+def test_keys_distinguish_negative_zero(tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text("fun id(x) { return x; } print id(0); print id(-0);")
+
+    Plox(memoize=True).run_file(script)
+
+    assert capsys.readouterr().out == "0\n-0\n"
+
+
+def test_least_recently_used_results_are_evicted(monkeypatch):
+    monkeypatch.setattr(MemoCache, "MAX_SIZE", 2)
+    memo = MemoCache("f")
+    for argument in (1.0, 2.0):
+        memo.store(MemoCache.key([argument]), argument)
+    memo.get(MemoCache.key([1.0]))
+    memo.store(MemoCache.key([3.0]), 3.0)
+
+    assert memo.evictions == 1
+    assert memo.get(MemoCache.key([2.0])) is MISSING
+    assert memo.get(MemoCache.key([1.0])) == 1.0
+
+
+def test_redefining_a_memoized_function_clears_the_caches(capsys):
+    interpreter = Interpreter()
+    interpreter.interpret(
+        parse("fun g(n) { return n; } fun f(n) { return g(n); } print f(1);"),
+        dummy_error_reporter,
+    )
+    interpreter.interpret(
+        parse("fun g(n) { return n + 10; } print f(1);"), dummy_error_reporter
+    )
+    assert capsys.readouterr().out == "1\n11\n"
+
+
+def test_redefining_a_function_stops_memoizing_its_callers(monkeypatch, capsys):
+    feed_repl(
+        monkeypatch,
+        [
+            "fun g() { return 1; } fun f() { return g(); }",
+            'fun g() { print "side effect"; return 2; }',
+            "print f(); print f();",
+        ],
+    )
+    Plox(memoize=True).run_prompt()
+
+    assert capsys.readouterr().out == "side effect\n2\nside effect\n2\n\n"
+
+
+def test_stats_flag_reports_the_caches(tmp_path, capsys):
+    script = tmp_path / "script.plox"
+    script.write_text(FIB + "print fib(20);")
+
+    status = Plox(memoize=True, stats=True).run_file(script)
+
+    captured = capsys.readouterr()
+    assert status == 0
+    assert captured.out == "6765\n"
+    assert "memo fib: 21 entries, 18 hits, 21 misses, 0 evictions" in captured.err
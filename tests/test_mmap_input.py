@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from src.constants import EX_SOFTWARE
+from src.plox import Plox
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def always_mmap(monkeypatch):
+    monkeypatch.setattr(Plox, "MMAP_THRESHOLD", 1)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize(
+    "script", sorted(DATA_DIR.glob("*.plox")), ids=lambda path: path.stem
+)
+def test_mapped_file_matches_golden_output(script, streaming, always_mmap, capsys):
+    expected = script.with_suffix(".out").read_text(encoding="utf8")
+
+    status = Plox(streaming=streaming).run_file(script)
+
+    assert status == 0
+    assert capsys.readouterr().out == expected
+
+
+def test_mapped_file_decodes_lexemes(tmp_path, always_mmap, capsys):
+    path = tmp_path / "script.plox"
+    path.write_text(
+        'var ünï = "é";\nprint ünï + "ü";\n\nprint -ünï;\n', encoding="utf8"
+    )
+
+    status = Plox().run_file(path)
+
+    captured = capsys.readouterr()
+    assert status == EX_SOFTWARE
+    assert captured.out == "éü\n"
+    assert captured.err == "Operand must be a number.\n[line 4]\n"
+
+
+def test_empty_file_is_not_mapped(tmp_path, always_mmap, capsys):
+    path = tmp_path / "empty.plox"
+    path.write_text("", encoding="utf8")
+
+    assert Plox().run_file(path) == 0
@@ -0,0 +1,120 @@
+from src.exceptions import PloxRuntimeError
+from src.expr import BinaryExpr, LiteralExpr, VariableExpr
+from src.interpreter import Interpreter
+from src.optimizer import Optimizer
+from src.plox import Plox
+from src.resolver import Resolver
+from src.stmt import (
+    BlockStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    PrintStmt,
+    Stmt,
+    VarStmt,
+)
+from tests.helpers import feed_repl, parse
+
+
+def optimize(source: str, whole_program: bool = True) -> list[Stmt]:
+    return Optimizer(whole_program).optimize(parse(source))
+
+
+def printed(stmt: Stmt) -> object:
+    assert isinstance(stmt, PrintStmt)
+    return stmt.expression
+
+
+def test_fold_arithmetic():
+    (stmt,) = optimize("print (1 + 2) * -3;")
+    expr = printed(stmt)
+    assert isinstance(expr, LiteralExpr)
+    assert expr.value == -9.0
+
+
+def test_fold_strings_and_comparisons():
+    first, second = optimize('print "a" + "b"; print !(1 < 2) == false;')
+    assert isinstance(printed(first), LiteralExpr)
+    assert printed(first).value == "ab"  # type: ignore[attr-defined]
+    assert printed(second).value is True  # type: ignore[attr-defined]
+
+
+def test_fold_logical_with_constant_left():
+    first, second = optimize("print nil or x; print 1 and 2;")
+    assert isinstance(printed(first), VariableExpr)
+    assert printed(second).value == 2.0  # type: ignore[attr-defined]
+
+
+def test_failing_expression_is_not_folded():
+    statements = optimize('print 1;\nprint "a" - 1;')
+    assert isinstance(printed(statements[1]), BinaryExpr)
+
+    Resolver().resolve(statements)
+    errors: list[PloxRuntimeError] = []
+    Interpreter().interpret(statements, errors.append)
+    assert errors[0].message == "Operands must be numbers."
+    assert errors[0].token.line == 2
+
+
+def test_propagate_constant_variable():
+    _, stmt = optimize("var a = 2 * 3; print a + 1;")
+    assert printed(stmt).value == 7.0  # type: ignore[attr-defined]
+
+
+def test_reassigned_variable_is_not_propagated():
+    _, stmt, _ = optimize("var a = 1; print a; a = 2;")
+    assert isinstance(printed(stmt), VariableExpr)
+
+
+def test_redeclared_variable_is_not_propagated():
+    _, block = optimize("var a = 1; { var a = 2; print a; }")
+    assert isinstance(block, BlockStmt)
+    assert isinstance(printed(block.statements[1]), VariableExpr)
+
+
+def test_use_before_declaration_is_not_propagated():
+    stmt, _ = optimize("print a; var a = 1;")
+    assert isinstance(printed(stmt), VariableExpr)
+
+
+def test_constant_out_of_scope_is_not_propagated():
+    _, stmt = optimize("{ var a = 1; } print a;")
+    assert isinstance(printed(stmt), VariableExpr)
+
+
+def test_global_is_not_propagated_into_function_of_partial_program():
+    _, function, stmt = optimize("var a = 1; fun f() { print a; } print a;", False)
+    assert isinstance(function, FunctionStmt)
+    assert isinstance(printed(function.body[0]), VariableExpr)
+    # top-level code runs before a later program can redeclare the global
+    assert isinstance(printed(stmt), LiteralExpr)
+
+
+def test_repl_function_reads_global_redeclared_by_later_line(monkeypatch, capsys):
+    feed_repl(
+        monkeypatch, ["var a = 1; fun f() { return -a; }", 'var a = "s"; print f();']
+    )
+    Plox(optimization_level=1).run_prompt()
+
+    assert capsys.readouterr().err == "Operand must be a number.\n[line 1]\n"
+
+
+def test_prune_constant_if():
+    statements = optimize(
+        'var debug = false; if (debug) print "debug"; if (!debug) print "release";'
+        ' if (debug) print "x"; else { print "y"; }'
+    )
+    assert isinstance(statements[0], VarStmt)
+    assert printed(statements[1]).value == "release"  # type: ignore[attr-defined]
+    assert isinstance(statements[2], BlockStmt)
+    assert len(statements) == 3
+
+
+def test_pruned_nested_if_leaves_empty_block():
+    (stmt,) = optimize("if (x) if (false) print 1;")
+    assert isinstance(stmt.then_branch, BlockStmt)  # type: ignore[attr-defined]
+    assert stmt.then_branch.statements == []  # type: ignore[attr-defined]
+
+
+def test_expression_statement_is_kept():
+    (stmt,) = optimize("1 + 2;")
+    assert isinstance(stmt, ExpressionStmt)
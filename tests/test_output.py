@@ -0,0 +1,141 @@
+import io
+import sys
+
+import pytest
+
+from src.constants import EX_SOFTWARE
+from src.interpreter import Interpreter
+from src.output import BufferedSink, CaptureSink, LineBufferedSink
+from src.plox import Plox
+from tests.helpers import resolve
+
+
+class RecordingStream(io.StringIO):
+    """A text stream that records its write and flush calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def write(self, text: str) -> int:
+        self.calls.append(f"write {text!r}")
+        return super().write(text)
+
+    def flush(self) -> None:
+        self.calls.append("flush")
+
+
+def test_buffered_sink_writes_in_batches():
+    stream = RecordingStream()
+    sink = BufferedSink(stream, threshold=6)
+    for text in ("a", "b", "c", "d"):
+        sink.write_line(text)
+    assert stream.calls == ["write 'a\\nb\\nc\\n'"]
+
+    sink.flush()
+    assert stream.calls[1:] == ["write 'd\\n'", "flush"]
+    assert stream.getvalue() == "a\nb\nc\nd\n"
+
+
+def test_buffered_sink_defaults_to_current_stdout(capsys):
+    sink = BufferedSink()
+    sink.write_line("hello")
+    assert capsys.readouterr().out == ""
+    sink.flush()
+    assert capsys.readouterr().out == "hello\n"
+
+
+def test_line_buffered_sink_flushes_every_line():
+    stream = RecordingStream()
+    sink = LineBufferedSink(stream)
+    sink.write_line("a")
+    sink.write_line("b")
+    assert stream.calls == ["write 'a\\n'", "flush", "write 'b\\n'", "flush"]
+
+
+def test_capture_sink():
+    sink = CaptureSink()
+    Interpreter(sink).interpret(resolve('print 1; print "two"; print nil;'), print)
+    assert sink.lines == ["1", "two", "nil"]
+    assert sink.getvalue() == "1\ntwo\nnil\n"
+
+
+def test_interpret_flushes_when_done():
+    stream = RecordingStream()
+    interpreter = Interpreter(BufferedSink(stream))
+    interpreter.interpret(resolve("print 1; print 2;"), print)
+    assert stream.getvalue() == "1\n2\n"
+    assert stream.calls == ["write '1\\n2\\n'", "flush"]
+
+
+def test_output_is_flushed_before_runtime_errors(tmp_path, monkeypatch):
+    script = tmp_path / "script.plox"
+    script.write_text('print 1;\nprint 2;\nprint -"a";\nprint 3;\n')
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", stream)
+
+    status = Plox(output=BufferedSink(stream)).run_file(script)
+
+    assert status == EX_SOFTWARE
+    assert stream.getvalue() == "1\n2\nOperand must be a number.\n[line 3]\n"
+
+
+def test_streaming_flushes_once_when_the_stream_ends(tmp_path):
+    script = tmp_path / "script.plox"
+    script.write_text("print 1;\nprint 2;\nvar a = 3;\nprint a;\n")
+    stream = RecordingStream()
+
+    Plox(streaming=True, output=BufferedSink(stream)).run_file(script)
+
+    assert stream.calls == ["write '1\\n2\\n3\\n'", "flush"]
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        (
+            'print 1;\nprint 2;\nprint -"a";\nprint 3;\n',
+            "1\n2\nOperand must be a number.\n[line 3]\n",
+        ),
+        (
+            "print 1;\nprint 2 +;\nprint 3;\n",
+            "1\n[line 2 Error at ';' : Expect expression.]\n",
+        ),
+    ],
+)
+def test_streaming_flushes_before_errors(
+    source: str, expected: str, tmp_path, monkeypatch
+):
+    script = tmp_path / "script.plox"
+    script.write_text(source)
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", stream)
+
+    Plox(streaming=True, output=BufferedSink(stream)).run_file(script)
+
+    assert stream.getvalue() == expected
+
+
+def test_repl_output_is_line_buffered(monkeypatch):
+    stream = RecordingStream()
+    lines = iter(["print 1; print 2;"])
+
+    def read_line(prompt: str) -> str:
+        stream.calls.append("input")
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError from None
+
+    monkeypatch.setattr("builtins.input", read_line)
+    monkeypatch.setattr(sys, "stdout", stream)
+    Plox().run_prompt()
+
+    assert stream.calls[:6] == [
+        "input",
+        "write '1\\n'",
+        "flush",
+        "write '2\\n'",
+        "flush",
+        "input",
+    ]
@@ -0,0 +1,93 @@
+import random
+import sys
+
+import pytest
+
+from src.ast_printer import AstPrinter
+from src.parser import Parser
+from src.pratt_parser import PrattParser
+from src.scanner import Scanner
+from src.stmt import ExpressionStmt
+from tests.helpers import dummy_error_reporter
+
+
+def parse_expressions(parser_class: type[Parser], source: str) -> tuple[list, list]:
+    """Parses expression statements, returning printed trees and errors."""
+    errors: list[tuple[str, str]] = []
+    tokens = Scanner(source, dummy_error_reporter).scan_tokens()
+    statements = parser_class(
+        tokens, lambda token, message: errors.append((token.lexeme, message))
+    ).parse()
+    printer = AstPrinter()
+    printed = [
+        printer.print(stmt.expression)
+        for stmt in statements
+        if isinstance(stmt, ExpressionStmt)
+    ]
+    return printed, errors
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "1 + 2 * 3 - 4 / 5;",
+        "a = b = c or d and e;",
+        "-a * !b == c != (d > e) >= f < g <= h;",
+        "!!-(-1);",
+        "a or b or c and d and e;",
+        '"s" + nil + true + false;',
+        "1 = 2; a + b = c; (a) = 1;",
+        "1 +; (2; * 3; a = ;",
+        "f(1, g(2) + 3)(4) * -h() + (i)(j);",
+        "f(1, ; g(; h(1 2);",
+        "f(a = 1, g(h(2), -i)).x(3)(j or k);",
+        "f(" + ", ".join(["1"] * 256) + ");",
+    ],
+)
+def test_same_trees_as_recursive_descent(source: str):
+    assert parse_expressions(PrattParser, source) == parse_expressions(Parser, source)
+
+
+def test_same_trees_on_random_expressions():
+    rng = random.Random(16)
+    atoms = ["1", "x", "nil", "true", '"s"', "(", ")", "-", "!"]
+    operators = [
+        *("+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">=", "and", "or", "="),
+        ",",
+    ]
+    for _ in range(500):
+        parts = [rng.choice(atoms)]
+        for _ in range(rng.randint(0, 12)):
+            parts.append(rng.choice(operators + atoms))
+        source = " ".join(parts) + ";"
+        expected = parse_expressions(Parser, source)
+        assert parse_expressions(PrattParser, source) == expected, source
+
+
+def max_stack_depth(parser_class: type[Parser], source: str) -> int:
+    tokens = Scanner(source, dummy_error_reporter).scan_tokens()
+    parser = parser_class(tokens, dummy_error_reporter)
+    depth = 0
+    deepest = 0
+
+    def profile(frame, event, arg):
+        nonlocal depth, deepest
+        if event == "call":
+            depth += 1
+            deepest = max(deepest, depth)
+        elif event == "return":
+            depth -= 1
+
+    sys.setprofile(profile)
+    try:
+        parser.parse()
+    finally:
+        sys.setprofile(None)
+    return deepest
+
+
+def test_uses_fewer_frames_for_nested_expressions():
+    source = "(" * 20 + "1" + ")" * 20 + ";"
+    pratt = max_stack_depth(PrattParser, source)
+    recursive = max_stack_depth(Parser, source)
+    assert pratt * 3 < recursive
@@ -0,0 +1,92 @@
+from src.expr import BinaryExpr
+from src.interpreter import Interpreter
+from src.quickening import BinarySpecialization
+from src.stmt import ExpressionStmt, Stmt
+from src.token_type import TokenType
+from tests.helpers import dummy_error_reporter, resolve
+
+
+def binary(stmt: Stmt) -> BinaryExpr:
+    assert isinstance(stmt, ExpressionStmt)
+    assert isinstance(stmt.expression, BinaryExpr)
+    return stmt.expression
+
+
+def test_first_evaluation_installs_number_fast_path():
+    interpreter = Interpreter()
+    statements = resolve("var a = 1; a + 2;")
+    interpreter.interpret(statements, dummy_error_reporter)
+
+    specialization = binary(statements[1]).specialization
+    assert specialization is not None
+    assert specialization.kind == "number"
+    assert specialization.generic == 1
+    assert specialization.hits == 0
+
+
+def test_repeated_evaluation_hits_fast_path():
+    interpreter = Interpreter()
+    statements = resolve('var a = "x"; a + "y";')
+    interpreter.interpret(statements, dummy_error_reporter)
+    interpreter.interpret(statements[1:], dummy_error_reporter)
+    interpreter.interpret(statements[1:], dummy_error_reporter)
+
+    specialization = binary(statements[1]).specialization
+    assert specialization is not None
+    assert specialization.kind == "string"
+    assert specialization.hits == 2
+
+
+def test_type_change_deoptimizes(capsys):
+    interpreter = Interpreter()
+    interpreter.interpret(resolve("var a = 1; var b = 2;"), dummy_error_reporter)
+    (stmt,) = resolve("print a + b;")
+    interpreter.interpret([stmt], dummy_error_reporter)
+    interpreter.interpret(resolve('a = "x"; b = "y";'), dummy_error_reporter)
+    interpreter.interpret([stmt], dummy_error_reporter)
+    interpreter.interpret([stmt], dummy_error_reporter)
+
+    assert capsys.readouterr().out == "3\nxy\nxy\n"
+    stats = interpreter.specialization_stats()
+    assert stats.nodes == 1
+    assert stats.misses == 1
+    assert stats.deopts == 1
+    assert stats.hits == 1
+    assert stats.specialized == 1
+
+
+def test_node_stays_generic_after_max_deopts():
+    specialization = BinarySpecialization()
+    for _ in range(BinarySpecialization.MAX_DEOPTS):
+        specialization.record(TokenType.PLUS, 1.0, 2.0)
+        assert specialization.kind == "number"
+        specialization.deoptimize()
+    specialization.record(TokenType.PLUS, 1.0, 2.0)
+    assert specialization.kind == "generic"
+
+
+def test_booleans_are_not_specialized():
+    specialization = BinarySpecialization()
+    specialization.record(TokenType.EQUAL_EQUAL, True, 1.0)
+    assert specialization.kind == "generic"
+
+
+def test_errors_still_raised_after_specialization():
+    interpreter = Interpreter()
+    interpreter.interpret(resolve("var a = 1;"), dummy_error_reporter)
+    (stmt,) = resolve("a - 1;")
+    interpreter.interpret([stmt], dummy_error_reporter)
+    interpreter.interpret(resolve('a = "s";'), dummy_error_reporter)
+
+    errors = []
+    interpreter.interpret([stmt], errors.append)
+    assert errors[0].message == "Operands must be numbers."
+
+
+def test_hit_rate():
+    interpreter = Interpreter()
+    statements = resolve("var a = 1; a * 2;")
+    interpreter.interpret(statements, dummy_error_reporter)
+    for _ in range(3):
+        interpreter.interpret(statements[1:], dummy_error_reporter)
+    assert interpreter.specialization_stats().hit_rate == 0.75
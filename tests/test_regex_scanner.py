@@ -0,0 +1,120 @@
+import mmap
+import random
+from pathlib import Path
+
+import pytest
+
+from src.regex_scanner import RegexScanner
+from src.scanner import Scanner
+from src.token import Token
+from src.token_type import TokenType
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def scan_both(source: str) -> tuple[list, list]:
+    """Scans with both scanners, returning (tokens, errors) for each."""
+    results = []
+    for scanner_class in (Scanner, RegexScanner):
+        errors: list[tuple[int, str]] = []
+        reporter = lambda line, message: errors.append((line, message))  # noqa: E731
+        tokens = scanner_class(source, reporter).scan_tokens()
+        results.append((tokens, errors))
+    return results[0], results[1]
+
+
+def test_scan_simple_statement():
+    tokens = RegexScanner("var x = 25;", lambda line, message: None).scan_tokens()
+    assert tokens == [
+        Token(TokenType.VAR, "var", None, 1),
+        Token(TokenType.IDENTIFIER, "x", None, 1),
+        Token(TokenType.EQUAL, "=", None, 1),
+        Token(TokenType.NUMBER, "25", 25.0, 1),
+        Token(TokenType.SEMICOLON, ";", None, 1),
+        Token(TokenType.EOF, "", None, 1),
+    ]
+
+
+def test_multiline_string_reports_closing_line():
+    tokens = RegexScanner('"a\nb"\nx', lambda line, message: None).scan_tokens()
+    assert tokens[0] == Token(TokenType.STRING, '"a\nb"', "a\nb", 2)
+    assert tokens[1] == Token(TokenType.IDENTIFIER, "x", None, 3)
+
+
+def test_errors():
+    errors: list[tuple[int, str]] = []
+    RegexScanner('a # b\n"open\n', lambda *error: errors.append(error)).scan_tokens()
+    assert errors == [(1, "Unexpected character."), (3, "Unterminated string.")]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        "// only a comment",
+        "a/b //c\n/",
+        "1.5 1. .5 1.2.3",
+        "!= == <= >= ! = < >",
+        "and class else false for fun if nil or print return super this true var while",
+        "ünïcode_names é1 x٣ 1.٣ ٣٣",
+        "\r\n\t \f",
+        '"unterminated\nstring',
+    ],
+)
+def test_matches_scanner(source: str):
+    expected, actual = scan_both(source)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("script", sorted(DATA_DIR.glob("*.plox")), ids=str)
+def test_matches_scanner_on_scripts(script: Path):
+    expected, actual = scan_both(script.read_text(encoding="utf8"))
+    assert actual == expected
+
+
+def test_matches_scanner_on_random_input():
+    rng = random.Random(1234)
+    alphabet = list('abXY_09 \t\r\n"/.=!<>(){},;+-*#') + ["é", "٣", "var", "1.5"]
+    for _ in range(2000):
+        source = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        expected, actual = scan_both(source)
+        assert actual == expected, source
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        'var ünï = "é\nü";\nprint ünï + 1.٣;',
+        '€ x\n٣٣.٣ 𝔘1 //é\n"open é',
+        "a" * 300 + "é" + "b" * 300,
+    ],
+)
+def test_bytes_source_matches_scanner(source: str):
+    expected, _ = scan_both(source)
+    errors: list[tuple[int, str]] = []
+    tokens = RegexScanner(
+        source.encode("utf8"), lambda *error: errors.append(error)
+    ).scan_tokens()
+    assert (tokens, errors) == expected
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        'var ünï = "é\nü";\nprint ünï + 1.٣;',
+        '€ x\n\n\n٣٣.٣ 𝔘1 //é\n"open é',
+        "print 1;\n" * 50 + "é\n" + "print 2;\n" * 50,
+    ],
+)
+def test_mapped_source_matches_scanner(source: str, tmp_path):
+    expected, _ = scan_both(source)
+    path = tmp_path / "script.plox"
+    path.write_bytes(source.encode("utf8"))
+    errors: list[tuple[int, str]] = []
+    with (
+        path.open("rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        tokens = RegexScanner(mapped, lambda *error: errors.append(error)).scan_tokens()
+    assert (tokens, errors) == expected
@@ -0,0 +1,104 @@
+from src.environment import Environment
+from src.exceptions import PloxRuntimeError
+from src.expr import AssignExpr, VariableExpr
+from src.interpreter import Interpreter
+from src.stmt import BlockStmt, ExpressionStmt, PrintStmt, VarStmt
+from tests.helpers import dummy_error_reporter, resolve
+
+
+def test_globals_stay_unresolved():
+    var, stmt = resolve("var a = 1; print a;")
+    assert isinstance(var, VarStmt) and var.slot is None
+    assert isinstance(stmt, PrintStmt)
+    assert isinstance(stmt.expression, VariableExpr)
+    assert stmt.expression.location is None
+
+
+def test_block_variables_get_slots():
+    (block,) = resolve("{ var a = 1; var b = 2; print b; }")
+    assert isinstance(block, BlockStmt)
+    a, b, stmt = block.statements
+    assert isinstance(a, VarStmt) and a.slot == 0
+    assert isinstance(b, VarStmt) and b.slot == 1
+    assert isinstance(stmt, PrintStmt)
+    assert isinstance(stmt.expression, VariableExpr)
+    assert stmt.expression.location == (0, 1)
+
+
+def test_depth_counts_enclosing_blocks():
+    (outer,) = resolve("{ var a = 1; { var b; { var c; a = 2; } } }")
+    assert isinstance(outer, BlockStmt)
+    middle = outer.statements[1]
+    assert isinstance(middle, BlockStmt)
+    inner = middle.statements[1]
+    assert isinstance(inner, BlockStmt)
+    stmt = inner.statements[1]
+    assert isinstance(stmt, ExpressionStmt)
+    assert isinstance(stmt.expression, AssignExpr)
+    assert stmt.expression.location == (2, 0)
+
+
+def test_initializer_sees_outer_variable():
+    (outer,) = resolve("{ var a = 1; { var a = a; } }")
+    assert isinstance(outer, BlockStmt)
+    inner = outer.statements[1]
+    assert isinstance(inner, BlockStmt)
+    var = inner.statements[0]
+    assert isinstance(var, VarStmt) and var.slot == 0
+    assert isinstance(var.initializer, VariableExpr)
+    assert var.initializer.location == (1, 0)
+
+
+def test_redeclaration_reuses_slot():
+    (block,) = resolve("{ var a = 1; var a = 2; }")
+    assert isinstance(block, BlockStmt)
+    assert [stmt.slot for stmt in block.statements] == [0, 0]  # type: ignore[attr-defined]
+
+
+def test_environment_slots():
+    outer = Environment()
+    outer.define_at(0, "a")
+    inner = Environment(outer)
+    inner.define_at(0, "b")
+    inner.assign_at(1, 0, "c")
+    assert inner.get_at(0, 0) == "b"
+    assert inner.get_at(1, 0) == "c"
+
+
+def test_interpret_resolved_program(capsys):
+    statements = resolve(
+        'var a = "global"; { var b = "outer"; { var a = "inner"; print a; print b; } '
+        'b = "changed"; print b; } print a;'
+    )
+    Interpreter().interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "inner\nouter\nchanged\nglobal\n"
+
+
+def test_undefined_variable_message_unchanged():
+    errors: list[PloxRuntimeError] = []
+    Interpreter().interpret(resolve("{ { print missing; } }"), errors.append)
+    assert errors[0].message == "Undefined variable 'missing'."
+
+
+def test_declaration_free_blocks_are_elided():
+    (outer,) = resolve("{ var a = 1; { { a = 2; } } }")
+    assert isinstance(outer, BlockStmt) and not outer.elided
+    middle = outer.statements[1]
+    assert isinstance(middle, BlockStmt) and middle.elided
+    inner = middle.statements[0]
+    assert isinstance(inner, BlockStmt) and inner.elided
+    stmt = inner.statements[0]
+    assert isinstance(stmt, ExpressionStmt)
+    assert isinstance(stmt.expression, AssignExpr)
+    assert stmt.expression.location == (0, 0)
+
+
+def test_interpreter_counts_elided_environments(capsys):
+    statements = resolve(
+        "var a = 1; if (a == 1) { print a; } { var b = 2; { { print a + b; } } }"
+    )
+    interpreter = Interpreter()
+    interpreter.interpret(statements, dummy_error_reporter)
+    assert capsys.readouterr().out == "1\n3\n"
+    assert interpreter.environments_allocated == 1
+    assert interpreter.environments_elided == 3
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from src.constants import EX_DATAERR, EX_SOFTWARE
+from src.parser import Parser
+from src.plox import Plox
+from src.regex_scanner import RegexScanner
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def write_script(tmp_path: Path, source: str) -> Path:
+    path = tmp_path / "script.plox"
+    path.write_text(source, encoding="utf8")
+    return path
+
+
+@pytest.mark.parametrize("engine", Plox.ENGINES)
+@pytest.mark.parametrize(
+    "script", sorted(DATA_DIR.glob("*.plox")), ids=lambda path: path.stem
+)
+def test_streaming_matches_golden_output(script: Path, engine: str, capsys):
+    expected = script.with_suffix(".out").read_text(encoding="utf8")
+
+    plox = Plox(engine=engine, optimization_level=1, streaming=True)
+    status = plox.run_file(script)
+
+    assert status == 0
+    assert capsys.readouterr().out == expected
+
+
+def test_declarations_are_yielded_as_parsed():
+    errors: list[str] = []
+    parser = Parser.streaming(
+        RegexScanner("print 1; print 2 +; print 3;", lambda *e: None).stream_tokens(),
+        lambda token, message: errors.append(message),
+    )
+    declarations = parser.declarations()
+    next(declarations)
+    assert errors == []
+    next(declarations)
+    assert errors == ["Expect expression."]
+
+
+def test_streaming_runs_declarations_before_a_syntax_error(tmp_path, capsys):
+    path = write_script(tmp_path, "print 1;\nprint 2 +;\nprint 3;\nprint (;\n")
+
+    status = Plox(streaming=True).run_file(path)
+
+    captured = capsys.readouterr()
+    assert status == EX_DATAERR
+    assert captured.out == "1\n"
+    # parsing goes on after the first error so that every error is reported
+    assert captured.err.count("Expect expression.") == 2
+
+
+def test_strict_streaming_runs_nothing_on_a_syntax_error(tmp_path, capsys):
+    path = write_script(tmp_path, "print 1;\nprint 2 +;\nprint 3;\n")
+
+    status = Plox(streaming=True, strict=True).run_file(path)
+
+    captured = capsys.readouterr()
+    assert status == EX_DATAERR
+    assert captured.out == ""
+    assert "[line 2 Error at ';' : Expect expression.]" in captured.err
+
+
+def test_streaming_stops_at_a_runtime_error(tmp_path, capsys):
+    path = write_script(tmp_path, 'print 1;\nprint -"x";\nprint 3;\n')
+
+    status = Plox(streaming=True).run_file(path)
+
+    captured = capsys.readouterr()
+    assert status == EX_SOFTWARE
+    assert captured.out == "1\n"
+    assert captured.err == "Operand must be a number.\n[line 2]\n"
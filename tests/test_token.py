@@ -57,3 +57,13 @@ def test_token_equality_different_type():
 
     # Ensure == returns False (not just != returning True)
     assert not (token == "apples")
+
+
+def test_token_types_compare_by_identity_and_hash():
+    """Token types can be used as dictionary keys and set members."""
+    assert TokenType.PLUS == TokenType.PLUS
+    assert TokenType.PLUS != TokenType.MINUS
+    assert TokenType.PLUS != "PLUS"
+    table = {TokenType.PLUS: "+", TokenType.MINUS: "-"}
+    assert table[TokenType.PLUS] == "+"
+    assert TokenType.MINUS in frozenset({TokenType.MINUS})
@@ -0,0 +1,47 @@
+from src.regex_scanner import RegexScanner
+from src.scanner import Scanner
+from src.token import Token
+from src.token_buffer import TokenBuffer
+from src.token_type import TokenType
+from tests.helpers import dummy_error_reporter
+
+
+def test_views_match_scanner_tokens():
+    source = 'var name = "multi\nline";\n// comment\nprint name + 1.5 >= 2;\n'
+    expected = Scanner(source, dummy_error_reporter).scan_tokens()
+    buffer = RegexScanner(source, dummy_error_reporter).scan_buffer()
+    assert len(buffer) == len(expected)
+    assert list(buffer) == expected
+
+
+def test_lexemes_and_literals_are_sliced_from_source():
+    buffer = TokenBuffer('x "str" 12.5')
+    buffer.append(TokenType.IDENTIFIER, 0, 1)
+    buffer.append(TokenType.STRING, 2, 7)
+    buffer.append(TokenType.NUMBER, 8, 12)
+    assert buffer[0] == Token(TokenType.IDENTIFIER, "x", None, 1)
+    assert buffer[1] == Token(TokenType.STRING, '"str"', "str", 1)
+    assert buffer[2] == Token(TokenType.NUMBER, "12.5", 12.5, 1)
+    assert buffer.type(2) is TokenType.NUMBER
+
+
+def test_identifier_lexemes_are_shared():
+    source = "alpha + alpha;"
+    buffer = RegexScanner(source, dummy_error_reporter).scan_buffer()
+    assert buffer.lexeme(0) is buffer.lexeme(2)
+
+
+def test_lines_come_from_newline_table():
+    buffer = TokenBuffer("a\n\nb\n")
+    buffer.append(TokenType.IDENTIFIER, 0, 1)
+    buffer.append(TokenType.IDENTIFIER, 3, 4)
+    buffer.append(TokenType.EOF, 5, 5)
+    assert [buffer.line(index) for index in range(3)] == [1, 3, 4]
+    assert buffer.line_at(2) == 2
+
+
+def test_buffer_is_smaller_than_token_list():
+    source = "var a = 1; print a + 2;\n" * 200
+    buffer = RegexScanner(source, dummy_error_reporter).scan_buffer()
+    # a Token object alone is larger than a whole buffered token
+    assert buffer.nbytes < len(buffer) * 16
@@ -0,0 +1,58 @@
+import pytest
+
+from src.parser import Parser
+from src.regex_scanner import RegexScanner
+from src.token import Token
+from src.token_stream import TokenStream
+from src.token_type import TokenType
+from tests.helpers import dummy_error_reporter, same_tree
+
+
+def test_stream_tokens_match_scan_tokens():
+    source = 'var a = "multi\nline";\n{ print a + 1.5 # 2; }\n"open'
+    errors: list[tuple[int, str]] = []
+    streamed_errors: list[tuple[int, str]] = []
+    tokens = RegexScanner(source, lambda *e: errors.append(e)).scan_tokens()
+    streamed = RegexScanner(source, lambda *e: streamed_errors.append(e))
+    assert list(streamed.stream_tokens()) == tokens
+    assert streamed_errors == errors
+
+
+def test_stream_tokens_is_lazy():
+    tokens = RegexScanner("a b", dummy_error_reporter).stream_tokens()
+    assert next(tokens) == Token(TokenType.IDENTIFIER, "a", None, 1)
+
+
+def test_token_stream_keeps_a_bounded_window():
+    eof = Token(TokenType.EOF, "", None, 1)
+    tokens = [Token(TokenType.IDENTIFIER, str(i), None, 1) for i in range(10)]
+    stream = TokenStream(tokens + [eof], size=4)
+    assert stream[5].lexeme == "5"
+    assert stream[2].lexeme == "2"
+    with pytest.raises(IndexError):
+        stream[1]
+    # the EOF token repeats past the end of the input
+    assert stream[20] is eof
+
+
+def test_streaming_parser_builds_the_same_statements():
+    source = "var a = 1; { var b = a * (2 + 3); print b >= 4 and !nil; } a = -a;"
+    parsed = Parser(
+        RegexScanner(source, dummy_error_reporter).scan_tokens(), dummy_error_reporter
+    ).parse()
+    streamed = Parser.streaming(
+        RegexScanner(source, dummy_error_reporter).stream_tokens(),
+        dummy_error_reporter,
+    ).parse()
+    assert same_tree(streamed, parsed)
+
+
+def test_streaming_parser_reports_errors():
+    errors: list[tuple[Token, str]] = []
+    Parser.streaming(
+        RegexScanner("print 1 +; print 2;", dummy_error_reporter).stream_tokens(),
+        lambda token, message: errors.append((token, message)),
+    ).parse()
+    assert [(token.lexeme, message) for token, message in errors] == [
+        (";", "Expect expression.")
+    ]
@@ -0,0 +1,130 @@
+from src.exceptions import PloxRuntimeError
+from src.stmt import Stmt
+from src.transpiler import ProgramCache, PythonEngine, Transpiler
+from tests.helpers import dummy_error_reporter, parse
+
+
+def run(source: str) -> list[PloxRuntimeError]:
+    errors: list[PloxRuntimeError] = []
+    PythonEngine().interpret(parse(source), errors.append)
+    return errors
+
+
+def test_transpile_globals_and_locals():
+    program = Transpiler().transpile(parse("var a = 1; { var b = a; b = 2; }"))
+    assert "_g['a'] = 1.0" in program.source
+    assert "_l1 = _get('a', _t[0])" in program.source
+    assert "(_l1 := 2.0)" in program.source
+
+
+def test_run_arithmetic_and_strings(capsys):
+    assert run('print 1 + 2 * 3; print "a" + "b"; print 7 / 2;') == []
+    assert capsys.readouterr().out == "7\nab\n3.5\n"
+
+
+def test_truthiness_and_equality(capsys):
+    run('print !nil; print !0; print nil == nil; print nil == false; print 1 != "1";')
+    assert capsys.readouterr().out == "True\nFalse\nTrue\nFalse\nTrue\n"
+
+
+def test_logical_operators_short_circuit(capsys):
+    run('print nil or "yes"; print false and missing; print 1 and 2;')
+    assert capsys.readouterr().out == "yes\nFalse\n2\n"
+
+
+def test_if_with_empty_branches(capsys):
+    run('if (true) {} else { print "no"; } if (false) {} print "done";')
+    assert capsys.readouterr().out == "done\n"
+
+
+def test_runtime_error_reports_lox_line():
+    errors = run('var a = "x";\n\nprint a < 1;')
+    assert errors[0].message == "Operands must be numbers."
+    assert errors[0].token.line == 3
+
+
+def test_undefined_variable():
+    errors = run("missing = 1;")
+    assert errors[0].message == "Undefined variable 'missing'."
+
+
+def test_run_source_caches_by_hash(capsys):
+    PythonEngine.clear_cache()
+    calls: list[str] = []
+
+    def frontend(source: str) -> list[Stmt]:
+        calls.append(source)
+        return parse(source)
+
+    engine = PythonEngine()
+    engine.run_source("print 1;", frontend, dummy_error_reporter)
+    engine.run_source("print 1;", frontend, dummy_error_reporter)
+    PythonEngine().run_source("print 1;", frontend, dummy_error_reporter)
+
+    assert calls == ["print 1;"]
+    assert capsys.readouterr().out == "1\n1\n1\n"
+
+
+def test_run_source_does_not_cache_failed_parse():
+    PythonEngine.clear_cache()
+    calls: list[str] = []
+
+    def frontend(source: str) -> None:
+        calls.append(source)
+        return None
+
+    engine = PythonEngine()
+    engine.run_source("print;", frontend, dummy_error_reporter)
+    engine.run_source("print;", frontend, dummy_error_reporter)
+
+    assert len(calls) == 2
+
+
+def test_run_source_caches_options_apart(capsys):
+    PythonEngine.clear_cache()
+    calls: list[str] = []
+
+    def frontend(source: str) -> list[Stmt]:
+        calls.append(source)
+        return parse(source)
+
+    engine = PythonEngine()
+    engine.run_source("print 1;", frontend, dummy_error_reporter, "O0")
+    engine.run_source("print 1;", frontend, dummy_error_reporter, "O1")
+    engine.run_source("print 1;", frontend, dummy_error_reporter, "O1")
+
+    assert len(calls) == 2
+
+
+def test_program_cache_serves_later_runs(tmp_path, capsys):
+    cache = ProgramCache(tmp_path)
+    source = 'print 1;\nprint -"a";'
+    calls: list[str] = []
+
+    def frontend(source: str) -> list[Stmt]:
+        calls.append(source)
+        return parse(source)
+
+    for _ in range(2):
+        # each run starts with a cold in-memory cache, as a new process does
+        PythonEngine.clear_cache()
+        errors: list[PloxRuntimeError] = []
+        PythonEngine().run_source(source, frontend, errors.append, "O0", cache)
+        assert errors[0].message == "Operand must be a number."
+        assert errors[0].token.line == 2
+
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert capsys.readouterr().out == "1\n1\n"
+    assert cache.load(source, "O1") is None
+
+
+def test_corrupt_program_is_a_miss(tmp_path):
+    cache = ProgramCache(tmp_path)
+    source = "print 1;"
+    cache.store(source, "", Transpiler().transpile(parse(source)))
+    (entry,) = tmp_path.glob("*.pyc")
+    entry.write_bytes(entry.read_bytes()[:-1])
+
+    assert cache.load(source, "") is None
+    assert not entry.exists()
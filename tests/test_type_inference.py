@@ -0,0 +1,188 @@
+import pytest
+from src.exceptions import PloxRuntimeError
+from src.expr import BinaryExpr, UnaryExpr
+from src.interpreter import Interpreter
+from src.plox import Plox
+from src.stmt import (
+    BlockStmt,
+    ExpressionStmt,
+    FunctionStmt,
+    PrintStmt,
+    ReturnStmt,
+    Stmt,
+)
+from src.type_inference import LoxType, TypeInference
+from tests.helpers import resolve
+
+
+def infer(source: str, whole_program: bool = True) -> tuple[list[Stmt], TypeInference]:
+    statements = resolve(source)
+    inference = TypeInference(whole_program)
+    inference.infer(statements)
+    return statements, inference
+
+
+def expression(stmt: Stmt) -> object:
+    assert isinstance(stmt, (PrintStmt, ExpressionStmt))
+    return stmt.expression
+
+
+def test_join():
+    assert LoxType.NEVER.join(LoxType.NUMBER) is LoxType.NUMBER
+    assert LoxType.NUMBER.join(LoxType.NUMBER) is LoxType.NUMBER
+    assert LoxType.NUMBER.join(LoxType.STRING) is LoxType.ANY
+
+
+def test_literals_are_proven():
+    (stmt,), _ = infer("print 1 + 2 * 3;")
+    expr = expression(stmt)
+    assert isinstance(expr, BinaryExpr)
+    assert expr.static_path is not None
+    assert isinstance(expr.right, BinaryExpr)
+    assert expr.right.static_path is not None
+
+
+def test_strings_are_proven_for_plus_only():
+    (first, second), _ = infer('print "a" + "b"; print "a" < "b";')
+    assert expression(first).static_path is not None  # type: ignore[attr-defined]
+    assert expression(second).static_path is None  # type: ignore[attr-defined]
+
+
+def test_variable_only_assigned_numbers():
+    statements, _ = infer("var a = 1; a = a + 1; print -a;")
+    assign = expression(statements[1])
+    assert assign.value.static_path is not None  # type: ignore[attr-defined]
+    negate = expression(statements[2])
+    assert isinstance(negate, UnaryExpr)
+    assert negate.static_path is not None
+
+
+def test_variable_assigned_mixed_types_stays_checked():
+    statements, _ = infer('var a = 1; a = "s"; print a - 1;')
+    assert expression(statements[2]).static_path is None  # type: ignore[attr-defined]
+
+
+def test_uninitialized_variable_stays_checked():
+    statements, _ = infer("var a; print a + 1;")
+    assert expression(statements[1]).static_path is None  # type: ignore[attr-defined]
+
+
+def test_variable_from_outside_program_stays_checked():
+    statements, _ = infer("print a * 2;")
+    assert expression(statements[0]).static_path is None  # type: ignore[attr-defined]
+
+
+def test_shadowed_variable_uses_inner_binding():
+    statements, _ = infer('var a = "s"; { var a = 2; print a * a; } print a + "t";')
+    block = statements[1]
+    assert isinstance(block, BlockStmt)
+    assert expression(block.statements[1]).static_path is not None  # type: ignore[attr-defined]
+    assert expression(statements[2]).static_path is not None  # type: ignore[attr-defined]
+
+
+def function_return(stmt: Stmt) -> object:
+    assert isinstance(stmt, FunctionStmt)
+    (body,) = stmt.body
+    assert isinstance(body, ReturnStmt)
+    return body.value
+
+
+def test_function_trusts_global_declared_once_and_never_assigned():
+    statements, _ = infer("var a = 1; fun f() { return -a; }")
+    assert function_return(statements[1]).static_path is not None  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        'var a = 1; fun f() { return -a; } var a = "s";',
+        'var a = 1; fun f() { return -a; } a = "s";',
+        "var a = 1; fun f() { return -a; } { var b = 2; a = b; }",
+    ],
+)
+def test_function_reading_redeclared_or_assigned_global_stays_checked(source: str):
+    statements, _ = infer(source)
+    assert function_return(statements[1]).static_path is None  # type: ignore[attr-defined]
+
+
+def test_function_reading_global_of_partial_program_stays_checked():
+    statements, _ = infer("var a = 1; fun f() { return -a; } print -a;", False)
+    assert function_return(statements[1]).static_path is None  # type: ignore[attr-defined]
+    # top-level code runs before a later program can redeclare the global
+    assert expression(statements[2]).static_path is not None  # type: ignore[attr-defined]
+
+
+def test_logical_expression_joins_operands():
+    statements, _ = infer("var a = 1 or 2; var b = nil or 2; print a + 1; print b + 1;")
+    assert expression(statements[2]).static_path is not None  # type: ignore[attr-defined]
+    assert expression(statements[3]).static_path is None  # type: ignore[attr-defined]
+
+
+def test_explanations():
+    _, inference = infer("var a = 1;\nprint a + nil;\nprint -a;")
+    assert inference.explanations == [
+        "[line 2] '+' on number, nil: checked",
+        "[line 3] '-' on number: unchecked",
+    ]
+
+
+def test_interpreter_runs_proven_and_checked_nodes(capsys):
+    statements, _ = infer('var a = 2; print a * 3 - 1; var b = "x";\nprint b - 1;')
+    errors: list[PloxRuntimeError] = []
+    Interpreter().interpret(statements, errors.append)
+    assert capsys.readouterr().out == "5\n"
+    assert errors[0].message == "Operands must be numbers."
+    assert errors[0].token.line == 2
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure"])
+@pytest.mark.parametrize(
+    "operation, message",
+    [("-a", "Operand must be a number."), ("a - 1", "Operands must be numbers.")],
+)
+def test_redeclared_global_read_in_function_is_checked(
+    engine: str, operation: str, message: str, tmp_path, capsys
+):
+    script = tmp_path / "script.plox"
+    script.write_text(
+        f'var a = 1;\nfun f() {{ return {operation}; }}\nvar a = "s";\nprint f();\n'
+    )
+
+    status = Plox(engine=engine, optimization_level=1).run_file(script)
+
+    assert capsys.readouterr().err == f"{message}\n[line 2]\n"
+    assert status != 0
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure"])
+@pytest.mark.parametrize(
+    "source, message, line",
+    [
+        (
+            '{\nvar a = 1;\nfun f() { return a - 1; }\nvar a = "s";\nprint f();\n}',
+            "Operands must be numbers.",
+            3,
+        ),
+        (
+            "fun outer() {\nvar n = 1;\nfun g() { return -n; }\n"
+            'var n = "x";\nreturn g();\n}\nprint outer();',
+            "Operand must be a number.",
+            3,
+        ),
+        (
+            '{\nvar a = 1;\nfun f() { a = "s"; }\nvar a = 2;\nf();\nprint a - 1;\n}',
+            "Operands must be numbers.",
+            6,
+        ),
+    ],
+)
+def test_redeclared_local_shares_type_with_its_slot(
+    engine: str, source: str, message: str, line: int, tmp_path, capsys
+):
+    script = tmp_path / "script.plox"
+    script.write_text(source)
+
+    status = Plox(engine=engine, optimization_level=1).run_file(script)
+
+    assert capsys.readouterr().err == f"{message}\n[line {line}]\n"
+    assert status != 0
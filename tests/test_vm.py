@@ -0,0 +1,92 @@
+from src.chunk import Chunk, OpCode
+from src.compiler import Compiler
+from src.exceptions import PloxRuntimeError
+from src.token import Token
+from src.vm import VM
+from tests.helpers import dummy_error_reporter, parse
+
+
+def run(source: str) -> list[PloxRuntimeError]:
+    errors: list[PloxRuntimeError] = []
+    VM().interpret(parse(source), errors.append)
+    return errors
+
+
+def test_chunk_reuses_constants():
+    chunk = Chunk()
+    assert chunk.add_constant(1.0) == 0
+    assert chunk.add_constant("a") == 1
+    assert chunk.add_constant(1.0) == 0
+    assert chunk.constants == [1.0, "a"]
+
+
+def test_compile_arithmetic():
+    chunk = Compiler().compile(parse("print 1 + 2;"))
+    assert list(chunk.code) == [
+        OpCode.CONSTANT,
+        0,
+        OpCode.CONSTANT,
+        1,
+        OpCode.ADD,
+        OpCode.PRINT,
+        OpCode.RETURN,
+    ]
+    assert list(chunk.lines) == [1] * 7
+
+
+def test_compile_locals_use_slots():
+    chunk = Compiler().compile(parse("{ var a = 1; var b = a; }"))
+    listing = chunk.disassemble()
+    assert listing[1].endswith("GET_LOCAL 0")
+    assert listing[2].endswith("POPN 2")
+
+
+def test_run_arithmetic(capsys):
+    assert run("print 1 + 2 * 3 - 4 / 2;") == []
+    assert capsys.readouterr().out == "5\n"
+
+
+def test_run_string_concatenation(capsys):
+    run('print "foo" + "bar";')
+    assert capsys.readouterr().out == "foobar\n"
+
+
+def test_globals_persist_between_runs(capsys):
+    vm = VM()
+    vm.interpret(parse("var a = 1;"), dummy_error_reporter)
+    vm.interpret(parse("a = a + 1; print a;"), dummy_error_reporter)
+    assert capsys.readouterr().out == "2\n"
+
+
+def test_local_initializer_sees_outer_variable(capsys):
+    run("{ var a = 1; { var a = a + 1; print a; } print a; }")
+    assert capsys.readouterr().out == "2\n1\n"
+
+
+def test_logical_operators_short_circuit(capsys):
+    run('print nil or "yes"; print false and undefined; print 1 and 2;')
+    assert capsys.readouterr().out == "yes\nFalse\n2\n"
+
+
+def test_runtime_error_reports_line():
+    errors = run('print 1;\nprint "a" - 1;')
+    assert len(errors) == 1
+    assert errors[0].message == "Operands must be numbers."
+    assert errors[0].token.line == 2
+    assert errors[0].token.lexeme == "-"
+
+
+def test_undefined_variable():
+    errors = run("print 1;\n\nprint missing;")
+    assert errors[0].message == "Undefined variable 'missing'."
+    assert errors[0].token == Token(errors[0].token.type, "missing", None, 3)
+
+
+def test_assign_undefined_variable():
+    errors = run("missing = 1;")
+    assert errors[0].message == "Undefined variable 'missing'."
+
+
+def test_mixed_addition_error():
+    errors = run('print 1 + "a";')
+    assert errors[0].message == "Operands must be two numbers or two strings."